@@ -0,0 +1,25 @@
+import time
+
+import streamlit as st
+
+from energia import instrumentacion, paginas
+
+st.set_page_config(page_title="Dashboard Energético", layout="wide")
+
+# Mediciones de este rerun (panel de desarrollo con ?dev=1 o ENERGIA_PANEL_DESARROLLO=1)
+mediciones = instrumentacion.iniciar_ronda()
+inicio_rerun = time.perf_counter()
+
+# -------------------
+# 🧭 Navegación: cada página importa su módulo (energia/paginas/) al visitarla por primera vez
+# -------------------
+pagina = st.navigation(paginas.navegacion())
+
+st.title(f"{pagina.icon} {pagina.title}")
+pagina.run()
+
+# -------------------
+# 🛠️ Panel de desarrollo: tiempos por etapa, importaciones y primer dibujo
+# -------------------
+if paginas.panel_activo():
+    paginas.panel_desarrollo(mediciones, inicio_rerun)
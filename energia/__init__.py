@@ -0,0 +1 @@
+"""Utilidades compartidas del dashboard energético (datos, agregados y esquema)."""
@@ -0,0 +1,243 @@
+"""API HTTP de agregados, sin Streamlit.
+
+Sirve los mismos números que `app.py` (con el mismo código y la misma caché
+de `energia.datos`) para herramientas de BI y otros servicios:
+
+- ``/v1/top-paises?anio=2024&n=10``: ranking de países por producción;
+- ``/v1/participacion-renovable?pais=Colombia``: % renovable y no renovable por año;
+- ``/v1/generacion-mensual?pais=Colombia&tipo=renovables``: generación neta
+  mensual por tipo de energía.
+
+Cada recurso responde JSON o Arrow IPC (``?formato=arrow`` o
+``Accept: application/vnd.apache.arrow.stream``) y se pagina con ``limite`` y
+``desde`` (cabeceras ``X-Total-Count`` y ``Link: rel="next"``). El ETag sale
+de la versión de los datos y de la consulta, así que un GET condicional
+(``If-None-Match``) con los datos sin cambios recibe 304 sin calcular nada.
+
+Uso:
+    python -m energia.api --puerto 8503
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import pyarrow as pa
+
+from energia import config, consultas, datos, graficos, instrumentacion, kpis, rollups
+from energia.config import TABLA_MENSUAL
+
+PUERTO = int(os.environ.get("ENERGIA_PUERTO_API", 8503))
+MAX_EDAD = int(os.environ.get("ENERGIA_API_MAX_EDAD", 60))
+LIMITE = 1000
+MAX_LIMITE = 10000
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+
+RECURSOS = {}
+
+
+class ErrorConsulta(ValueError):
+    """Parámetro inválido en la consulta: se responde 400."""
+
+
+def recurso(ruta, descripcion):
+    """Registra `funcion(parametros) -> DataFrame` como recurso de la API en `ruta`."""
+    def decorador(funcion):
+        RECURSOS[ruta] = (funcion, descripcion)
+        return funcion
+    return decorador
+
+
+# --------------------------
+# Parámetros
+# --------------------------
+def _entero(parametros, nombre, defecto, minimo=None, maximo=None):
+    valor = parametros.get(nombre)
+    if valor is None:
+        return defecto
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ErrorConsulta(f"'{nombre}' debe ser un entero") from None
+    if (minimo is not None and valor < minimo) or (maximo is not None and valor > maximo):
+        raise ErrorConsulta(f"'{nombre}' debe estar entre {minimo} y {maximo}")
+    return valor
+
+
+def _anio(parametros):
+    anios = datos.consultar(TABLA_MENSUAL, consultas.anios)
+    anio = _entero(parametros, "anio", anios[-1] if anios else None)
+    if anio not in anios:
+        raise ErrorConsulta(f"Año sin datos: {anio}")
+    return anio
+
+
+def _pais(parametros):
+    pais = parametros.get("pais", "Todos")
+    if pais != "Todos" and pais not in datos.consultar(TABLA_MENSUAL, consultas.paises):
+        raise ErrorConsulta(f"País sin datos: {pais}")
+    return pais
+
+
+# --------------------------
+# Recursos (mismas funciones y caché que app.py)
+# --------------------------
+@recurso("/v1/top-paises", "Países con mayor producción en `anio` (todos los balances y productos)")
+def top_paises(parametros):
+    anio = _anio(parametros)
+    n = _entero(parametros, "n", 10, minimo=1, maximo=100)
+    return datos.consultar(rollups.CUBO, kpis.top_paises, anio=anio, n=n)
+
+
+@recurso("/v1/participacion-renovable", "% renovable y no renovable por año de `pais` ('Todos' = global)")
+def participacion_renovable(parametros):
+    return graficos.participacion_anual(_pais(parametros)).reset_index()
+
+
+@recurso("/v1/generacion-mensual", "Generación neta mensual de `pais` por tipo de energía (`tipo`)")
+def generacion_mensual(parametros):
+    tipo = parametros.get("tipo", "ambas")
+    if tipo not in graficos.TIPOS_ENERGIA.values():
+        raise ErrorConsulta(f"'tipo' debe ser uno de {', '.join(graficos.TIPOS_ENERGIA.values())}")
+    df = graficos.serie_mensual(_pais(parametros), tipo)
+    df = df.set_axis(df.index.strftime("%Y-%m"), axis=0).rename_axis("Periodo").reset_index()
+    return df.rename_axis(columns=None)
+
+
+# --------------------------
+# Serialización
+# --------------------------
+def etag(ruta, parametros, formato):
+    """ETag de una respuesta: versión de los datos + recurso + parámetros + formato."""
+    firma = json.dumps([datos.version(), ruta, sorted(parametros.items()), formato])
+    return '"' + hashlib.sha1(firma.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _de_float32(serie):
+    """Si `serie` es float32, o float64 que vuelve exacta de float32 (datos float32 ampliados)."""
+    if serie.dtype == "float32":
+        return True
+    if serie.dtype != "float64":
+        return False
+    return bool((serie.astype("float32").astype("float64") == serie)[serie.notna()].all())
+
+
+def _json(df):
+    # Todo flotante con precisión de float32 (también el ya pasado a float64) sale
+    # con su representación más corta: 2051.255 y no 2051.2548828125. Los float64
+    # de verdad ya salen con la suya.
+    flotantes = [c for c in df.columns if _de_float32(df[c])]
+    df = (df.astype({c: "float32" for c in flotantes}).astype({c: str for c in flotantes})
+          .astype({c: "float64" for c in flotantes}))
+    registros = df.astype(object).where(df.notna(), None).to_dict("records")
+    return json.dumps(registros, ensure_ascii=False).encode("utf-8")
+
+
+def _arrow(df):
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    salida = pa.BufferOutputStream()
+    with pa.ipc.new_stream(salida, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return salida.getvalue().to_pybytes()
+
+
+def _formato(parametros, aceptar):
+    formato = parametros.get("formato") or ("arrow" if TIPO_ARROW in (aceptar or "") else "json")
+    if formato not in ("json", "arrow"):
+        raise ErrorConsulta("'formato' debe ser json o arrow")
+    return formato
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        ruta = url.path.rstrip("/") or "/"
+        parametros = dict(parse_qsl(url.query))
+        if ruta in ("/", "/v1"):
+            indice = {r: {"descripcion": d} for r, (_, d) in RECURSOS.items()}
+            self._responder(200, "application/json", json.dumps(indice, ensure_ascii=False).encode("utf-8"))
+            return
+        if ruta not in RECURSOS:
+            self._error(404, f"Recurso desconocido: {ruta}")
+            return
+        try:
+            formato = _formato(parametros, self.headers.get("Accept"))
+            limite = _entero(parametros, "limite", LIMITE, minimo=1, maximo=MAX_LIMITE)
+            desde = _entero(parametros, "desde", 0, minimo=0)
+            etiqueta = etag(ruta, parametros, formato)
+            cabeceras = {"ETag": etiqueta, "Cache-Control": f"public, max-age={MAX_EDAD}"}
+            # Con los datos sin cambios no se recalcula ni se serializa nada
+            if etiqueta in [e.strip() for e in self.headers.get("If-None-Match", "").split(",")]:
+                self._responder(304, None, b"", cabeceras)
+                return
+            with instrumentacion.medir("api", ruta) as registro:
+                df = RECURSOS[ruta][0](parametros)
+                pagina = df.iloc[desde:desde + limite]
+                registro["filas_salida"] = len(pagina)
+                cuerpo = _arrow(pagina) if formato == "arrow" else _json(pagina)
+        except ErrorConsulta as e:
+            self._error(400, str(e))
+            return
+        except Exception:
+            traceback.print_exc()
+            self._error(500, "Error interno al calcular el recurso")
+            return
+        cabeceras["X-Total-Count"] = str(len(df))
+        if desde + limite < len(df):
+            siguiente = urlencode({**parametros, "desde": desde + limite, "limite": limite})
+            cabeceras["Link"] = f'<{ruta}?{siguiente}>; rel="next"'
+        self._responder(200, TIPO_ARROW if formato == "arrow" else "application/json", cuerpo, cabeceras)
+
+    def _error(self, codigo, mensaje):
+        self._responder(codigo, "application/json", json.dumps({"error": mensaje}, ensure_ascii=False).encode("utf-8"))
+
+    def _responder(self, codigo, tipo, cuerpo, cabeceras=None):
+        self.send_response(codigo)
+        if tipo:
+            self.send_header("Content-Type", tipo + ("; charset=utf-8" if tipo == "application/json" else ""))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def servir(puerto=PUERTO, host="127.0.0.1", en_hilo=False):
+    """Levanta la API; con `en_hilo` corre en segundo plano y devuelve el servidor."""
+    servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+    if en_hilo:
+        threading.Thread(target=servidor.serve_forever, name="energia-api", daemon=True).start()
+        return servidor
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return servidor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP de agregados del dashboard energético.")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz ('0.0.0.0' para exponerla)")
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    config.DB_PATH = args.db
+    datos.verificar_archivo()
+    print(f"🔌 API en http://{args.host}:{args.puerto}/v1 ({', '.join(RECURSOS)})")
+    servir(args.puerto, args.host)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Tiempo de importación y de arranque en frío de los dashboards.
+
+Dos mediciones, cada una en procesos nuevos para que nada venga ya importado:
+
+- ``importaciones``: lo que cuesta importar cada librería pesada y cada
+  módulo de `energia.paginas` con Streamlit ya cargado (como dentro del
+  servidor); mediana de ``--repeticiones`` procesos.
+- ``servidor``: levanta cada script con `streamlit run` (sin el
+  calentamiento de `energia.servidor`) y mide cuánto tarda en responder
+  `/_stcore/health`, el primer dibujo de la primera sesión y un rerun ya en
+  tibio. En apps multipágina (`dashboard_unificado.py`) navega además a cada
+  página y mide su primer dibujo, que incluye importar su módulo.
+
+Con ``--json`` se guarda el reporte, y con ``--base`` se compara contra uno
+anterior para seguir los tiempos entre versiones:
+
+    python -m energia.arranque importaciones --repeticiones 5
+    python -m energia.arranque servidor dashboard_unificado.py app.py dashboard_final.py
+    python -m energia.arranque todo --json arranque.json --base arranque_anterior.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from energia import carga, config
+from energia.paginas import GRUPOS
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# plotly.graph_objects no aparece: Streamlit ya lo importa
+LIBRERIAS = ["pandas", "plotly.express", "plotly.subplots", "matplotlib.pyplot"]
+SCRIPTS = ["dashboard_unificado.py", "app.py", "analisis_energetico.py", "dashboard.py",
+           "dashboard_con_filtros.py", "dashboard_final.py"]
+
+_MEDIR = """
+import sys, time
+inicio = time.perf_counter()
+import streamlit
+base = time.perf_counter()
+__import__(sys.argv[1])
+print(round((base - inicio) * 1000, 1), round((time.perf_counter() - base) * 1000, 1))
+"""
+
+
+# --------------------------
+# Importaciones
+# --------------------------
+def modulos_paginas():
+    return ["energia.paginas"] + sorted({f"energia.paginas.{p.modulo}" for grupo in GRUPOS.values() for p in grupo})
+
+
+def importar(modulo, repeticiones=3):
+    """Medianas (ms) de importar Streamlit y luego `modulo`, en procesos nuevos."""
+    base, tiempos = [], []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", _MEDIR, modulo], cwd=RAIZ, check=True,
+                                capture_output=True, text=True).stdout.split()
+        base.append(float(salida[0]))
+        tiempos.append(float(salida[1]))
+    return statistics.median(base), statistics.median(tiempos)
+
+
+def importaciones(modulos, repeticiones=3):
+    """{módulo: ms}, con la importación de Streamlit como ``streamlit``."""
+    filas, base = {}, []
+    for modulo in modulos:
+        streamlit_ms, ms = importar(modulo, repeticiones)
+        base.append(streamlit_ms)
+        filas[modulo] = ms
+    return {"streamlit": statistics.median(base), **filas} if base else filas
+
+
+# --------------------------
+# Arranque del servidor
+# --------------------------
+def servidor(app, puerto=carga.PUERTO, db_path=None):
+    """Filas {app, pagina, salud_ms, primer_dibujo_ms, tibio_ms} del arranque en frío de `app`."""
+    inicio = time.perf_counter()
+    proceso = carga.iniciar_servidor(app, puerto, db_path, calentar=False)
+    salud_ms = round((time.perf_counter() - inicio) * 1000, 1)
+    filas = []
+    try:
+        url = f"ws://127.0.0.1:{puerto}/_stcore/stream"
+        with carga.Sesion(url) as sesion:
+            frio, ok = sesion.rerun()
+            tibio, ok_tibio = sesion.rerun()
+            inicial = next((ruta for ruta, hash_pagina in sesion.paginas.items() if hash_pagina == sesion.pagina), "")
+            filas.append({"app": app, "pagina": f"/{inicial}" if sesion.paginas else "", "salud_ms": salud_ms,
+                          "primer_dibujo_ms": round(frio * 1000, 1), "tibio_ms": round(tibio * 1000, 1), "errores": (not ok) + (not ok_tibio)})
+            # Apps multipágina: primer dibujo de cada página (importa su módulo) y una visita más
+            for ruta in [r for r in sesion.paginas if r != inicial]:
+                frio, ok = sesion.ir(ruta)
+                tibio, ok_tibio = sesion.rerun()
+                filas.append({"app": app, "pagina": f"/{ruta}", "salud_ms": None, "primer_dibujo_ms": round(frio * 1000, 1),
+                              "tibio_ms": round(tibio * 1000, 1), "errores": (not ok) + (not ok_tibio)})
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+    return filas
+
+
+# --------------------------
+# Reporte
+# --------------------------
+def _delta(actual, anterior):
+    if actual is None or anterior is None:
+        return ""
+    return f"{actual - anterior:+.0f}"
+
+
+def imprimir(reporte, base=None):
+    base = base or {}
+    if "importaciones" in reporte:
+        anteriores = base.get("importaciones", {})
+        print(f"{'módulo':<32}{'ms':>9}{'Δ ms':>8}")
+        for modulo, ms in reporte["importaciones"].items():
+            print(f"{modulo:<32}{ms:>9}{_delta(ms, anteriores.get(modulo)):>8}")
+    if "servidor" in reporte:
+        anteriores = {(f["app"], f["pagina"]): f for f in base.get("servidor", [])}
+        print(f"{'app':<26}{'página':<22}{'salud ms':>10}{'primer dibujo':>15}{'Δ ms':>8}{'tibio ms':>10}{'errores':>9}")
+        for fila in reporte["servidor"]:
+            anterior = anteriores.get((fila["app"], fila["pagina"]), {})
+            print(f"{fila['app']:<26}{fila['pagina'] or '—':<22}{'—' if fila['salud_ms'] is None else fila['salud_ms']:>10}"
+                  f"{fila['primer_dibujo_ms']:>15}{_delta(fila['primer_dibujo_ms'], anterior.get('primer_dibujo_ms')):>8}"
+                  f"{fila['tibio_ms']:>10}{fila['errores']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide la importación y el arranque en frío de los dashboards.")
+    parser.add_argument("accion", choices=["importaciones", "servidor", "todo"])
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS, help="Scripts a levantar (acción servidor)")
+    parser.add_argument("--modulos", nargs="+", help="Módulos a importar (por defecto librerías pesadas y páginas)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Procesos por módulo (se toma la mediana)")
+    parser.add_argument("--puerto", type=int, default=carga.PUERTO)
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--json", help="Guarda el reporte en este archivo")
+    parser.add_argument("--base", help="Reporte anterior (--json) contra el que comparar")
+    args = parser.parse_args(argv)
+
+    reporte = {"fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "python": sys.version.split()[0]}
+    if args.accion in ("importaciones", "todo"):
+        print(f"⏱️ Importaciones · mediana de {args.repeticiones} procesos")
+        reporte["importaciones"] = importaciones(args.modulos or LIBRERIAS + modulos_paginas(), args.repeticiones)
+    if args.accion in ("servidor", "todo"):
+        print(f"⏱️ Arranque en frío · {', '.join(args.scripts)}")
+        reporte["servidor"] = [fila for script in args.scripts for fila in servidor(script, args.puerto, args.db)]
+
+    base = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+    imprimir(reporte, base)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Benchmark del pipeline de datos de los dashboards, fuera de Streamlit.
+
+Corre, sección por sección, el mismo código que dibuja `app.py`,
+`dashboard_final.py` y `analisis_energetico_old.py` en cada rerun: las
+secciones de `energia.graficos` (con su caché de figuras) y las funciones de
+datos y figuras de `energia.paginas`, más la serialización que haría
+`st.plotly_chart` o `st.pyplot`. Así una regresión en esos módulos aparece
+aquí. Reporta:
+
+- latencia en frío (cachés de datos y de figuras vacías) y en tibio, mediana
+  de varias repeticiones, desglosada por etapa de `energia.instrumentacion`
+  (tiempo propio de cada etapa, sin las anidadas; lo no medido va a ``otros``);
+- memoria pico de Python (tracemalloc) de una ejecución en frío;
+- el costo de preparar la base (migración + agregados) y el RSS máximo.
+
+Sin `--db` genera una base sintética con `energia.sinteticos` a la escala pedida.
+
+Uso:
+    python -m energia.benchmark --paises 60 --meses 180 --repeticiones 5
+    python -m energia.benchmark --db analisis_energetico.db --columnar arrow --json resultados.json
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from energia import columnar, config, consultas, datos, graficos, instrumentacion, sinteticos
+from energia.config import TABLA_MENSUAL
+from energia.paginas import climatico, fuentes, sectorial
+
+# Etapas de `energia.instrumentacion` que recorre un rerun, en orden
+PASOS = ("datos", "agregacion", "vista", "figura", "serializacion", "deserializacion", "dibujar", "otros")
+ESCENARIOS = []
+
+
+def escenario(script, seccion):
+    """Registra una función `f(pais, anio)` como la sección `seccion` de `script`."""
+    def registrar(funcion):
+        ESCENARIOS.append((script, seccion, funcion))
+        return funcion
+    return registrar
+
+
+def _vista(funcion, *args, **kwargs):
+    # Datos de una vista de `energia.paginas` (las que no pasan por la caché de figuras)
+    with instrumentacion.medir("vista", funcion.__name__) as registro:
+        resultado = funcion(*args, **kwargs)
+        registro["filas_salida"] = instrumentacion.filas(resultado)
+    return resultado
+
+
+def _figura(funcion, df):
+    with instrumentacion.medir("figura", funcion.__name__):
+        return funcion(df)
+
+
+def _dibujar(nombre, fig):
+    # Lo mismo que hacen st.plotly_chart (JSON de la figura) y st.pyplot (PNG)
+    with instrumentacion.medir("dibujar", nombre):
+        if hasattr(fig, "to_json"):
+            fig.to_json()
+        else:
+            fig.savefig(io.BytesIO(), format="png")
+            plt.close(fig)
+
+
+def _seccion_app(seccion, pais, anio, tipo_energia=None):
+    # Como `mundo.mostrar`: figuras de la caché de figuras (se construyen si faltan) y dibujo
+    for id_grafico, fig in graficos.construir(seccion, pais, anio, tipo_energia=tipo_energia):
+        _dibujar(id_grafico, fig)
+
+
+# --------------------------
+# app.py
+# --------------------------
+@escenario("app.py", "Diagnóstico Nacional")
+def app_diagnostico(pais, anio):
+    _seccion_app("Diagnóstico Nacional", pais, anio)
+
+
+@escenario("app.py", "Comparativos Internacionales")
+def app_comparativos(pais, anio):
+    _seccion_app("Comparativos Internacionales", pais, anio)
+
+
+@escenario("app.py", "Tendencia Mensual")
+def app_tendencia_mensual(pais, anio):
+    # Primera opción del selector de tipo: 'Renovables y No Renovables'
+    _seccion_app("Tendencia Mensual", pais, anio, tipo_energia="ambas")
+
+
+# --------------------------
+# dashboard_final.py (todas las vistas de cada menú)
+# --------------------------
+@escenario("dashboard_final.py", "Diagnóstico Energético de Colombia")
+def final_diagnostico(pais, anio):
+    _vista(datos.ejecutar, "anios_consumo")
+    for sub_menu in sectorial.ANALISIS:
+        datos_vista = _vista(sectorial.vista_diagnostico, sub_menu)
+        if sub_menu == "Participación de Fuentes de Energía en Colombia (2024)":
+            _dibujar("participacion", _figura(sectorial.grafico_participacion, datos_vista))
+
+
+@escenario("dashboard_final.py", "Análisis Sectorial")
+def final_sectorial(pais, anio):
+    # Las cinco pestañas de `sectorial.pestanas(anio=2022)`
+    _vista(sectorial.consumo_por_sector, 2022)
+    for sector in ('Industry', 'Residential', 'Transport'):
+        _vista(sectorial.consumo_anual_sector, sector)
+    _vista(climatico.serie_intensidad, 'Intensidad')
+
+
+@escenario("dashboard_final.py", "Comparativos Internacionales")
+def final_comparativos(pais, anio):
+    _vista(datos.ejecutar, "anios_consumo")
+    for sub_menu in sectorial.COMPARATIVOS:
+        _vista(sectorial.vista_comparativos, sub_menu)
+
+
+@escenario("dashboard_final.py", "Análisis Climático")
+def final_climatico(pais, anio):
+    for columna in ('Emisiones', 'Participacion_Emisiones', 'Intensidad'):
+        _vista(climatico.serie_intensidad, columna)
+    _vista(datos.ejecutar, "intensidad_total")
+
+
+# --------------------------
+# analisis_energetico_old.py (las cuatro pestañas)
+# --------------------------
+@escenario("analisis_energetico_old.py", "Pestañas")
+def old_pestanas(pais, anio):
+    _vista(datos.consultar, TABLA_MENSUAL, consultas.paises, excluir_agregados=False)
+    _vista(datos.consultar, TABLA_MENSUAL, consultas.anios)
+    for funcion, args, grafico in ((fuentes.generacion_por_fuente, (pais, anio), fuentes.grafico_distribucion),
+                                   (fuentes.generacion_mensual, (pais, anio), fuentes.grafico_mensual),
+                                   (fuentes.historico_anual, (pais,), fuentes.grafico_historico),
+                                   (fuentes.renovables_del_anio, (anio,), fuentes.grafico_renovables)):
+        df = _vista(funcion, *args)
+        if not df.empty:
+            _dibujar(grafico.__name__, _figura(grafico, df))
+
+
+# --------------------------
+# Medición
+# --------------------------
+def tiempos_por_etapa(registros, total_ms):
+    """ms propios de cada etapa de `registros` (una ronda de `energia.instrumentacion`).
+
+    A cada medición se le resta lo de sus etapas anidadas, así una consulta
+    dentro de la construcción de una figura cuenta como ``datos`` y no dos
+    veces; lo que quedó fuera de toda medición (o en otras etapas) va a ``otros``.
+    """
+    tiempos = dict.fromkeys(PASOS, 0.0)
+    hijos = defaultdict(float)
+    for registro in registros:
+        nivel = registro["nivel"]
+        propio = registro["ms"] - hijos.pop(nivel + 1, 0.0)
+        hijos[nivel] += registro["ms"]
+        if registro["etapa"] in tiempos and registro["etapa"] != "otros":
+            tiempos[registro["etapa"]] += propio
+    tiempos["otros"] = max(total_ms - sum(tiempos.values()), 0.0)
+    return tiempos
+
+
+def _correr(funcion, pais, anio):
+    registros = instrumentacion.iniciar_ronda()
+    inicio = time.perf_counter()
+    funcion(pais, anio)
+    return tiempos_por_etapa(registros, (time.perf_counter() - inicio) * 1000)
+
+
+def _medianas(corridas):
+    return {paso: statistics.median(c[paso] for c in corridas) for paso in PASOS}
+
+
+def medir(funcion, pais, anio, repeticiones=5):
+    """Latencias (ms por etapa, en frío y en tibio) y memoria pico (MB) de un escenario."""
+    frio, tibio = [], []
+    for _ in range(repeticiones):
+        # Vacía la caché de datos y, con ella, la de figuras
+        datos.invalidar()
+        for corridas in (frio, tibio):
+            corridas.append(_correr(funcion, pais, anio))
+    datos.invalidar()
+    tracemalloc.start()
+    try:
+        funcion(pais, anio)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    frio, tibio = _medianas(frio), _medianas(tibio)
+    return {
+        "frio_ms": frio, "total_frio_ms": sum(frio.values()),
+        "tibio_ms": tibio, "total_tibio_ms": sum(tibio.values()),
+        "pico_mb": pico / 2 ** 20,
+    }
+
+
+def ejecutar(pais="Colombia", anio=None, repeticiones=5, scripts=None):
+    """Mide todos los escenarios (o los de `scripts`) contra la base de `config.DB_PATH`."""
+    inicio = time.perf_counter()
+    datos.verificar_archivo()
+    preparacion = (time.perf_counter() - inicio) * 1000
+    if anio is None:
+        anio = max(datos.consultar(TABLA_MENSUAL, consultas.anios))
+    resultados = []
+    for script, seccion, funcion in ESCENARIOS:
+        if scripts and script not in scripts:
+            continue
+        resultados.append({"script": script, "seccion": seccion, **medir(funcion, pais, anio, repeticiones)})
+    return {
+        "db": config.DB_PATH, "pais": pais, "anio": anio, "repeticiones": repeticiones,
+        "preparacion_ms": preparacion,
+        "rss_max_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "escenarios": resultados,
+    }
+
+
+def imprimir(reporte):
+    print(f"Base: {reporte['db']}  ·  {reporte['pais']} {reporte['anio']}  ·  "
+          f"{reporte['repeticiones']} repeticiones  ·  preparación {reporte['preparacion_ms']:.0f} ms")
+    encabezado = f"{'script':<28}{'sección':<38}" + "".join(f"{p:>16}" for p in PASOS)
+    print(f"{encabezado}{'frío':>10}{'tibio':>10}{'pico MB':>10}")
+    for r in reporte["escenarios"]:
+        columnas = "".join(f"{r['frio_ms'][p]:>16.1f}" for p in PASOS)
+        print(f"{r['script']:<28}{r['seccion']:<38}{columnas}"
+              f"{r['total_frio_ms']:>10.1f}{r['total_tibio_ms']:>10.1f}{r['pico_mb']:>10.1f}")
+    print(f"RSS máximo del proceso: {reporte['rss_max_mb']:.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide latencia y memoria del pipeline de los dashboards.")
+    parser.add_argument("--db", help="Base a medir (por defecto se genera una sintética)")
+    parser.add_argument("--paises", type=int, default=20)
+    parser.add_argument("--productos", type=int, default=16)
+    parser.add_argument("--balances", type=int, default=8)
+    parser.add_argument("--meses", type=int, default=132)
+    parser.add_argument("--pais", default="Colombia")
+    parser.add_argument("--anio", type=int)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--script", action="append", help="Limita la medición a este script (repetible)")
+    parser.add_argument("--columnar", choices=sorted(columnar.FORMATOS), help="Exporta y lee la caché columnar")
+    parser.add_argument("--json", help="Guarda el reporte en este archivo")
+    args = parser.parse_args(argv)
+    # Las figuras de matplotlib se construyen y serializan sin ventana
+    matplotlib.use("Agg")
+
+    with tempfile.TemporaryDirectory(prefix="energia-bench-") as tmp:
+        if args.db:
+            config.DB_PATH = args.db
+        else:
+            config.DB_PATH = os.path.join(tmp, "sintetica.db")
+            inicio = time.perf_counter()
+            filas = sinteticos.generar(config.DB_PATH, args.paises, args.productos, args.balances, args.meses)
+            print(f"Base sintética: {filas:,} filas en {time.perf_counter() - inicio:.1f} s")
+        # Sin --columnar se ignora cualquier caché existente y se mide SQLite
+        config.COLUMNAR_DIR = os.path.join(tmp, "columnar")
+        if args.columnar:
+            datos.preparar_base()
+            columnar.exportar(formato=args.columnar)
+        reporte = ejecutar(args.pais, args.anio, args.repeticiones, args.script)
+
+    imprimir(reporte)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
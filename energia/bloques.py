@@ -0,0 +1,198 @@
+"""Agregaciones por bloques, con memoria acotada.
+
+`consultas.estadisticas_mensuales` y `datos.cargar_tabla` traen el resultado
+completo a pandas antes de agrupar. Aquí las mismas agregaciones se hacen
+leyendo la tabla en bloques de `ENERGIA_TAMANO_BLOQUE` filas
+(`read_sql_query(chunksize=...)`, o lotes de la caché columnar si está al
+día): cada bloque se reduce a sumas parciales por grupo, que se combinan con
+las acumuladas antes de leer el siguiente. La memoria depende del tamaño del
+bloque y del número de grupos, no del tamaño de la tabla.
+
+Las sumas se acumulan en float64 y el resultado pasa por el esquema compacto
+de `energia.tipos`, igual que las lecturas en memoria, así que los helpers
+(`top_paises`, `mezcla`, `totales_sector`) devuelven lo mismo que sus
+equivalentes sobre el DataFrame completo (salvo el redondeo de sumar en
+float32, que aquí no se acumula). Reciben `conn` primero, como los de
+`energia.kpis`, para memorizarlos con `datos.consultar`.
+
+Para comparar ambos caminos (diferencia máxima y memoria pico):
+
+    python -m energia.bloques comparar --anio 2024 --tamano 50000
+"""
+import argparse
+import os
+import sqlite3
+import time
+import tracemalloc
+
+import pandas as pd
+
+from energia import columnar, consultas, kpis, mezcla as _mezcla
+from energia.config import DB_PATH, TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+from energia.rollups import TODOS
+from energia.taxonomia import PRODUCTOS_EXCLUIR, clasificar
+from energia.tipos import aplicar_esquema
+
+TAMANO_BLOQUE = int(os.environ.get("ENERGIA_TAMANO_BLOQUE", 100_000))
+
+
+def _lotes_tabla(conn, tabla, columnas, tamano, filtros):
+    seleccion = ", ".join(f'"{c}"' for c in columnas)
+    query = f'SELECT {seleccion} FROM "{tabla.replace(chr(34), chr(34) * 2)}"'
+    if filtros:
+        query += " WHERE " + " AND ".join(f'"{columna}" = ?' for columna in filtros)
+    parametros = [v.item() if hasattr(v, "item") else v for v in filtros.values()]
+    yield from pd.read_sql_query(query, conn, params=parametros, chunksize=tamano)
+
+
+def lotes(conn, columnas, tabla=TABLA_MENSUAL, tamano=None, **filtros):
+    """DataFrames de hasta `tamano` filas con `columnas` de `tabla`, sin esquema compacto.
+
+    En la tabla mensual los filtros son los de `consultas.estadisticas_mensuales`;
+    en las demás, igualdades por columna (`Year=2022`).
+    """
+    tamano = tamano or TAMANO_BLOQUE
+    columnas = list(columnas)
+    if tabla == TABLA_MENSUAL:
+        if columnar.disponible(tabla):
+            return columnar.lotes_mensuales(tamano, columnas=columnas, **filtros)
+        return consultas.lotes_mensuales(conn, tamano, columnas=columnas, **filtros)
+    filtros = {columna: valor for columna, valor in filtros.items() if valor is not None}
+    if columnar.disponible(tabla):
+        return columnar.lotes(tabla, tamano, columnas=columnas, filtros=filtros)
+    return _lotes_tabla(conn, tabla, columnas, tamano, filtros)
+
+
+def _parcial(bloque, por, excluir_productos):
+    if excluir_productos:
+        bloque = bloque[~bloque["Product"].isin(excluir_productos)]
+    if "Energy_Type" in por:
+        bloque = bloque.assign(Energy_Type=clasificar(bloque["Product"]))
+    valores = pd.to_numeric(bloque["Value"], errors="coerce").astype("float64")
+    sumas = valores.groupby([bloque[c] for c in por], observed=True, sort=False).sum().reset_index()
+    # Los bloques traen categorías distintas: las claves se combinan como texto
+    for columna in por:
+        if isinstance(sumas[columna].dtype, pd.CategoricalDtype):
+            sumas[columna] = sumas[columna].astype(object)
+    return sumas
+
+
+def agregar(conn, por, tabla=TABLA_MENSUAL, excluir_productos=(), tamano=None, **filtros):
+    """`Value` sumado por las columnas `por` ('Energy_Type' se deriva de 'Product'), por bloques."""
+    por = [por] if isinstance(por, str) else list(por)
+    excluir_productos = list(excluir_productos)
+    columnas = [c for c in por if c != "Energy_Type"]
+    if ("Energy_Type" in por or excluir_productos) and "Product" not in columnas:
+        columnas.append("Product")
+    acumulado = None
+    for bloque in lotes(conn, columnas + ["Value"], tabla=tabla, tamano=tamano, **filtros):
+        parcial = _parcial(bloque, por, excluir_productos)
+        if acumulado is not None:
+            parcial = pd.concat([acumulado, parcial], ignore_index=True)
+            parcial = parcial.groupby(por, sort=False)["Value"].sum().reset_index()
+        acumulado = parcial
+    if acumulado is None:
+        acumulado = pd.DataFrame({**{c: pd.Series(dtype=object) for c in por}, "Value": pd.Series(dtype="float64")})
+    # Mismo esquema y orden que un groupby sobre el DataFrame completo (sin la
+    # Energy_Type que el esquema agrega cuando se agrupa por Product)
+    resultado = aplicar_esquema(acumulado[por + ["Value"]])[por + ["Value"]]
+    return resultado.sort_values(por, ignore_index=True)
+
+
+# --------------------------
+# Helpers de agregación
+# --------------------------
+def top_paises(conn, anio, n=10, balance=TODOS, producto=TODOS, tamano=None):
+    """Equivalente por bloques de `kpis.top_paises` (Country, Value, Puesto)."""
+    sumas = agregar(conn, "Country", anio=anio, tamano=tamano,
+                    balance=None if balance == TODOS else balance,
+                    productos=None if producto == TODOS else [producto])
+    # Mismo desempate que el cubo: valor descendente y luego nombre del país
+    orden = sumas.assign(_pais=sumas["Country"].astype(str)).sort_values(
+        ["Value", "_pais"], ascending=[False, True], ignore_index=True)
+    orden["Puesto"] = range(1, len(orden) + 1)
+    return orden.loc[orden["Puesto"] <= n, ["Country", "Value", "Puesto"]].reset_index(drop=True)
+
+
+def mezcla(conn, por=(), porcentaje=True, excluir_productos=PRODUCTOS_EXCLUIR, tamano=None, **filtros):
+    """`mezcla.mezcla` de la tabla mensual filtrada, sin cargarla completa."""
+    por = [por] if isinstance(por, str) else list(por)
+    sumas = agregar(conn, por + ["Energy_Type"], excluir_productos=excluir_productos, tamano=tamano, **filtros)
+    # Un grupo por fila: la mezcla solo pasa a formato ancho y normaliza
+    return _mezcla.mezcla(sumas, por=por, porcentaje=porcentaje)
+
+
+def totales_sector(conn, tabla=TABLA_SECTORIAL, por=("Year", "Sector"), tamano=None, **filtros):
+    """Totales de las tablas por sector (consumo eléctrico o CO₂) por bloques."""
+    return agregar(conn, por, tabla=tabla, tamano=tamano, **filtros)
+
+
+# --------------------------
+# Comparación con el camino en memoria
+# --------------------------
+def _medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = funcion()
+        return resultado, time.perf_counter() - inicio, tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def _diferencia(a, b):
+    a = a.to_numpy(dtype="float64")
+    b = b.to_numpy(dtype="float64")
+    if a.shape != b.shape:
+        return float("inf")
+    return float(abs(a - b).max()) if a.size else 0.0
+
+
+def comparar(conn, anio, tamano=None):
+    """(helper, diferencia máxima, s y MB en memoria, s y MB por bloques) de cada helper."""
+    def mezcla_en_memoria():
+        df = consultas.estadisticas_mensuales(conn, columnas=("Country", "Product", "Value"), anio=anio)
+        return _mezcla.mezcla(df[~df["Product"].isin(PRODUCTOS_EXCLUIR)], por="Country")
+
+    casos = [
+        ("top_paises", lambda: kpis.top_paises(conn, anio), lambda: top_paises(conn, anio, tamano=tamano),
+         "Value"),
+        ("mezcla", mezcla_en_memoria, lambda: mezcla(conn, por="Country", anio=anio, tamano=tamano), None),
+    ]
+    for tabla, nombre in [(TABLA_SECTORIAL, "totales_sector"), (TABLA_CO2, "totales_co2")]:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)).fetchone():
+            casos.append((nombre,
+                          lambda tabla=tabla: aplicar_esquema(pd.read_sql_query(
+                              f'SELECT * FROM "{tabla}"', conn)).groupby(
+                              ["Year", "Sector"], observed=True)["Value"].sum().reset_index(),
+                          lambda tabla=tabla: totales_sector(conn, tabla, tamano=tamano), "Value"))
+    filas = []
+    for nombre, en_memoria, por_bloques, columna in casos:
+        esperado, s_memoria, mb_memoria = _medir(en_memoria)
+        obtenido, s_bloques, mb_bloques = _medir(por_bloques)
+        if columna:
+            esperado, obtenido = esperado[columna], obtenido[columna]
+        filas.append((nombre, _diferencia(esperado, obtenido), s_memoria, mb_memoria, s_bloques, mb_bloques))
+    return filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara las agregaciones por bloques con las de memoria.")
+    parser.add_argument("accion", choices=["comparar"])
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--anio", type=int, required=True)
+    parser.add_argument("--tamano", type=int, default=TAMANO_BLOQUE, help="Filas por bloque")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        filas = comparar(conn, args.anio, args.tamano)
+    finally:
+        conn.close()
+    print(f"{'helper':<16}{'dif. máx.':>12}{'memoria s':>12}{'MB':>8}{'bloques s':>12}{'MB':>8}")
+    for nombre, diferencia, s_memoria, mb_memoria, s_bloques, mb_bloques in filas:
+        print(f"{nombre:<16}{diferencia:>12.3g}{s_memoria:>12.2f}{mb_memoria:>8.1f}{s_bloques:>12.2f}{mb_bloques:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Backends de la caché de resultados de `energia.datos`.
+
+- `CacheConsultas`: en memoria del proceso (LRU + TTL). Es la opción por defecto.
+- `CacheCompartida`: compartida por todos los procesos de la máquina. Cada
+  resultado se guarda una vez como archivo Arrow IPC (los DataFrames) o pickle
+  (el resto) y se lee con memory-map, así que las páginas las comparte el
+  sistema operativo; un índice SQLite lleva claves, alcance, tamaño y uso.
+  Con la carpeta en `/dev/shm` vive en memoria compartida. La memoria crece
+  con los datos, no con el número de réplicas de Streamlit.
+
+Ambas guardan la versión de la base (mtime del .db y último evento de
+ingesta) para invalidar de forma consistente: `sincronizar` descarta solo
+los (país, año) de las ingestas nuevas, o todo si el cambio no vino de una
+ingesta. En la compartida esto ocurre una sola vez, en una transacción, por
+más procesos que noten el cambio.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+
+from energia import ingesta
+
+try:
+    # Registra en pyarrow los tipos de extensión de pandas (períodos, intervalos);
+    # sin esto un proceso que solo lee recibe un PeriodIndex como enteros
+    import pandas.core.arrays.arrow.extension_types  # noqa: F401
+except ImportError:
+    pass
+
+
+def _afectada(alcance, afectados):
+    pais, anio = alcance
+    for pais_afectado, anio_afectado in afectados:
+        coincide_pais = pais is None or pais == pais_afectado or (
+            isinstance(pais, frozenset) and pais_afectado in pais)
+        if coincide_pais and (anio is None or anio == anio_afectado):
+            return True
+    return False
+
+
+def _eventos(conn, desde):
+    try:
+        return ingesta.eventos_desde(conn, desde)
+    except sqlite3.OperationalError:
+        return set(), desde
+
+
+class CacheConsultas:
+    """Caché LRU con vencimiento por TTL, segura entre hilos."""
+
+    def __init__(self, ttl, max_entradas):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+    def obtener(self, clave, calcular, alcance=(None, None)):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and ahora - entrada[0] < self.ttl:
+                self._entradas.move_to_end(clave)
+                return entrada[1]
+        valor = calcular()
+        with self._lock:
+            self._entradas[clave] = (ahora, valor, alcance)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar(self, tabla=None):
+        """Elimina las entradas de `tabla` (o todas). La tabla es el primer elemento de la clave."""
+        with self._lock:
+            if tabla is None:
+                self._entradas.clear()
+            else:
+                for clave in [c for c in self._entradas if c[0] == tabla]:
+                    del self._entradas[clave]
+
+    def invalidar_porciones(self, tablas, afectados):
+        """Elimina solo las entradas de `tablas` cuyo (país, año) intersecta `afectados`."""
+        with self._lock:
+            for clave, (_, _, alcance) in list(self._entradas.items()):
+                if clave[0] in tablas and _afectada(alcance, afectados):
+                    del self._entradas[clave]
+
+    def sincronizar(self, mtime, conn, tablas):
+        """Alinea la caché con la versión `mtime` de la base.
+
+        Devuelve los (país, año) invalidados, un conjunto vacío si se invalidó
+        todo, o None si no hubo que invalidar nada.
+        """
+        with self._lock:
+            if self._version is None:
+                self._version = (mtime, ingesta.ultimo_evento(conn))
+                return None
+            anterior, desde = self._version
+            if anterior == mtime:
+                return None
+            afectados, hasta = _eventos(conn, desde)
+            self._version = (mtime, hasta)
+        if afectados:
+            self.invalidar_porciones(tablas, afectados)
+        else:
+            self.invalidar()
+        return afectados
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+class CacheCompartida:
+    """Caché en disco (Arrow IPC + índice SQLite) compartida entre procesos."""
+
+    def __init__(self, carpeta, ttl, max_bytes):
+        self.carpeta = carpeta
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(carpeta, exist_ok=True)
+        self._local = threading.local()
+        with self._indice() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entradas (
+                    clave TEXT PRIMARY KEY, tabla TEXT, pais TEXT, anio INTEGER,
+                    archivo TEXT, creado REAL, usado REAL, bytes INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entradas_tabla ON entradas (tabla)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entradas_usado ON entradas (usado)")
+            # Versión de la base con la que está alineada la caché
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1), mtime INTEGER, desde INTEGER, hasta INTEGER
+                )
+            """)
+
+    def _indice(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.carpeta, "indice.db"), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # --------------------------
+    # Serialización
+    # --------------------------
+    def _ruta(self, archivo):
+        return os.path.join(self.carpeta, archivo)
+
+    def _escribir(self, clave_texto, valor):
+        nombre = hashlib.sha1(clave_texto.encode("utf-8")).hexdigest()
+        # Temporal propio de cada hilo; os.replace publica el archivo completo
+        sufijo = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if isinstance(valor, pd.DataFrame):
+            archivo = nombre + ".arrow"
+            tabla = pa.Table.from_pandas(valor, preserve_index=True)
+            temporal = self._ruta(archivo + sufijo)
+            with pa.OSFile(temporal, "wb") as destino, pa.ipc.new_file(destino, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+        else:
+            archivo = nombre + ".pkl"
+            temporal = self._ruta(archivo + sufijo)
+            with open(temporal, "wb") as destino:
+                pickle.dump(valor, destino, protocol=pickle.HIGHEST_PROTOCOL)
+        tamano = os.path.getsize(temporal)
+        os.replace(temporal, self._ruta(archivo))
+        return archivo, tamano
+
+    def _leer(self, archivo):
+        ruta = self._ruta(archivo)
+        if archivo.endswith(".arrow"):
+            with pa.memory_map(ruta) as origen:
+                return pa.ipc.open_file(origen).read_all().to_pandas()
+        with open(ruta, "rb") as origen:
+            return pickle.load(origen)
+
+    @staticmethod
+    def _alcance_texto(alcance):
+        pais, anio = alcance
+        if isinstance(pais, frozenset):
+            pais = json.dumps(sorted(pais))
+        return pais, anio
+
+    @staticmethod
+    def _alcance_desde_texto(pais, anio):
+        if pais is not None and pais.startswith("["):
+            pais = frozenset(json.loads(pais))
+        return pais, anio
+
+    # --------------------------
+    # Interfaz de caché
+    # --------------------------
+    def obtener(self, clave, calcular, alcance=(None, None)):
+        clave_texto = repr(clave)
+        conn = self._indice()
+        fila = conn.execute("SELECT archivo, creado FROM entradas WHERE clave = ?", (clave_texto,)).fetchone()
+        ahora = time.time()
+        if fila is not None and ahora - fila[1] < self.ttl:
+            try:
+                valor = self._leer(fila[0])
+            except (OSError, pa.ArrowInvalid, pickle.UnpicklingError, EOFError):
+                # Otro proceso lo borró entre la consulta y la lectura
+                valor = None
+            if valor is not None:
+                conn.execute("UPDATE entradas SET usado = ? WHERE clave = ?", (ahora, clave_texto))
+                return valor
+
+        valor = calcular()
+        archivo, tamano = self._escribir(clave_texto, valor)
+        pais, anio = self._alcance_texto(alcance)
+        conn.execute("INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     (clave_texto, str(clave[0]), pais, anio, archivo, ahora, ahora, tamano))
+        self._desalojar(conn)
+        return valor
+
+    def _borrar(self, conn, filas):
+        for clave_texto, archivo in filas:
+            conn.execute("DELETE FROM entradas WHERE clave = ?", (clave_texto,))
+            try:
+                os.remove(self._ruta(archivo))
+            except FileNotFoundError:
+                pass
+
+    def _desalojar(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entradas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        filas = []
+        for clave_texto, archivo, tamano in conn.execute(
+                "SELECT clave, archivo, bytes FROM entradas ORDER BY usado"):
+            if total <= self.max_bytes:
+                break
+            filas.append((clave_texto, archivo))
+            total -= tamano
+        self._borrar(conn, filas)
+
+    def invalidar(self, tabla=None):
+        conn = self._indice()
+        if tabla is None:
+            filas = conn.execute("SELECT clave, archivo FROM entradas").fetchall()
+        else:
+            filas = conn.execute("SELECT clave, archivo FROM entradas WHERE tabla = ?", (str(tabla),)).fetchall()
+        self._borrar(conn, filas)
+
+    def invalidar_porciones(self, tablas, afectados):
+        conn = self._indice()
+        marcas = ", ".join("?" * len(tablas))
+        filas = [(clave_texto, archivo) for clave_texto, archivo, pais, anio in conn.execute(
+                     f"SELECT clave, archivo, pais, anio FROM entradas WHERE tabla IN ({marcas})",
+                     [str(t) for t in tablas]).fetchall()
+                 if _afectada(self._alcance_desde_texto(pais, anio), afectados)]
+        self._borrar(conn, filas)
+
+    def sincronizar(self, mtime, conn, tablas):
+        """Como `CacheConsultas.sincronizar`, pero una sola vez para todos los procesos."""
+        indice = self._indice()
+        indice.execute("BEGIN IMMEDIATE")
+        try:
+            fila = indice.execute("SELECT mtime, desde, hasta FROM version WHERE id = 1").fetchone()
+            if fila is None:
+                # Carpeta nueva o de otra base: se empieza de cero
+                ultimo = ingesta.ultimo_evento(conn)
+                indice.execute("INSERT INTO version VALUES (1, ?, ?, ?)", (mtime, ultimo, ultimo))
+                self.invalidar()
+                indice.execute("COMMIT")
+                return None
+            anterior, desde, hasta = fila
+            if anterior == mtime:
+                indice.execute("COMMIT")
+                # Otro proceso ya invalidó: se informan los mismos afectados
+                return _eventos(conn, desde)[0]
+            afectados, nuevo = _eventos(conn, hasta)
+            indice.execute("UPDATE version SET mtime = ?, desde = ?, hasta = ? WHERE id = 1", (mtime, hasta, nuevo))
+            if afectados:
+                self.invalidar_porciones(tablas, afectados)
+            else:
+                self.invalidar()
+            indice.execute("COMMIT")
+        except BaseException:
+            indice.execute("ROLLBACK")
+            raise
+        return afectados
+
+    def __len__(self):
+        return self._indice().execute("SELECT COUNT(*) FROM entradas").fetchone()[0]
@@ -0,0 +1,196 @@
+"""Calentamiento de cachés al arrancar el servidor.
+
+Después de cada despliegue o reinicio, el primer visitante pagaba la carga de
+las tablas y todas las agregaciones. `iniciar()` lanza (una sola vez por
+proceso) un hilo en segundo plano que prepara la base y llena las cachés de
+datos y de figuras para las combinaciones (sección, país, año) más pedidas:
+
+- las de un archivo JSON (`ENERGIA_CALENTAMIENTO`), p. ej.
+  ``{"combinaciones": [{"seccion": "Diagnóstico Nacional", "pais": "Colombia", "anio": null}]}``
+  (``anio: null`` = el último año con datos);
+- si no hay archivo, las más visitadas según las estadísticas de acceso que
+  registra `app.py` (`ENERGIA_ACCESOS`);
+- si tampoco hay estadísticas, 'Todos' y 'Colombia' en el último año para
+  cada sección.
+
+`estado()` informa el avance: ``preparando`` mientras se migra la base y se
+refrescan los agregados (la interfaz avisa y vuelve a intentar sin consultar
+datos, en lugar de esperar el candado) y ``calentando`` mientras se llenan las
+cachés (la interfaz muestra el avance sin bloquear). `servir_estado()` expone `/listo` (200 cuando terminó, 503 mientras tanto)
+y `/estado` en un puerto aparte, junto con `/metricas` (tiempos por etapa en
+formato Prometheus, ver `energia.instrumentacion`). `python -m energia.servidor` arranca todo
+junto con Streamlit.
+"""
+import json
+import os
+import threading
+import time
+import traceback
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from energia import config, consultas, datos, graficos, instrumentacion
+
+ARCHIVO_COMBINACIONES = os.environ.get("ENERGIA_CALENTAMIENTO", "calentamiento.json")
+ARCHIVO_ACCESOS = os.environ.get("ENERGIA_ACCESOS", "accesos_dashboard.json")
+MAX_COMBINACIONES = int(os.environ.get("ENERGIA_CALENTAR_MAX", 12))
+GUARDAR_CADA_SEGUNDOS = 60
+
+_estado = {"estado": "inactivo", "hechas": 0, "total": 0, "inicio": None, "fin": None, "error": None}
+_lock = threading.Lock()
+_hilo = None
+
+_accesos = Counter()
+_accesos_lock = threading.Lock()
+_ultimo_guardado = time.monotonic()
+
+
+# --------------------------
+# Estadísticas de acceso
+# --------------------------
+def _leer_accesos():
+    try:
+        with open(ARCHIVO_ACCESOS, encoding="utf-8") as f:
+            return Counter({tuple(clave.split("|", 2)): n for clave, n in json.load(f).items()})
+    except (OSError, ValueError):
+        return Counter()
+
+
+def _guardar_accesos():
+    acumulados = _leer_accesos()
+    with _accesos_lock:
+        acumulados.update(_accesos)
+        _accesos.clear()
+    temporal = ARCHIVO_ACCESOS + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"|".join(clave): n for clave, n in acumulados.items()}, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ARCHIVO_ACCESOS)
+
+
+def registrar_acceso(seccion, pais, anio):
+    """Cuenta una vista de (sección, país, año); se guarda en disco cada minuto."""
+    global _ultimo_guardado
+    with _accesos_lock:
+        _accesos[(seccion, str(pais), str(anio))] += 1
+        guardar = time.monotonic() - _ultimo_guardado > GUARDAR_CADA_SEGUNDOS
+        if guardar:
+            _ultimo_guardado = time.monotonic()
+    if guardar:
+        try:
+            _guardar_accesos()
+        except OSError:
+            # Disco de solo lectura: las estadísticas quedan solo en memoria
+            pass
+
+
+# --------------------------
+# Combinaciones a calentar
+# --------------------------
+def combinaciones(ultimo_anio):
+    """Lista de (sección, país, año) a calentar, de la más a la menos importante."""
+    if os.path.exists(ARCHIVO_COMBINACIONES):
+        with open(ARCHIVO_COMBINACIONES, encoding="utf-8") as f:
+            especificadas = json.load(f)["combinaciones"]
+        return [(c["seccion"], c["pais"], c.get("anio") or ultimo_anio) for c in especificadas]
+
+    accesos = _leer_accesos()
+    with _accesos_lock:
+        accesos.update(_accesos)
+    if accesos:
+        return [(seccion, pais, int(anio) if anio.isdigit() else ultimo_anio)
+                for (seccion, pais, anio), _ in accesos.most_common(MAX_COMBINACIONES)
+                if seccion in graficos.SECCIONES and seccion not in graficos.MULTIPAIS]
+
+    return [(seccion, pais, ultimo_anio) for pais in ("Todos", "Colombia")
+            for seccion in graficos.SECCIONES if seccion not in graficos.MULTIPAIS]
+
+
+# --------------------------
+# Calentamiento
+# --------------------------
+def _actualizar(**cambios):
+    with _lock:
+        _estado.update(cambios)
+
+
+def calentar():
+    """Prepara la base y llena las cachés de datos y figuras (bloqueante)."""
+    _actualizar(estado="preparando", hechas=0, total=0, inicio=time.time(), fin=None, error=None)
+    try:
+        datos.verificar_archivo()
+        _actualizar(estado="calentando")
+        paises = set(datos.consultar(config.TABLA_MENSUAL, consultas.paises)) | {"Todos"}
+        anios = datos.consultar(config.TABLA_MENSUAL, consultas.anios)
+        pendientes = [c for c in combinaciones(max(anios)) if c[1] in paises and c[2] in anios] if anios else []
+        _actualizar(total=len(pendientes))
+        for seccion, pais, anio in pendientes:
+            tipo_energia = 'ambas' if seccion == "Tendencia Mensual" else None
+            graficos.construir(seccion, pais, anio, tipo_energia)
+            with _lock:
+                _estado["hechas"] += 1
+        _actualizar(estado="listo", fin=time.time())
+    except Exception as e:
+        traceback.print_exc()
+        _actualizar(estado="error", error=f"{type(e).__name__}: {e}", fin=time.time())
+
+
+def iniciar():
+    """Lanza el calentamiento en segundo plano si todavía no se lanzó en este proceso."""
+    global _hilo
+    with _lock:
+        if _hilo is not None:
+            return _hilo
+        _hilo = threading.Thread(target=calentar, name="energia-calentamiento", daemon=True)
+        _estado["estado"] = "preparando"
+    _hilo.start()
+    return _hilo
+
+
+def estado():
+    with _lock:
+        return dict(_estado)
+
+
+def preparando():
+    """True mientras el calentamiento prepara la base (las consultas esperarían)."""
+    return estado()["estado"] == "preparando" and not datos.preparada()
+
+
+def listo():
+    # Si el calentamiento falló el servidor igual atiende, solo que en frío
+    return estado()["estado"] in ("listo", "error")
+
+
+# --------------------------
+# Endpoint de disponibilidad
+# --------------------------
+class _ManejadorEstado(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") == "/listo":
+            codigo = 200 if listo() else 503
+        elif self.path.rstrip("/") == "/estado":
+            codigo = 200
+        elif self.path.rstrip("/") == "/metricas":
+            self._responder(200, "text/plain; version=0.0.4", instrumentacion.prometheus().encode("utf-8"))
+            return
+        else:
+            self.send_error(404)
+            return
+        self._responder(codigo, "application/json", json.dumps({**estado(), "listo": listo()}).encode("utf-8"))
+
+    def _responder(self, codigo, tipo, cuerpo):
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def servir_estado(puerto, host="0.0.0.0"):
+    """Sirve `/listo`, `/estado` y `/metricas` en un hilo aparte; devuelve el servidor."""
+    servidor = ThreadingHTTPServer((host, puerto), _ManejadorEstado)
+    threading.Thread(target=servidor.serve_forever, name="energia-estado", daemon=True).start()
+    return servidor
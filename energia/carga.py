@@ -0,0 +1,331 @@
+"""Prueba de carga con sesiones concurrentes contra un servidor de Streamlit.
+
+Levanta el dashboard con `energia.servidor` (como en Railway) en un puerto
+local y abre N sesiones a la vez por el mismo websocket que usa el navegador
+(`/_stcore/stream`, mensajes protobuf de Streamlit). Cada sesión carga la
+página y luego repite pasos como los de un usuario: cambia el país o el año,
+cambia de sección o de tipo de energía (un widget al azar de los visibles,
+con más peso para esos filtros), o de página en una app multipágina como
+`dashboard_unificado.py`, y espera un tiempo de lectura antes del
+siguiente. Se mide cada rerun, desde que se envía el cambio hasta que el
+servidor avisa que terminó el script.
+
+`streamlit.testing.v1.AppTest` corre el script dentro del proceso de prueba,
+sin servidor ni serialización, así que no sirve para ver cuántas sesiones
+aguanta una instancia; por eso aquí se habla con un servidor real.
+
+Por cada nivel de concurrencia reporta p50/p95/p99 de los reruns, reruns por
+segundo, errores y el RSS máximo del servidor:
+
+    python -m energia.carga app.py --sesiones 1 4 8 16 32 --pasos 20
+    python -m energia.carga dashboard_final.py --sesiones 8 --pausa 0 --json carga.json
+    python -m energia.carga app.py --url ws://127.0.0.1:8501/_stcore/stream   # servidor ya levantado
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+from energia import config
+
+PUERTO = 8599
+WIDGETS = ("selectbox", "radio", "checkbox")
+# Peso de cada widget al elegir el siguiente paso (por texto de la etiqueta; el resto pesa 1)
+PESOS = {"país": 3, "año": 3, "secci": 2, "tipo de energía": 2, "menú": 2, "análisis": 2}
+# En apps multipágina, probabilidad de que el paso sea cambiar de página
+CAMBIO_PAGINA = 0.15
+TERMINADO_ERROR = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_WITH_COMPILE_ERROR")
+TERMINADO_RERUN = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_EARLY_FOR_RERUN")
+
+
+# --------------------------
+# Servidor
+# --------------------------
+def iniciar_servidor(app, puerto=PUERTO, db_path=None, espera=120, calentar=True):
+    """Levanta `python -m energia.servidor app` en `puerto` y espera a que responda.
+
+    Con ``calentar=False`` usa `streamlit run` sin más (arranque en frío, sin
+    calentamiento de cachés ni importaciones previas).
+    """
+    entorno = {**os.environ, "ENERGIA_PUERTO_ESTADO": "0"}
+    if db_path:
+        entorno["ENERGIA_DB"] = db_path
+    comando = ["energia.servidor"] if calentar else ["streamlit", "run"]
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", *comando, app, "--server.port", str(puerto),
+         "--server.headless", "true", "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"El servidor terminó al arrancar (código {proceso.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1) as respuesta:
+                if respuesta.status == 200:
+                    return proceso
+        except OSError:
+            time.sleep(0.2)
+    proceso.terminate()
+    raise TimeoutError(f"El servidor no respondió en {espera} s")
+
+
+def _hijos(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(hijo) for hijo in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_mb(pid):
+    """RSS (MB) de `pid` y sus procesos hijos; None fuera de Linux."""
+    total, pendientes = 0, [pid]
+    while pendientes:
+        actual = pendientes.pop()
+        try:
+            with open(f"/proc/{actual}/statm") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            if actual == pid:
+                return None
+            continue
+        pendientes.extend(_hijos(actual))
+    return total / 1e6
+
+
+# --------------------------
+# Sesiones
+# --------------------------
+class Sesion:
+    """Una pestaña del navegador: websocket propio y estado de sus widgets."""
+
+    def __init__(self, url, semilla=None):
+        self.url = url
+        self.azar = random.Random(semilla)
+        self.widgets = {}
+        self.estados = {}
+        # Apps multipágina: {url de la página: hash} (mensaje de navegación) y página actual
+        self.paginas = {}
+        self.pagina = ""
+        self._cliente = self.conexion = None
+
+    def __enter__(self):
+        self._cliente = connect(self.url, subprotocols=["streamlit"], max_size=None, open_timeout=30)
+        self.conexion = self._cliente.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._cliente.__exit__(*exc)
+
+    def rerun(self):
+        """Envía los widgets actuales y espera el fin del script: (segundos, sin errores)."""
+        mensaje = BackMsg()
+        mensaje.rerun_script.query_string = ""
+        mensaje.rerun_script.page_script_hash = self.pagina
+        mensaje.rerun_script.widget_states.widgets.extend(self.estados.values())
+        inicio = time.perf_counter()
+        self.conexion.send(mensaje.SerializeToString())
+        widgets, ok = {}, True
+        while True:
+            respuesta = ForwardMsg()
+            respuesta.ParseFromString(self.conexion.recv())
+            tipo = respuesta.WhichOneof("type")
+            if tipo == "delta" and respuesta.delta.WhichOneof("type") == "new_element":
+                elemento = respuesta.delta.new_element
+                clase = elemento.WhichOneof("type")
+                if clase == "exception":
+                    ok = False
+                elif clase in WIDGETS:
+                    widget = getattr(elemento, clase)
+                    widgets[widget.id] = (clase, widget.label, list(getattr(widget, "options", [])))
+            elif tipo == "navigation":
+                self.paginas = {pagina.url_pathname: pagina.page_script_hash
+                                for pagina in respuesta.navigation.app_pages}
+                self.pagina = respuesta.navigation.page_script_hash
+            elif tipo == "script_finished":
+                estado = respuesta.script_finished
+                # Un st.rerun() dentro del script sigue en la misma respuesta
+                if estado == TERMINADO_RERUN:
+                    continue
+                ok = ok and estado != TERMINADO_ERROR
+                break
+        segundos = time.perf_counter() - inicio
+        # Como el navegador: solo se envían los widgets que siguen en pantalla
+        self.widgets = widgets
+        self.estados = {id_widget: estado for id_widget, estado in self.estados.items() if id_widget in widgets}
+        return segundos, ok
+
+    def _peso(self, etiqueta):
+        etiqueta = etiqueta.lower()
+        return max([peso for texto, peso in PESOS.items() if texto in etiqueta], default=1)
+
+    def ir(self, url_pagina):
+        """Navega a otra página de una app multipágina: (segundos, sin errores)."""
+        self.pagina = self.paginas[url_pagina]
+        self.estados = {}
+        return self.rerun()
+
+    def paso(self):
+        """Cambia un widget visible al azar (país, año, sección, tipo...) o de página y hace el rerun."""
+        otras = [url_pagina for url_pagina, hash_pagina in self.paginas.items() if hash_pagina != self.pagina]
+        if otras and self.azar.random() < CAMBIO_PAGINA:
+            return self.ir(self.azar.choice(otras))
+        candidatos = [(id_widget, clase, opciones) for id_widget, (clase, _, opciones) in self.widgets.items()
+                      if clase == "checkbox" or len(opciones) > 1]
+        if candidatos:
+            id_widget, clase, opciones = self.azar.choices(
+                candidatos, weights=[self._peso(self.widgets[c[0]][1]) for c in candidatos])[0]
+            estado = WidgetState(id=id_widget)
+            if clase == "checkbox":
+                anterior = self.estados.get(id_widget)
+                estado.bool_value = not (anterior.bool_value if anterior else False)
+            else:
+                estado.string_value = self.azar.choice(opciones)
+            self.estados[id_widget] = estado
+        return self.rerun()
+
+
+def _recorrer(url, pasos, pausa, semilla, inicio_comun, resultados, bloqueo):
+    inicios, reruns, errores = [], [], 0
+    try:
+        inicio_comun.wait()
+        with Sesion(url, semilla) as sesion:
+            segundos, ok = sesion.rerun()
+            inicios.append(segundos)
+            errores += not ok
+            for _ in range(pasos):
+                if pausa:
+                    time.sleep(sesion.azar.expovariate(1 / pausa))
+                segundos, ok = sesion.paso()
+                reruns.append(segundos)
+                errores += not ok
+    except Exception as error:
+        # Conexión rechazada o cortada: cuenta como error del nivel y no detiene a las demás
+        print(f"⚠️ Sesión {semilla}: {error!r}", file=sys.stderr)
+        errores += 1
+    with bloqueo:
+        resultados["inicios"].extend(inicios)
+        resultados["reruns"].extend(reruns)
+        resultados["errores"] += errores
+
+
+def _percentiles(valores):
+    if not valores:
+        return dict.fromkeys(("p50", "p95", "p99"))
+    p50, p95, p99 = np.percentile(np.array(valores) * 1000, [50, 95, 99])
+    return {"p50": round(float(p50), 1), "p95": round(float(p95), 1), "p99": round(float(p99), 1)}
+
+
+def nivel(url, sesiones, pasos=20, pausa=1.0, pid=None, semilla=0):
+    """Corre `sesiones` sesiones a la vez, `pasos` reruns cada una; devuelve las métricas del nivel."""
+    resultados = {"inicios": [], "reruns": [], "errores": 0}
+    bloqueo, inicio_comun = threading.Lock(), threading.Event()
+    hilos = [threading.Thread(target=_recorrer, name=f"energia-carga-{i}",
+                              args=(url, pasos, pausa, semilla * 10_000 + i, inicio_comun, resultados, bloqueo))
+             for i in range(sesiones)]
+    for hilo in hilos:
+        hilo.start()
+
+    # RSS del servidor muestreado mientras corren las sesiones
+    maximo = [rss_mb(pid) if pid else None]
+
+    def muestrear():
+        while any(hilo.is_alive() for hilo in hilos):
+            actual = rss_mb(pid)
+            if actual is not None:
+                maximo[0] = max(maximo[0] or 0, actual)
+            time.sleep(0.2)
+
+    muestreo = threading.Thread(target=muestrear, daemon=True) if pid else None
+    inicio = time.perf_counter()
+    inicio_comun.set()
+    if muestreo:
+        muestreo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    if muestreo:
+        muestreo.join()
+
+    return {
+        "sesiones": sesiones,
+        "reruns": len(resultados["reruns"]),
+        "errores": resultados["errores"],
+        **_percentiles(resultados["reruns"]),
+        "inicio_p50": _percentiles(resultados["inicios"])["p50"],
+        "reruns_s": round(len(resultados["reruns"]) / duracion, 2) if duracion else None,
+        "rss_mb": round(maximo[0], 1) if maximo[0] is not None else None,
+    }
+
+
+def ejecutar(url, niveles, pasos=20, pausa=1.0, pid=None):
+    """Métricas de cada nivel de concurrencia, después de una sesión de calentamiento."""
+    with Sesion(url) as sesion:
+        sesion.rerun()
+    return [nivel(url, sesiones, pasos, pausa, pid, semilla=i) for i, sesiones in enumerate(niveles)]
+
+
+def imprimir(filas, umbral_ms):
+    print(f"{'sesiones':>9}{'reruns':>8}{'errores':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'inicio ms':>11}{'reruns/s':>10}{'RSS MB':>9}")
+    for fila in filas:
+        print("".join(f"{'—' if fila[c] is None else fila[c]:>{ancho}}" for c, ancho in [
+            ("sesiones", 9), ("reruns", 8), ("errores", 9), ("p50", 10), ("p95", 10), ("p99", 10),
+            ("inicio_p50", 11), ("reruns_s", 10), ("rss_mb", 9)]))
+    dentro = [f["sesiones"] for f in filas if f["p95"] is not None and f["p95"] <= umbral_ms and not f["errores"]]
+    if dentro:
+        print(f"✅ Hasta {max(dentro)} sesiones simultáneas con p95 ≤ {umbral_ms:.0f} ms y sin errores")
+    else:
+        print(f"❌ Ningún nivel con p95 ≤ {umbral_ms:.0f} ms y sin errores")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones concurrentes de Streamlit.")
+    parser.add_argument("app", help="Script a servir (app.py, dashboard_final.py, ...)")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Niveles de concurrencia a medir")
+    parser.add_argument("--pasos", type=int, default=20, help="Cambios de widget por sesión")
+    parser.add_argument("--pausa", type=float, default=1.0,
+                        help="Tiempo medio (s) de lectura entre pasos; 0 = sin pausa")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--url", help="Websocket de un servidor ya levantado (no se mide su memoria)")
+    parser.add_argument("--umbral", type=float, default=2000, help="p95 (ms) aceptable para el resumen")
+    parser.add_argument("--json", help="Guarda el reporte en este archivo")
+    args = parser.parse_args(argv)
+
+    proceso = None
+    try:
+        if args.url:
+            url, pid = args.url, None
+        else:
+            proceso = iniciar_servidor(args.app, args.puerto, args.db)
+            url, pid = f"ws://127.0.0.1:{args.puerto}/_stcore/stream", proceso.pid
+        print(f"🔥 {args.app} · niveles {args.sesiones} · {args.pasos} pasos por sesión · pausa {args.pausa} s")
+        filas = ejecutar(url, args.sesiones, args.pasos, args.pausa, pid)
+    finally:
+        if proceso:
+            proceso.terminate()
+            proceso.wait(timeout=30)
+
+    imprimir(filas, args.umbral)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"app": args.app, "pasos": args.pasos, "pausa": args.pausa, "niveles": filas},
+                      f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
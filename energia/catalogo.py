@@ -0,0 +1,233 @@
+"""Catálogo de consultas con nombre para los dashboards.
+
+Cada consulta es una sentencia fija, con parámetros con nombre (`:anio`) y
+solo las columnas que usa el gráfico, en lugar de `SELECT * FROM '{tabla}'`
+armado en cada llamada. Como el texto SQL no cambia entre llamadas, las
+conexiones del pool de `energia.datos` (de vida larga) reutilizan la
+sentencia ya preparada de su caché de sentencias.
+
+`verificar` corre `EXPLAIN QUERY PLAN` sobre todo el catálogo y señala las
+consultas que recorren completa una tabla que sí tiene índices, y las que
+recorren completo un índice (aunque sea de cobertura) de una tabla grande,
+también con una búsqueda de rango abierto (`Country>?`, sin igualdades ni
+cota por el otro lado), que en la práctica lee todo el índice:
+
+    python -m energia.catalogo verificar
+    python -m energia.catalogo listar
+"""
+import argparse
+import re
+import sqlite3
+import sys
+
+import pandas as pd
+
+from energia.config import DB_PATH, TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+from energia.intensidad import INTENSIDAD
+from energia.rollups import CUBO, TODOS
+from energia.tipos import aplicar_esquema
+
+
+def _tabla(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+class Consulta:
+    """Sentencia del catálogo: `tabla` agrupa sus resultados en la caché de `energia.datos`."""
+
+    def __init__(self, tabla, sql):
+        self.tabla = tabla
+        self.sql = " ".join(sql.split())
+        self.parametros = tuple(dict.fromkeys(re.findall(r":(\w+)", self.sql)))
+
+
+CONSULTAS = {
+    # Consumo eléctrico por sector (Colombia)
+    "anios_consumo": Consulta(TABLA_SECTORIAL, f"""
+        SELECT DISTINCT Year FROM {_tabla(TABLA_SECTORIAL)} ORDER BY Year
+    """),
+    "consumo_anio_sector": Consulta(TABLA_SECTORIAL, f"""
+        SELECT Year, Sector, SUM(Value) AS Value FROM {_tabla(TABLA_SECTORIAL)}
+        GROUP BY Year, Sector ORDER BY Year, Sector
+    """),
+    "consumo_por_sector": Consulta(TABLA_SECTORIAL, f"""
+        SELECT Sector, SUM(Value) AS Value FROM {_tabla(TABLA_SECTORIAL)}
+        WHERE Year = :anio GROUP BY Sector ORDER BY Sector
+    """),
+    "consumo_anual_sector": Consulta(TABLA_SECTORIAL, f"""
+        SELECT Year, SUM(Value) AS Value FROM {_tabla(TABLA_SECTORIAL)}
+        WHERE Sector = :sector GROUP BY Year ORDER BY Year
+    """),
+    # Emisiones de CO₂ por sector (Colombia)
+    "anios_emisiones": Consulta(TABLA_CO2, f"""
+        SELECT DISTINCT Year FROM {_tabla(TABLA_CO2)} ORDER BY Year
+    """),
+    "emisiones_anio_sector": Consulta(TABLA_CO2, f"""
+        SELECT Year, Sector, SUM(Value) AS Value FROM {_tabla(TABLA_CO2)}
+        GROUP BY Year, Sector ORDER BY Year, Sector
+    """),
+    "emisiones_por_sector": Consulta(TABLA_CO2, f"""
+        SELECT Sector, SUM(Value) AS Value FROM {_tabla(TABLA_CO2)}
+        WHERE Year = :anio GROUP BY Sector ORDER BY Sector
+    """),
+    # Intensidad de emisiones por sector (tabla de hechos de `energia.intensidad`)
+    "intensidad_sector": Consulta(INTENSIDAD, f"""
+        SELECT Year, Sector, Consumo, Emisiones, Intensidad, Participacion_Consumo, Participacion_Emisiones
+        FROM {INTENSIDAD} WHERE Sector <> '{TODOS}' ORDER BY Year, Sector
+    """),
+    "intensidad_total": Consulta(INTENSIDAD, f"""
+        SELECT Year, Consumo, Emisiones, Intensidad FROM {INTENSIDAD}
+        WHERE Sector = '{TODOS}' ORDER BY Year
+    """),
+    # Filtros de la tabla mensual, desde el cubo (que ya excluye los agregados):
+    # las filas de total de cada país se buscan año por año en el índice
+    # (Year, Balance, Product), sin recorrer la tabla mensual
+    "paises": Consulta(CUBO, f"""
+        SELECT DISTINCT Country FROM {CUBO}
+        WHERE Year IN (SELECT Year FROM {CUBO}
+                       WHERE Country = '{TODOS}' AND Balance = '{TODOS}' AND Product = '{TODOS}')
+          AND Balance = '{TODOS}' AND Product = '{TODOS}' AND Country <> '{TODOS}'
+        ORDER BY Country
+    """),
+    # Una fila de total ('*') por año en el cubo: búsqueda por clave primaria
+    "anios": Consulta(CUBO, f"""
+        SELECT Year FROM {CUBO}
+        WHERE Country = '{TODOS}' AND Balance = '{TODOS}' AND Product = '{TODOS}' AND Year IS NOT NULL
+        ORDER BY Year
+    """),
+}
+
+
+# Tablas que no se deben recorrer completas ni por un índice de cobertura
+TABLAS_GRANDES = {TABLA_MENSUAL}
+FILAS_TABLA_GRANDE = 100_000
+
+
+def consulta(nombre):
+    try:
+        return CONSULTAS[nombre]
+    except KeyError:
+        raise ValueError(f"Consulta desconocida: {nombre!r} (ver `python -m energia.catalogo listar`)") from None
+
+
+def ejecutar(conn, nombre, **parametros):
+    """Resultado de la consulta `nombre` como DataFrame con el esquema compacto."""
+    sentencia = consulta(nombre)
+    faltan = set(sentencia.parametros) - set(parametros)
+    sobran = set(parametros) - set(sentencia.parametros)
+    if faltan or sobran:
+        raise ValueError(f"Parámetros de {nombre!r}: se esperaban {list(sentencia.parametros)}, "
+                         f"llegaron {sorted(parametros)}")
+    parametros = {k: v.item() if hasattr(v, "item") else v for k, v in parametros.items()}
+    return aplicar_esquema(pd.read_sql_query(sentencia.sql, conn, params=parametros))
+
+
+def valores(conn, nombre, **parametros):
+    """Primera columna de la consulta como lista (para filtros y selectores)."""
+    return [fila[0] for fila in conn.execute(consulta(nombre).sql, parametros)]
+
+
+# --------------------------
+# Verificación de planes
+# --------------------------
+def plan(conn, nombre):
+    """Filas de `EXPLAIN QUERY PLAN` (solo el detalle) de la consulta `nombre`."""
+    sentencia = consulta(nombre)
+    # El plan no depende del valor de los parámetros, solo de que existan
+    parametros = dict.fromkeys(sentencia.parametros)
+    return [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sentencia.sql, parametros)]
+
+
+def _filas(conn, tabla):
+    """Filas de `tabla` según las estadísticas de ANALYZE (0 si no hay)."""
+    try:
+        fila = conn.execute("SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = ?", (tabla,)).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return fila[0] or 0
+
+
+def grande(conn, tabla):
+    return tabla in TABLAS_GRANDES or _filas(conn, tabla) >= FILAS_TABLA_GRANDE
+
+
+def _rango_abierto(detalle):
+    """Búsqueda por índice acotada solo por un lado: `(Country>?)`, `(Year<?)`."""
+    restricciones = re.search(r"\((.*)\)$", detalle)
+    if not restricciones:
+        return False
+    terminos = restricciones.group(1).split(" AND ")
+    if any("=" in t for t in terminos):
+        return False
+    return not (any(">" in t for t in terminos) and any("<" in t for t in terminos))
+
+
+def _recorridos_completos(conn, detalles):
+    """Recorridos completos del plan: de una tabla con índices sin usarlos, o de
+    cualquier índice (también de cobertura, o con un rango abierto) de una tabla grande."""
+    problemas = []
+    for detalle in detalles:
+        if detalle.startswith("SEARCH "):
+            tabla = detalle[len("SEARCH "):].partition(" ")[0]
+            if _rango_abierto(detalle) and grande(conn, tabla):
+                problemas.append(detalle)
+            continue
+        if not detalle.startswith("SCAN "):
+            continue
+        tabla, _, indice = detalle[len("SCAN "):].partition(" USING ")
+        if indice:
+            if grande(conn, tabla):
+                problemas.append(detalle)
+        elif conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+                          (tabla,)).fetchone():
+            problemas.append(detalle)
+    return problemas
+
+
+def verificar(conn, nombres=None):
+    """{nombre: recorridos completos} de las consultas con problemas ({} = todo en orden).
+
+    Las consultas sobre tablas que no existen en esta base se omiten.
+    """
+    problemas = {}
+    for nombre in nombres or CONSULTAS:
+        try:
+            detalles = plan(conn, nombre)
+        except sqlite3.OperationalError:
+            continue
+        recorridos = _recorridos_completos(conn, detalles)
+        if recorridos:
+            problemas[nombre] = recorridos
+    return problemas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catálogo de consultas de los dashboards.")
+    parser.add_argument("accion", choices=["listar", "verificar"])
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    if args.accion == "listar":
+        for nombre, sentencia in CONSULTAS.items():
+            print(f"{nombre}({', '.join(sentencia.parametros)})\n    {sentencia.sql}")
+        return
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        for nombre in CONSULTAS:
+            try:
+                print(f"{nombre}: {' | '.join(plan(conn, nombre))}")
+            except sqlite3.OperationalError as error:
+                print(f"{nombre}: (omitida: {error})")
+        problemas = verificar(conn)
+    finally:
+        conn.close()
+    if problemas:
+        for nombre, recorridos in problemas.items():
+            print(f"❌ {nombre}: {'; '.join(recorridos)}")
+        sys.exit(1)
+    print("✅ Ninguna consulta recorre completa una tabla con índices ni una tabla grande")
+
+
+if __name__ == "__main__":
+    main()
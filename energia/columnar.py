@@ -0,0 +1,242 @@
+"""Caché columnar (Arrow IPC o Parquet) de las tablas del IEA.
+
+`exportar` vuelca cada tabla a archivos tipados, con las columnas de texto
+codificadas como diccionario y particionados por año (`Year=2024/`). Los
+archivos Arrow sin compresión se leen con memory-map, así que varios
+procesos de Streamlit comparten las mismas páginas del sistema operativo y
+cada lectura trae solo las columnas y particiones pedidas.
+
+El manifiesto guarda la fecha de modificación de la base de origen: si la
+base cambia, la caché deja de considerarse disponible hasta reexportar.
+
+Uso:
+    python -m energia.columnar exportar [--formato arrow|parquet]
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import sqlite3
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from energia import config, intensidad, rollups
+from energia.tipos import aplicar_esquema
+
+TABLAS = [config.TABLA_MENSUAL, config.TABLA_SECTORIAL, config.TABLA_CO2]
+MANIFIESTO = "manifiesto.json"
+FORMATOS = {"arrow": "ipc", "parquet": "parquet"}
+
+# Columnas enteras pequeñas; el resto de enteros se guarda como int64
+ENTEROS_COMPACTOS = {"Year": pa.int16(), "Month": pa.int8()}
+
+
+def _carpeta(tabla):
+    return re.sub(r"[^a-z0-9]+", "_", tabla.lower()).strip("_")
+
+
+def _tipo_arrow(columna, dtype):
+    if columna in ENTEROS_COMPACTOS:
+        return ENTEROS_COMPACTOS[columna]
+    if pd.api.types.is_integer_dtype(dtype):
+        return pa.int64()
+    if pd.api.types.is_float_dtype(dtype):
+        return pa.float64()
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def _lotes(conn, tabla, tamano_lote):
+    """Esquema Arrow y lotes de la tabla, leída por bloques para no cargarla entera."""
+    bloques = pd.read_sql_query(f'SELECT * FROM "{tabla}"', conn, chunksize=tamano_lote)
+    primero = next(bloques, None)
+    if primero is None:
+        return None, []
+    schema = pa.schema([(c, _tipo_arrow(c, primero[c].dtype)) for c in primero.columns])
+    # Un archivo IPC admite un solo diccionario por columna: todos los lotes
+    # usan las mismas categorías, leídas de antemano
+    categorias = {
+        campo.name: [fila[0] for fila in conn.execute(
+            f'SELECT DISTINCT "{campo.name}" FROM "{tabla}" WHERE "{campo.name}" IS NOT NULL '
+            f'ORDER BY "{campo.name}"')]
+        for campo in schema if pa.types.is_dictionary(campo.type)
+    }
+
+    def generar():
+        for bloque in itertools.chain([primero], bloques):
+            # Un bloque puede traer solo nulos en una columna numérica (dtype object)
+            for campo in schema:
+                if pa.types.is_integer(campo.type) or pa.types.is_floating(campo.type):
+                    bloque[campo.name] = pd.to_numeric(bloque[campo.name], errors="coerce")
+                elif campo.name in categorias:
+                    bloque[campo.name] = pd.Categorical(bloque[campo.name].astype(object),
+                                                        categories=categorias[campo.name])
+            yield pa.RecordBatch.from_pandas(bloque, schema=schema, preserve_index=False)
+
+    return schema, generar()
+
+
+def exportar(db_path=None, destino=None, formato="arrow", tablas=None, tamano_lote=200_000):
+    """Exporta las tablas a `destino/<tabla>/Year=AAAA/…` y escribe el manifiesto al final."""
+    db_path = db_path or config.DB_PATH
+    destino = destino or config.COLUMNAR_DIR
+    tablas = tablas or TABLAS
+    os.makedirs(destino, exist_ok=True)
+
+    # pyarrow consume los lotes desde sus propios hilos
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    try:
+        # Deja la base normalizada y con agregados al día antes de fijar su mtime
+        rollups.refrescar(conn)
+        intensidad.refrescar(conn)
+        existentes = {fila[0] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        db_mtime = os.stat(db_path).st_mtime_ns
+        exportadas = {}
+        for tabla in tablas:
+            if tabla not in existentes:
+                continue
+            schema, lotes = _lotes(conn, tabla, tamano_lote)
+            if schema is None:
+                continue
+            carpeta = _carpeta(tabla)
+            temporal = os.path.join(destino, carpeta + ".tmp")
+            shutil.rmtree(temporal, ignore_errors=True)
+            particion = None
+            if "Year" in schema.names:
+                particion = ds.partitioning(pa.schema([schema.field("Year")]), flavor="hive")
+            ds.write_dataset(lotes, temporal, schema=schema, format=FORMATOS[formato],
+                             partitioning=particion, existing_data_behavior="delete_matching")
+            final = os.path.join(destino, carpeta)
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(temporal, final)
+            exportadas[tabla] = {"carpeta": carpeta, "particion": "Year" if particion else None,
+                                 "schema": {c.name: str(c.type) for c in schema}}
+    finally:
+        conn.close()
+
+    manifiesto = {"formato": formato, "db_path": os.path.abspath(db_path),
+                  "db_mtime_ns": db_mtime, "tablas": exportadas}
+    ruta = os.path.join(destino, MANIFIESTO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+    _dataset.cache_clear()
+    return manifiesto
+
+
+def _leer_manifiesto(destino):
+    ruta = os.path.join(destino, MANIFIESTO)
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def disponible(tabla, db_path=None, destino=None):
+    """True si la tabla está exportada y la base no cambió desde la exportación."""
+    manifiesto = _leer_manifiesto(destino or config.COLUMNAR_DIR)
+    if not manifiesto or tabla not in manifiesto["tablas"]:
+        return False
+    try:
+        return os.stat(db_path or config.DB_PATH).st_mtime_ns == manifiesto["db_mtime_ns"]
+    except FileNotFoundError:
+        # Sin base SQLite (p. ej. una réplica que solo recibe la caché columnar)
+        return True
+
+
+@lru_cache(maxsize=16)
+def _dataset(destino, tabla, firma):
+    # `firma` (mtime del manifiesto) fuerza reabrir el dataset tras una reexportación
+    manifiesto = _leer_manifiesto(destino)
+    info = manifiesto["tablas"][tabla]
+    particion = None
+    if info["particion"]:
+        particion = ds.partitioning(pa.schema([("Year", ENTEROS_COMPACTOS["Year"])]), flavor="hive")
+    return ds.dataset(os.path.join(destino, info["carpeta"]), format=FORMATOS[manifiesto["formato"]],
+                      partitioning=particion, filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+
+def _expresion(columna, valor):
+    if isinstance(valor, (list, tuple, set)):
+        return pc.field(columna).isin(list(valor))
+    return pc.field(columna) == (valor.item() if hasattr(valor, "item") else valor)
+
+
+def _seleccion(tabla, filtros, destino, condicion):
+    destino = destino or config.COLUMNAR_DIR
+    firma = os.stat(os.path.join(destino, MANIFIESTO)).st_mtime_ns
+    dataset = _dataset(destino, tabla, firma)
+    expresion = condicion
+    for columna, valor in (filtros or {}).items():
+        if valor is not None:
+            parte = _expresion(columna, valor)
+            expresion = parte if expresion is None else expresion & parte
+    return dataset, expresion
+
+
+def cargar(tabla, columnas=None, filtros=None, destino=None, condicion=None):
+    """Lee `columnas` de la tabla aplicando filtros de igualdad/pertenencia (`{"Year": 2024}`).
+
+    Los filtros sobre `Year` descartan particiones completas sin abrirlas.
+    """
+    dataset, expresion = _seleccion(tabla, filtros, destino, condicion)
+    tabla_arrow = dataset.to_table(columns=list(columnas) if columnas else None, filter=expresion)
+    return aplicar_esquema(tabla_arrow.to_pandas())
+
+
+def lotes(tabla, tamano, columnas=None, filtros=None, destino=None, condicion=None):
+    """Como `cargar`, pero en DataFrames de hasta `tamano` filas (sin esquema compacto)."""
+    dataset, expresion = _seleccion(tabla, filtros, destino, condicion)
+    for lote in dataset.to_batches(columns=list(columnas) if columnas else None, filter=expresion,
+                                   batch_size=tamano):
+        if lote.num_rows:
+            yield lote.to_pandas()
+
+
+def _filtros_mensuales(pais, anio, balance, productos, excluir_agregados):
+    condicion = None
+    if excluir_agregados:
+        pais_campo = pc.field("Country").cast(pa.string())
+        # Igual que `NOT LIKE` en SQLite: sin distinguir mayúsculas
+        condicion = (~pc.match_substring(pais_campo, "OECD", ignore_case=True)
+                     & ~pc.match_substring(pais_campo, "Total", ignore_case=True))
+    filtros = {"Country": pais, "Year": anio, "Balance": balance,
+               "Product": list(productos) if productos is not None else None}
+    return filtros, condicion
+
+
+def estadisticas_mensuales(columnas=None, pais=None, anio=None, balance=None,
+                           productos=None, excluir_agregados=True):
+    """Equivalente columnar de `consultas.estadisticas_mensuales`."""
+    filtros, condicion = _filtros_mensuales(pais, anio, balance, productos, excluir_agregados)
+    return cargar(config.TABLA_MENSUAL, columnas=columnas, filtros=filtros, condicion=condicion)
+
+
+def lotes_mensuales(tamano, columnas=None, pais=None, anio=None, balance=None,
+                    productos=None, excluir_agregados=True):
+    """Equivalente columnar de `consultas.lotes_mensuales`."""
+    filtros, condicion = _filtros_mensuales(pais, anio, balance, productos, excluir_agregados)
+    return lotes(config.TABLA_MENSUAL, tamano, columnas=columnas, filtros=filtros, condicion=condicion)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta las tablas del IEA a una caché columnar.")
+    parser.add_argument("accion", choices=["exportar"])
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--destino", default=config.COLUMNAR_DIR, help="Carpeta de la caché columnar")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="arrow")
+    args = parser.parse_args(argv)
+
+    manifiesto = exportar(args.db, args.destino, args.formato)
+    print(f"✅ {len(manifiesto['tablas'])} tabla(s) exportada(s) a {args.destino} ({args.formato})")
+
+
+if __name__ == "__main__":
+    main()
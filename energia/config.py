@@ -0,0 +1,18 @@
+import os
+
+# -------------------
+# Base de datos y tablas
+# -------------------
+DB_PATH = os.environ.get("ENERGIA_DB", "analisis_energetico.db")
+
+# Caché columnar (Arrow/Parquet) generada con `python -m energia.columnar exportar`
+COLUMNAR_DIR = os.environ.get("ENERGIA_COLUMNAR", "cache_columnar")
+
+TABLA_MENSUAL = "Monthly_Electricity_Statistics"
+TABLA_SECTORIAL = "International Energy Agency - electricity final consumption by sector in Colombia"
+TABLA_CO2 = "International Energy Agency - CO2 emissions by sector in Colombia"
+
+BALANCE_NETO = "Net Electricity Production"
+
+# Agregados regionales (OECD, totales) que no son países y se excluyen de los análisis
+FILTRO_PAISES = "Country NOT LIKE '%OECD%' AND Country NOT LIKE '%Total%'"
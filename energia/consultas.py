@@ -0,0 +1,79 @@
+"""Consultas filtradas sobre Monthly_Electricity_Statistics.
+
+Cada sección del dashboard pide solo las columnas y filas que necesita; los
+filtros se resuelven en SQLite con los índices creados por `energia.esquema`
+en lugar de cargar la tabla completa y filtrar en pandas.
+"""
+import pandas as pd
+
+from energia import catalogo
+from energia.config import FILTRO_PAISES, TABLA_MENSUAL
+from energia.tipos import aplicar_esquema
+
+COLUMNAS_MENSUAL = ["Country", "Time", "Balance", "Product", "Value", "Unit", "Year", "Month", "Date"]
+
+
+def _escalar(valor):
+    # sqlite3 no acepta escalares de numpy (np.int64)
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+def _condiciones(pais=None, anio=None, balance=None, productos=None, excluir_agregados=True):
+    condiciones, parametros = [], []
+    if excluir_agregados:
+        condiciones.append(FILTRO_PAISES)
+    if isinstance(pais, (list, tuple)):
+        condiciones.append(f"Country IN ({', '.join('?' * len(pais))})")
+        parametros.extend(pais)
+    elif pais is not None:
+        condiciones.append("Country = ?")
+        parametros.append(pais)
+    if anio is not None:
+        condiciones.append("Year = ?")
+        parametros.append(_escalar(anio))
+    if balance is not None:
+        condiciones.append("Balance = ?")
+        parametros.append(balance)
+    if productos is not None:
+        productos = list(productos)
+        condiciones.append(f"Product IN ({', '.join('?' * len(productos))})")
+        parametros.extend(productos)
+    where = (" WHERE " + " AND ".join(condiciones)) if condiciones else ""
+    return where, parametros
+
+
+def _select_mensual(columnas, pais, anio, balance, productos, excluir_agregados):
+    desconocidas = set(columnas or []) - set(COLUMNAS_MENSUAL)
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {sorted(desconocidas)}")
+    seleccion = ", ".join(columnas) if columnas else "*"
+    where, parametros = _condiciones(pais, anio, balance, productos, excluir_agregados)
+    return f"SELECT {seleccion} FROM '{TABLA_MENSUAL}'{where}", parametros
+
+
+def estadisticas_mensuales(conn, columnas=None, pais=None, anio=None, balance=None,
+                           productos=None, excluir_agregados=True):
+    """Filas de la tabla mensual que cumplen los filtros indicados (None = sin filtro).
+
+    `pais` acepta un nombre o una lista de nombres.
+    """
+    query, parametros = _select_mensual(columnas, pais, anio, balance, productos, excluir_agregados)
+    return aplicar_esquema(pd.read_sql_query(query, conn, params=parametros))
+
+
+def lotes_mensuales(conn, tamano, columnas=None, pais=None, anio=None, balance=None,
+                    productos=None, excluir_agregados=True):
+    """Como `estadisticas_mensuales`, pero en bloques de hasta `tamano` filas (sin esquema compacto)."""
+    query, parametros = _select_mensual(columnas, pais, anio, balance, productos, excluir_agregados)
+    yield from pd.read_sql_query(query, conn, params=parametros, chunksize=tamano)
+
+
+def paises(conn, excluir_agregados=True):
+    if excluir_agregados:
+        return catalogo.valores(conn, "paises")
+    query = f"SELECT DISTINCT Country FROM '{TABLA_MENSUAL}' ORDER BY Country"
+    return [fila[0] for fila in conn.execute(query) if fila[0] is not None]
+
+
+def anios(conn):
+    return catalogo.valores(conn, "anios")
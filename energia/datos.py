@@ -0,0 +1,303 @@
+"""Acceso a datos compartido por todos los dashboards.
+
+- Un pool de conexiones SQLite de solo lectura, reutilizadas entre reruns.
+- Resultados memorizados por (tabla, consulta, filtros) con TTL y desalojo LRU.
+- Las consultas de los dashboards salen del catálogo de `energia.catalogo`
+  (`ejecutar`): sentencias fijas que cada conexión prepara una sola vez.
+- Invalidación automática cuando cambia la fecha de modificación del archivo .db:
+  si el cambio vino de `energia.ingesta`, solo se descartan los resultados de
+  los (país, año) afectados; si no, toda la caché. Antes se refresca la tabla
+  de intensidad (`energia.intensidad`) si cambió la tabla sectorial o la de CO₂.
+- Los resultados se convierten al esquema compacto de `energia.tipos`.
+- La caché vive en memoria del proceso, o con `ENERGIA_CACHE_BACKEND=disco`
+  en una carpeta compartida por todas las réplicas (`energia.cache`).
+- Si existe una caché columnar al día (`energia.columnar`), las lecturas de
+  tablas salen de los archivos Arrow/Parquet en lugar de SQLite.
+
+Los DataFrames devueltos son copias superficiales del resultado en caché:
+agregar columnas es seguro, modificar valores en sitio no.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from energia import catalogo, columnar, config, consultas, esquema, instrumentacion, intensidad, rollups
+from energia.cache import CacheCompartida, CacheConsultas
+from energia.tipos import aplicar_esquema
+
+TTL_SEGUNDOS = int(os.environ.get("ENERGIA_CACHE_TTL", 3600))
+MAX_ENTRADAS = int(os.environ.get("ENERGIA_CACHE_MAX", 256))
+BACKEND = os.environ.get("ENERGIA_CACHE_BACKEND", "memoria")
+CARPETA_COMPARTIDA = os.environ.get("ENERGIA_CACHE_DIR", "cache_compartida")
+MAX_MB_COMPARTIDA = int(os.environ.get("ENERGIA_CACHE_MB", 1024))
+TAMANO_POOL = 4
+# Sentencias preparadas que guarda cada conexión (el catálogo + los filtros dinámicos)
+SENTENCIAS_CACHEADAS = 256
+
+# Tablas cuyo contenido cambia con una ingesta mensual
+TABLAS_MENSUALES = {config.TABLA_MENSUAL, *rollups.ROLLUPS}
+
+
+def _alcance(kwargs):
+    """(país, año) que filtra una consulta; None = todos."""
+    pais = kwargs.get("pais", kwargs.get("Country"))
+    anio = kwargs.get("anio", kwargs.get("Year"))
+    if isinstance(pais, (list, tuple, set)):
+        pais = frozenset(pais)
+    return pais, _clave(anio)
+
+
+class PoolConexiones:
+    """Conexiones de solo lectura reutilizables; se recrean si el archivo cambia."""
+
+    def __init__(self, db_path, tamano=TAMANO_POOL):
+        self.db_path = db_path
+        self._libres = queue.LifoQueue(maxsize=tamano)
+
+    def _abrir(self):
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=SENTENCIAS_CACHEADAS)
+
+    @contextmanager
+    def conexion(self):
+        try:
+            conn = self._libres.get_nowait()
+        except queue.Empty:
+            conn = self._abrir()
+        try:
+            yield conn
+        finally:
+            try:
+                self._libres.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def cerrar(self):
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def crear_cache(backend=None):
+    """Caché de resultados según `ENERGIA_CACHE_BACKEND`: 'memoria' o 'disco'."""
+    backend = backend or BACKEND
+    if backend == "memoria":
+        return CacheConsultas(TTL_SEGUNDOS, MAX_ENTRADAS)
+    if backend == "disco":
+        return CacheCompartida(CARPETA_COMPARTIDA, TTL_SEGUNDOS, MAX_MB_COMPARTIDA * 1024 * 1024)
+    raise ValueError(f"ENERGIA_CACHE_BACKEND desconocido: {backend!r} (usar 'memoria' o 'disco')")
+
+
+_cache = crear_cache()
+_oyentes = []
+_pool = None
+_mtime = None
+_lock = threading.Lock()
+# Bases ya preparadas en este proceso; la preparación tiene su propio candado
+# para no bloquear la caché mientras corren migraciones y agregados
+_preparadas = set()
+_lock_preparacion = threading.Lock()
+
+
+def al_invalidar(funcion):
+    """Registra `funcion(afectados)` para cachés derivadas de estos datos.
+
+    Se llama cuando se descarta parte de la caché: `afectados` es el conjunto de
+    (país, año) de la ingesta, o None si se descartó todo.
+    """
+    _oyentes.append(funcion)
+    return funcion
+
+
+def _notificar(afectados):
+    for funcion in _oyentes:
+        funcion(afectados)
+
+
+def _solo_lectura(error):
+    return (getattr(error, "sqlite_errorname", None) or "").startswith("SQLITE_READONLY")
+
+
+def _ocupada(error):
+    """Base bloqueada por otro escritor (p. ej. una ingesta en curso)."""
+    return (getattr(error, "sqlite_errorname", None) or "").startswith(("SQLITE_BUSY", "SQLITE_LOCKED"))
+
+
+def preparar_base(db_path=None):
+    """Normaliza el esquema y refresca los agregados (requiere escritura).
+
+    Si la base está montada en solo lectura se asume preparada de antemano;
+    cualquier otro error (base ocupada incluida) se propaga.
+    """
+    conn = sqlite3.connect(db_path or config.DB_PATH)
+    try:
+        if not esquema.esta_migrada(conn):
+            esquema.migrar(conn)
+        rollups.refrescar(conn)
+        intensidad.refrescar(conn)
+    except sqlite3.OperationalError as e:
+        if not _solo_lectura(e):
+            raise
+    finally:
+        conn.close()
+
+
+def refrescar_derivadas(db_path=None):
+    """Reconstruye la tabla de intensidad si cambió la tabla sectorial o la de CO₂; True si la reconstruyó."""
+    conn = sqlite3.connect(db_path or config.DB_PATH)
+    try:
+        return intensidad.refrescar(conn)
+    except sqlite3.OperationalError as e:
+        # Solo lectura o base ocupada por otro escritor: se reintenta en el próximo cambio
+        if _solo_lectura(e) or _ocupada(e):
+            return False
+        raise
+    finally:
+        conn.close()
+
+
+def preparada():
+    return config.DB_PATH in _preparadas
+
+
+def asegurar_preparada():
+    """Prepara la base (una vez por ruta y proceso) fuera del candado de la caché.
+
+    La ruta se da por preparada solo si `preparar_base` terminó: con la base
+    ocupada por otro escritor se reintenta en la próxima lectura.
+    """
+    ruta = config.DB_PATH
+    if ruta in _preparadas:
+        return
+    with _lock_preparacion:
+        if ruta in _preparadas:
+            return
+        try:
+            preparar_base(ruta)
+        except sqlite3.OperationalError as e:
+            if not _ocupada(e):
+                raise
+            return
+        _preparadas.add(ruta)
+
+
+def verificar_archivo():
+    """Crea el pool la primera vez y vacía la caché si el .db fue modificado."""
+    global _pool, _mtime
+    asegurar_preparada()
+    with _lock:
+        if _pool is None or _pool.db_path != config.DB_PATH:
+            if _pool is not None:
+                _pool.cerrar()
+            _pool = PoolConexiones(config.DB_PATH)
+            _mtime = None
+        mtime = os.stat(config.DB_PATH).st_mtime_ns
+        if mtime != _mtime:
+            if _mtime is not None:
+                # Una tabla sectorial o de CO₂ cambiada en caliente deja vieja la
+                # intensidad: se refresca antes de invalidar, así hay un solo cambio
+                if refrescar_derivadas():
+                    mtime = os.stat(config.DB_PATH).st_mtime_ns
+                _pool.cerrar()
+            # La caché decide qué descartar; si es compartida, lo hace una sola
+            # vez aunque todas las réplicas noten el cambio
+            with _pool.conexion() as conn:
+                afectados = _cache.sincronizar(mtime, conn, TABLAS_MENSUALES)
+            if _mtime is not None:
+                _notificar(afectados or None)
+        _mtime = mtime
+
+
+def version():
+    """Versión de los datos: mtime (ns) del .db, que cambia con cada ingesta o reemplazo."""
+    verificar_archivo()
+    return _mtime
+
+
+@contextmanager
+def conexion():
+    verificar_archivo()
+    with _pool.conexion() as conn:
+        yield conn
+
+
+def _clave(valor):
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _clave(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, set)):
+        return tuple(_clave(v) for v in valor)
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+def clave_consulta(tabla, funcion, args=(), kwargs=None):
+    """Clave de la caché para `funcion(*args, **kwargs)` memorizada bajo `tabla`."""
+    return (tabla, funcion.__module__, funcion.__qualname__, _clave(args), _clave(kwargs or {}))
+
+
+def _memorizado(tabla, funcion, args, kwargs, calcular):
+    verificar_archivo()
+    with instrumentacion.medir("datos", funcion.__qualname__, cache="acierto") as registro:
+        def calcular_medido():
+            registro["cache"] = "fallo"
+            return calcular()
+
+        resultado = _cache.obtener(clave_consulta(tabla, funcion, args, kwargs), calcular_medido, _alcance(kwargs))
+        registro["filas_salida"] = instrumentacion.filas(resultado)
+    return resultado.copy(deep=False) if isinstance(resultado, pd.DataFrame) else resultado
+
+
+def consultar(tabla, funcion, *args, **kwargs):
+    """Ejecuta `funcion(conn, *args, **kwargs)` con una conexión del pool y memoriza el resultado.
+
+    `tabla` agrupa las entradas para poder invalidarlas por tabla.
+    """
+    def calcular():
+        with _pool.conexion() as conn:
+            return funcion(conn, *args, **kwargs)
+
+    return _memorizado(tabla, funcion, args, kwargs, calcular)
+
+
+def memorizar(tabla, funcion, *args, **kwargs):
+    """Como `consultar`, para funciones que no necesitan conexión SQLite."""
+    return _memorizado(tabla, funcion, args, kwargs, lambda: funcion(*args, **kwargs))
+
+
+def estadisticas_mensuales(**filtros):
+    """`consultas.estadisticas_mensuales` memorizada; usa la caché columnar si está al día."""
+    if columnar.disponible(config.TABLA_MENSUAL):
+        return memorizar(config.TABLA_MENSUAL, columnar.estadisticas_mensuales, **filtros)
+    return consultar(config.TABLA_MENSUAL, consultas.estadisticas_mensuales, **filtros)
+
+
+def ejecutar(nombre, **parametros):
+    """Consulta `nombre` del catálogo (`energia.catalogo`), memorizada por parámetros."""
+    return consultar(catalogo.consulta(nombre).tabla, catalogo.ejecutar, nombre, **parametros)
+
+
+def _leer_tabla(conn, tabla, columnas=None, filtros=()):
+    seleccion = ", ".join(f'"{c}"' for c in columnas) if columnas else "*"
+    query = f'SELECT {seleccion} FROM "{tabla.replace(chr(34), chr(34) * 2)}"'
+    if filtros:
+        query += " WHERE " + " AND ".join(f'"{columna}" = ?' for columna, _ in filtros)
+    return aplicar_esquema(pd.read_sql_query(query, conn, params=[valor for _, valor in filtros]))
+
+
+def cargar_tabla(tabla, columnas=None, **filtros):
+    """Contenido de una tabla completa, o filtrado por igualdad (`Year=2022`)."""
+    columnas = tuple(columnas) if columnas else None
+    if columnar.disponible(tabla):
+        return memorizar(tabla, columnar.cargar, tabla, columnas=columnas, filtros=filtros)
+    filtros = tuple(sorted((c, v) for c, v in filtros.items() if v is not None))
+    return consultar(tabla, _leer_tabla, tabla, columnas=columnas, filtros=_clave(filtros))
+
+
+def invalidar(tabla=None):
+    _cache.invalidar(tabla)
+    _notificar(None)
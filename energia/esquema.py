@@ -0,0 +1,122 @@
+"""Esquema normalizado de Monthly_Electricity_Statistics.
+
+La columna `Time` del IEA es texto ('March 2024'), así que SQLite no puede
+filtrar por año sin recorrer la tabla completa. `migrar` agrega columnas
+enteras `Year` y `Month`, una fecha ISO `Date` ('2024-03-01') y los índices
+que usan las consultas del dashboard, también en las tablas sectorial y de
+CO₂ (ver `energia.catalogo`). Es idempotente.
+
+Uso:
+    python -m energia.esquema
+"""
+import argparse
+import sqlite3
+
+from energia.config import DB_PATH, TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+
+MESES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+# Expresiones SQL para derivar año y mes desde `Time` ('%B %Y')
+SQL_ANIO = "CAST(substr(Time, -4) AS INTEGER)"
+SQL_MES = ("CASE substr(Time, 1, instr(Time, ' ') - 1) "
+           + " ".join(f"WHEN '{m}' THEN {i}" for i, m in enumerate(MESES, start=1))
+           + " END")
+SQL_FECHA = f"printf('%04d-%02d-01', {SQL_ANIO}, {SQL_MES})"
+
+COLUMNAS = {"Year": "INTEGER", "Month": "INTEGER", "Date": "TEXT"}
+
+INDICES = {
+    "idx_mensual_country_year": "Country, Year",
+    "idx_mensual_balance_year": "Balance, Year",
+    "idx_mensual_product": "Product",
+    # Clave natural de una fila del IEA, usada por la ingesta incremental
+    "idx_mensual_clave": "Country, Time, Balance, Product",
+}
+
+# Tablas por sector (solo Colombia): índices que cubren las consultas del catálogo
+INDICES_SECTORIALES = {
+    TABLA_SECTORIAL: {
+        "idx_sectorial_year_sector": "Year, Sector, Value",
+        "idx_sectorial_sector_year": "Sector, Year, Value",
+    },
+    TABLA_CO2: {
+        "idx_co2_year_sector": "Year, Sector, Value",
+    },
+}
+
+
+def anio_mes(time):
+    """('March 2024') -> (2024, 3)"""
+    nombre, anio = time.rsplit(' ', 1)
+    return int(anio), MESES.index(nombre) + 1
+
+
+def columnas(conn, tabla=TABLA_MENSUAL):
+    return [fila[1] for fila in conn.execute(f"PRAGMA table_info('{tabla}')")]
+
+
+def indices(conn, tabla):
+    return {fila[0] for fila in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (tabla,))}
+
+
+def _sectoriales(conn):
+    # Solo las tablas que existen en esta base (las sintéticas no las traen todas)
+    return {tabla: indices_tabla for tabla, indices_tabla in INDICES_SECTORIALES.items() if columnas(conn, tabla)}
+
+
+def esta_migrada(conn):
+    existentes = set(columnas(conn))
+    return (set(COLUMNAS) <= existentes and set(INDICES) <= indices(conn, TABLA_MENSUAL)
+            and all(set(indices_tabla) <= indices(conn, tabla) for tabla, indices_tabla in _sectoriales(conn).items()))
+
+
+def migrar(conn):
+    """Agrega Year/Month/Date, los rellena y crea los índices compuestos."""
+    with conn:
+        existentes = set(columnas(conn))
+        for columna, tipo in COLUMNAS.items():
+            if columna not in existentes:
+                conn.execute(f"ALTER TABLE '{TABLA_MENSUAL}' ADD COLUMN {columna} {tipo}")
+        conn.execute(f"""
+            UPDATE '{TABLA_MENSUAL}'
+            SET Year = {SQL_ANIO}, Month = {SQL_MES}, Date = {SQL_FECHA}
+            WHERE Year IS NULL OR Month IS NULL OR Date IS NULL
+        """)
+        # Las filas insertadas después (ingestas nuevas) quedan normalizadas solas
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_mensual_normalizar
+            AFTER INSERT ON '{TABLA_MENSUAL}'
+            WHEN NEW.Year IS NULL OR NEW.Month IS NULL OR NEW.Date IS NULL
+            BEGIN
+                UPDATE '{TABLA_MENSUAL}'
+                SET Year = {SQL_ANIO}, Month = {SQL_MES}, Date = {SQL_FECHA}
+                WHERE rowid = NEW.rowid;
+            END
+        """)
+        for nombre, columnas_indice in INDICES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON '{TABLA_MENSUAL}' ({columnas_indice})")
+        for tabla, indices_tabla in _sectoriales(conn).items():
+            for nombre, columnas_indice in indices_tabla.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON '{tabla}' ({columnas_indice})")
+    conn.execute("ANALYZE")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normaliza el esquema de Monthly_Electricity_Statistics.")
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        migrar(conn)
+        print("✅ Esquema normalizado")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Caché de figuras Plotly compartida por todas las sesiones del proceso.
+
+Cada figura se guarda serializada (su JSON de Plotly) con clave
+(sección, id del gráfico, país, año, tipo de energía), así que un rerun que
+no cambia esos filtros no vuelve a agregar datos ni a construir treemaps o
+subgráficos. El tamaño total se acota a `MAX_MB` con desalojo LRU.
+
+Las figuras dependen de los datos: cada una se guarda con el alcance de lo
+que lee (países y año, None = todos). Cuando `energia.datos` descarta los
+(país, año) de una ingesta se desalojan solo las figuras que leen alguno de
+ellos; si descarta todo (reemplazo del .db o invalidación manual), la caché
+se vacía.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from energia import datos, instrumentacion
+
+MAX_MB = float(os.environ.get("ENERGIA_FIGURAS_MB", 64))
+
+
+class CacheFiguras:
+    """Caché LRU de especificaciones JSON de figuras, acotada en bytes."""
+
+    def __init__(self, max_bytes=int(MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self._alcances = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, construir, nombre="", alcance=None):
+        """Figura de `clave`; si no está, la construye con `construir()` y la guarda.
+
+        `alcance` = (países, año) de los datos que usa la figura (None = todos).
+        """
+        with self._lock:
+            spec = self._entradas.get(clave)
+            if spec is not None:
+                self._entradas.move_to_end(clave)
+        if spec is not None:
+            with instrumentacion.medir("deserializacion", nombre):
+                return pio.from_json(spec, skip_invalid=True)
+
+        with instrumentacion.medir("figura", nombre):
+            fig = construir()
+        with instrumentacion.medir("serializacion", nombre):
+            spec = fig.to_json()
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= len(anterior)
+            self._entradas[clave] = spec
+            self._alcances[clave] = alcance or (None, None)
+            self.bytes += len(spec)
+            while self.bytes > self.max_bytes and len(self._entradas) > 1:
+                desalojada_clave, desalojada = self._entradas.popitem(last=False)
+                self._alcances.pop(desalojada_clave, None)
+                self.bytes -= len(desalojada)
+        return fig
+
+    def invalidar(self, afectados=None):
+        """Desaloja las figuras que leen algún (país, año) de `afectados`; None = todas."""
+        with self._lock:
+            if afectados is None:
+                self._entradas.clear()
+                self._alcances.clear()
+                self.bytes = 0
+                return
+            for clave in [c for c, alcance in self._alcances.items() if _afectada(alcance, afectados)]:
+                self.bytes -= len(self._entradas.pop(clave))
+                del self._alcances[clave]
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+def _afectada(alcance, afectados):
+    paises, anio = alcance
+    return any((paises is None or pais in paises) and (anio is None or anio_afectado == anio)
+               for pais, anio_afectado in afectados)
+
+
+_cache = CacheFiguras()
+datos.al_invalidar(_cache.invalidar)
+
+
+def figura(seccion, id_grafico, construir, pais=None, anio=None, tipo_energia=None, alcance=None):
+    """Figura memorizada por (sección, gráfico, país, año, tipo de energía).
+
+    `alcance` = (países, año) que lee (None = todos): decide si una ingesta la desaloja.
+    """
+    # Si el .db cambió, la caché de datos avisa y esta se desaloja antes de leer
+    datos.verificar_archivo()
+    return _cache.obtener((seccion, id_grafico, pais, anio, tipo_energia), construir, nombre=id_grafico,
+                          alcance=alcance)
+
+
+def invalidar():
+    _cache.invalidar()
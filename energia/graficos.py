@@ -0,0 +1,342 @@
+"""Gráficos de las secciones de `app.py`.
+
+Cada sección es una función `(pais, anio, tipo_energia)` que devuelve la lista
+de gráficos como pares (id, función que construye la figura). `app.py` los
+dibuja a través de la caché de `energia.figuras`, y `energia.calentamiento`
+usa las mismas funciones para dejar listas las combinaciones más pedidas sin
+que haya una sesión de Streamlit abierta. Este módulo no importa Streamlit.
+"""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from energia import datos, figuras, kpis, muestreo, pronosticos, rollups, series
+from energia.config import BALANCE_NETO
+from energia.mezcla import mezcla
+from energia.taxonomia import PRODUCTOS_EXCLUIR, PRODUCTOS_NO_RENOVABLES, PRODUCTOS_RENOVABLES
+
+COLORES_TIPO = {"Renewable": "#2ca02c", "Non-Renewable": "#d62728"}
+
+COMPARACION = "Comparación de Países"
+MAX_PAISES_COMPARACION = 24
+
+TIPOS_ENERGIA = {
+    'Renovables y No Renovables': 'ambas',
+    'Solo Renovables': 'renovables',
+    'Solo No Renovables': 'no_renovables'
+}
+
+
+def leer_rollup(tabla, **filtros):
+    return datos.consultar(tabla, rollups.leer, tabla, **filtros)
+
+
+def leer_produccion(pais, anio=None):
+    # País x Año x Producto x Balance, o el agregado global cuando pais == 'Todos'
+    if pais == "Todos":
+        return leer_rollup(rollups.ANIO_PRODUCTO, Year=anio)
+    return leer_rollup(rollups.PAIS_ANIO_PRODUCTO, Country=pais, Year=anio)
+
+
+def participacion_anual(pais):
+    """% renovable y no renovable por año de `pais` ('Todos' = global), una columna por tipo."""
+    df_energy_filtered = leer_produccion(pais)
+    # Energy_Type ya viene precalculada desde la taxonomía de productos
+    df_energy_filtered = df_energy_filtered[~df_energy_filtered['Product'].isin(PRODUCTOS_EXCLUIR)]
+    return mezcla(df_energy_filtered, por='Year')
+
+
+# --------------------------
+# Diagnóstico Nacional
+# --------------------------
+def diagnostico(pais, anio, tipo_energia=None):
+    # Se lee dentro de cada gráfico: con la figura en caché no se consulta nada
+    def df_filtrado():
+        return leer_produccion(pais, anio)
+
+    # Gráfico 1: Participación Porcentual Renovables vs No Renovables
+    def grafico_participacion():
+        df_percent_pivot = participacion_anual(pais)
+        fig1 = px.bar(
+            df_percent_pivot,
+            x=df_percent_pivot.index,
+            y=list(df_percent_pivot.columns),
+            title=f"% Participación de Energía Renovable vs No Renovable - {pais if pais != 'Todos' else 'Global'}",
+            labels={"value": "Porcentaje (%)", "Year": "Año", "variable": "Tipo de Energía"},
+            barmode='stack',
+            color_discrete_map=COLORES_TIPO
+        )
+        fig1.update_layout(yaxis_range=[0, 100], xaxis_title="Año", yaxis_title="Porcentaje (%)", legend_title="Tipo de Energía")
+        return fig1
+
+    # Gráfico 6: Tendencia Histórica (total anual, reducido al ancho del gráfico)
+    def grafico_tendencia():
+        tendencia_df = leer_produccion(pais).groupby('Year')['Value'].sum().reset_index()
+        tendencia_df = muestreo.reducir(tendencia_df, x="Year", y="Value")
+        return px.line(tendencia_df, x="Year", y="Value", title="Tendencia Histórica")
+
+    return [
+        ("participacion", grafico_participacion),
+        # Gráfico 2: Producción por Fuente
+        ("produccion_fuente", lambda: px.bar(df_filtrado(), x="Product", y="Value", title="Producción por Fuente")),
+        # Gráfico 3: Distribución por Producto (Torta)
+        ("distribucion_produccion", lambda: px.pie(df_filtrado(), names="Product", values="Value", title="Distribución de Producción")),
+        # Gráfico 4: Balance energético
+        ("balance", lambda: px.histogram(df_filtrado(), x="Balance", y="Value", title="Balance Energético")),
+        # Gráfico 5: Distribución por Producto (Pie)
+        ("distribucion_producto", lambda: px.pie(df_filtrado(), names="Product", values="Value", title="Distribución por Producto")),
+        ("tendencia_historica", grafico_tendencia),
+    ]
+
+
+# --------------------------
+# Comparativos Internacionales
+# --------------------------
+def comparativos(pais, anio, tipo_energia=None):
+    def calcular_top_paises():
+        # Ranking precalculado en el cubo de KPIs (todos los balances y productos)
+        return datos.consultar(rollups.CUBO, kpis.top_paises, anio=anio, n=10)
+
+    # Gráfico 1 - Treemap con valores
+    def grafico_treemap():
+        fig_treemap = px.treemap(
+            calcular_top_paises(),
+            path=['Country'],
+            values='Value',
+            title="Top 10 Países por Producción (Treemap)"
+        )
+        fig_treemap.update_traces(textinfo='label+value')
+        return fig_treemap
+
+    # Gráfico 2 - Top 10 ordenado (ya viene ordenado por puesto), con etiquetas visibles
+    def grafico_top_barras():
+        return px.bar(
+            calcular_top_paises(),
+            x="Country",
+            y="Value",
+            title="Top 10 Países por Producción (Ordenado)",
+            labels={"Value": "Producción", "Country": "País"},
+            text_auto=True  # ✅ Mostrar valores en las barras
+        )
+
+    # Gráfico 3 - Subgráficos comparativos
+    def grafico_subgraficos():
+        # plotly.subplots solo se importa si se construye este gráfico
+        from plotly.subplots import make_subplots
+
+        df_net_anio = leer_rollup(rollups.ANIO_PRODUCTO, Year=anio, Balance=BALANCE_NETO)
+        df_ren = df_net_anio[df_net_anio['Product'].isin(PRODUCTOS_RENOVABLES)]
+        df_no_ren = df_net_anio[df_net_anio['Product'].isin(PRODUCTOS_NO_RENOVABLES)]
+        df_ren_pivot = df_ren.groupby(['Year', 'Product'], observed=True)['Value'].sum().reset_index().pivot(index='Year', columns='Product', values='Value').fillna(0)
+        df_no_ren_pivot = df_no_ren.groupby(['Year', 'Product'], observed=True)['Value'].sum().reset_index().pivot(index='Year', columns='Product', values='Value').fillna(0)
+        fig_sub = make_subplots(rows=1, cols=2, subplot_titles=("Energías Renovables", "Energías No Renovables"))
+        for col in df_ren_pivot.columns:
+            fig_sub.add_trace(go.Bar(name=col, x=df_ren_pivot.index, y=df_ren_pivot[col]), row=1, col=1)
+        for col in df_no_ren_pivot.columns:
+            fig_sub.add_trace(go.Bar(name=col, x=df_no_ren_pivot.index, y=df_no_ren_pivot[col]), row=1, col=2)
+        fig_sub.update_layout(barmode='stack', height=500, title_text=f"Comparativo Energético por Año - {pais}")
+        return fig_sub
+
+    # Gráfico 4 - Evolución de los países del top
+    def grafico_evolucion():
+        top_paises = calcular_top_paises()
+        df_top = datos.consultar(rollups.CUBO, kpis.series, pais=tuple(top_paises['Country']))
+        df_top = muestreo.reducir(df_top, x="Year", y="Value", color="Country")
+        return px.line(df_top, x="Year", y="Value", color="Country", title="Evolución por País",
+                       category_orders={"Country": sorted(top_paises['Country'])})
+
+    # Gráfico 5 - Producción global por fuente
+    def grafico_produccion_global():
+        df_global = leer_rollup(rollups.ANIO_PRODUCTO, Year=anio).groupby("Product", observed=True)["Value"].sum().reset_index()
+        return px.bar(df_global, x="Product", y="Value", title="Producción Global por Fuente")
+
+    # Gráfico 6 - Mapa jerárquico país -> producto
+    def grafico_mapa_jerarquico():
+        return px.treemap(datos.consultar(rollups.CUBO, kpis.jerarquia, anio=anio),
+                          path=["Country", "Product"], values="Value", title="Mapa Jerárquico Internacional")
+
+    return [
+        ("top_treemap", grafico_treemap),
+        ("top_barras", grafico_top_barras),
+        ("subgraficos", grafico_subgraficos),
+        ("evolucion_pais", grafico_evolucion),
+        ("produccion_global", grafico_produccion_global),
+        ("mapa_jerarquico", grafico_mapa_jerarquico),
+    ]
+
+
+# --------------------------
+# Tendencia Mensual
+# --------------------------
+def serie_mensual(pais, tipo_energia='ambas'):
+    """Generación neta mensual por tipo de energía, una columna por tipo (PeriodIndex mensual)."""
+    df_serie = series.mensual(pais if pais != 'Todos' else None, balance=BALANCE_NETO)
+    tipos = {'renovables': ['Renewable'], 'no_renovables': ['Non-Renewable']}.get(tipo_energia, list(df_serie.columns))
+    return df_serie[[t for t in tipos if t in df_serie.columns]].dropna(how='all')
+
+
+def tendencia_mensual(pais, anio, tipo_energia='ambas'):
+    """Gráficos de la tendencia mensual; lista vacía si no hay datos."""
+    df_pivot = serie_mensual(pais, tipo_energia or 'ambas')
+    if df_pivot.empty:
+        return []
+    # Eje temporal real (orden cronológico), sin fechas en texto
+    df_pivot = df_pivot.set_axis(df_pivot.index.to_timestamp().rename('YearMonth')).reset_index()
+
+    # 🟢 Gráfico 1: Tendencia en Líneas (cada serie reducida al ancho del gráfico)
+    def grafico_lineas():
+        df_linea = df_pivot.melt(id_vars='YearMonth', var_name='variable', value_name='value')
+        df_linea = muestreo.reducir(df_linea, x='YearMonth', y='value', color='variable')
+        fig_line = px.line(
+            df_linea,
+            x='YearMonth',
+            y='value',
+            color='variable',
+            title=f"Tendencia mensual de energía - {pais}",
+            labels={"value": "GWh", "YearMonth": "Mes-Año", "variable": "Tipo de Energía"},
+            markers=True,
+            color_discrete_map=COLORES_TIPO
+        )
+        fig_line.update_layout(xaxis_tickangle=-45)
+        return fig_line
+
+    # 🟢 Gráfico 2: Barras Apiladas
+    def grafico_barras():
+        fig_bar = px.bar(
+            df_pivot,
+            x='YearMonth',
+            y=df_pivot.columns[1:],
+            title=f"Generación mensual de energía - {pais}",
+            labels={"value": "GWh", "YearMonth": "Mes-Año", "variable": "Tipo de Energía"},
+            barmode="stack",
+            color_discrete_map=COLORES_TIPO
+        )
+        fig_bar.update_layout(xaxis_tickangle=-45)
+        return fig_bar
+
+    return [("lineas_mensual", grafico_lineas), ("barras_mensual", grafico_barras)]
+
+
+def con_proyeccion(fig, pais, tipo_energia='ambas'):
+    """Copia de `fig` con la proyección guardada por `energia.pronosticos` (línea punteada e intervalo).
+
+    Solo lee lo ya ajustado; devuelve None si `pais` todavía no tiene proyección.
+    """
+    tipos = {'renovables': ['Renewable'], 'no_renovables': ['Non-Renewable']}.get(tipo_energia)
+    df_proyeccion = pronosticos.proyeccion(pais, tipos)
+    if df_proyeccion.empty:
+        return None
+    # La figura sale de la caché compartida: se agrega sobre una copia
+    fig = go.Figure(fig)
+    for tipo, grupo in df_proyeccion.groupby('Energy_Type', sort=False):
+        meses = grupo['Periodo'].dt.to_timestamp()
+        color = COLORES_TIPO.get(tipo)
+        fig.add_trace(go.Scatter(x=pd.concat([meses, meses[::-1]]),
+                                 y=pd.concat([grupo['Superior'], grupo['Inferior'][::-1]]),
+                                 fill='toself', fillcolor=color, opacity=0.15, line={'width': 0},
+                                 hoverinfo='skip', showlegend=False, legendgroup=f'{tipo}_proyeccion'))
+        fig.add_trace(go.Scatter(x=meses, y=grupo['Value'], mode='lines', line={'dash': 'dash', 'color': color},
+                                 name=f"{tipo} (proyección, {grupo['Modelo'].iloc[0]})",
+                                 legendgroup=f'{tipo}_proyeccion'))
+    return fig
+
+
+# --------------------------
+# Comparación de Países
+# --------------------------
+def _facetas(fig, paises):
+    # Un panel por país con su propia escala; el título del panel es solo el país
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.update_layout(height=260 * -(-len(paises) // 4) + 120)
+    return fig
+
+
+def comparacion(paises, anio, tipo_energia=None):
+    """Pequeños múltiplos de varios países (tupla).
+
+    Cada gráfico lee todos los países en una sola consulta (`Country IN (...)`
+    sobre la clave de los agregados) y agrega en una sola pasada, así que el
+    costo crece con los países elegidos y no con el tamaño de la tabla.
+    """
+    paises = tuple(sorted(paises))[:MAX_PAISES_COMPARACION]
+    if not paises:
+        return []
+    columnas = min(len(paises), 4)
+
+    # Gráfico 1: Generación mensual por tipo, un panel por país
+    def grafico_mensual():
+        df = leer_rollup(rollups.PAIS_MES_TIPO, Country=paises, Balance=BALANCE_NETO)
+        df['Mes'] = pd.PeriodIndex.from_fields(year=df['Year'].to_numpy(), month=df['Month'].to_numpy(),
+                                               freq='M').to_timestamp()
+        df['Serie'] = df['Country'].astype(str) + '|' + df['Energy_Type'].astype(str)
+        df = muestreo.reducir(df, x='Mes', y='Value', color='Serie')
+        fig = px.line(df, x='Mes', y='Value', color='Energy_Type', facet_col='Country', facet_col_wrap=columnas,
+                      category_orders={"Country": list(paises), "Energy_Type": list(COLORES_TIPO)},
+                      color_discrete_map=COLORES_TIPO,
+                      labels={"Value": "GWh", "Mes": "Mes", "Energy_Type": "Tipo de Energía"},
+                      title="Generación Mensual por Tipo de Energía")
+        return _facetas(fig, paises)
+
+    # Gráfico 2: Participación renovable anual de todos los países
+    def grafico_participacion():
+        df = leer_rollup(rollups.PAIS_ANIO_PRODUCTO, Country=paises)
+        df = df[~df['Product'].isin(PRODUCTOS_EXCLUIR)]
+        df_pct = mezcla(df, por=['Country', 'Year']).reindex(columns=['Renewable'], fill_value=0).reset_index()
+        df_pct['Country'] = df_pct['Country'].astype(str)
+        return px.line(df_pct, x='Year', y='Renewable', color='Country', markers=True,
+                       category_orders={"Country": list(paises)},
+                       labels={"Renewable": "% Renovable", "Year": "Año", "Country": "País"},
+                       title="% de Energía Renovable por País")
+
+    # Gráfico 3: Producción neta por fuente en el año, un panel por país
+    def grafico_fuentes():
+        df = leer_rollup(rollups.PAIS_ANIO_PRODUCTO, Country=paises, Year=anio, Balance=BALANCE_NETO)
+        fig = px.bar(df, x='Product', y='Value', facet_col='Country', facet_col_wrap=columnas,
+                     category_orders={"Country": list(paises)},
+                     labels={"Value": "GWh", "Product": "Fuente"}, title=f"Producción Neta por Fuente ({anio})")
+        return _facetas(fig, paises)
+
+    return [
+        ("comparacion_mensual", grafico_mensual),
+        ("comparacion_renovable", grafico_participacion),
+        ("comparacion_fuentes", grafico_fuentes),
+    ]
+
+
+SECCIONES = {
+    "Diagnóstico Nacional": diagnostico,
+    "Comparativos Internacionales": comparativos,
+    "Tendencia Mensual": tendencia_mensual,
+    COMPARACION: comparacion,
+}
+
+# Secciones que reciben una tupla de países en lugar de un país
+MULTIPAIS = {COMPARACION}
+# Secciones que leen todos los países aunque se elija uno (rankings y totales globales)
+GLOBALES = {"Comparativos Internacionales"}
+# Gráficos que no usan el año elegido: una sola entrada en la caché de figuras para todos los años
+SIN_ANIO = {"participacion", "tendencia_historica", "lineas_mensual", "barras_mensual",
+            "comparacion_mensual", "comparacion_renovable"}
+# Gráficos que dependen del año elegido pero leen la serie de todos los años
+TODOS_LOS_ANIOS = {"evolucion_pais"}
+
+
+def alcance(seccion, id_grafico, pais, anio):
+    """(países, año) de los datos que lee un gráfico (None = todos), para la caché de figuras."""
+    if pais == 'Todos' or seccion in GLOBALES:
+        paises = None
+    elif seccion in MULTIPAIS:
+        paises = frozenset(pais)
+    else:
+        paises = frozenset([pais])
+    return paises, None if id_grafico in SIN_ANIO | TODOS_LOS_ANIOS else anio
+
+
+def construir(seccion, pais, anio, tipo_energia=None):
+    """Figuras de una sección, pasando por la caché de figuras (las construye si faltan)."""
+    return [(id_grafico, figuras.figura(seccion, id_grafico, construir_figura, pais=pais,
+                                        anio=None if id_grafico in SIN_ANIO else anio,
+                                        tipo_energia=tipo_energia,
+                                        alcance=alcance(seccion, id_grafico, pais, anio)))
+            for id_grafico, construir_figura in SECCIONES[seccion](pais, anio, tipo_energia)]
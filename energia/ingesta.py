@@ -0,0 +1,172 @@
+"""Ingesta incremental de publicaciones mensuales del IEA.
+
+Lee un CSV de Monthly Electricity Statistics y hace upsert en
+Monthly_Electricity_Statistics solo de las filas nuevas o con valor distinto,
+usando (Country, Product, Balance, Time) como clave. Después:
+
+- actualiza la marca de agua (último mes cargado) de cada país;
+- refresca solo los agregados de los meses afectados;
+- registra un evento con los (país, año) afectados, que `energia.datos` usa
+  para invalidar solo esas porciones de su caché en los procesos que ya
+  están corriendo.
+
+Filas, agregados y eventos se confirman en una sola transacción: un proceso
+que note el cambio del archivo nunca ve datos nuevos con agregados viejos, ni
+un segundo cambio sin eventos (que vaciaría toda su caché).
+
+Uso:
+    python -m energia.ingesta monthly_electricity.csv [--db analisis_energetico.db]
+"""
+import argparse
+import csv
+import io
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from energia import esquema, rollups
+from energia.config import DB_PATH, TABLA_MENSUAL
+
+COLUMNAS = ["Country", "Time", "Balance", "Product", "Value", "Unit"]
+CLAVE = ["Country", "Time", "Balance", "Product"]
+
+MARCAS = "ingesta_marcas"
+EVENTOS = "ingesta_eventos"
+
+
+def leer_csv(ruta):
+    """CSV del IEA como DataFrame, saltando las líneas de encabezado previas a los datos."""
+    with open(ruta, encoding="utf-8-sig") as f:
+        contenido = f.read()
+    lineas = contenido.splitlines()
+    inicio = next((i for i, linea in enumerate(lineas[:50])
+                   if {"Country", "Time"} <= {c.strip() for c in next(csv.reader([linea]), [])}), None)
+    if inicio is None:
+        raise ValueError(f"{ruta}: no se encontró la fila de encabezados (Country, Time, ...)")
+    df = pd.read_csv(io.StringIO("\n".join(lineas[inicio:])), dtype=str)
+    df.columns = [c.strip() for c in df.columns]
+    faltantes = [c for c in COLUMNAS if c not in df.columns and c != "Unit"]
+    if faltantes:
+        raise ValueError(f"{ruta}: faltan columnas {faltantes}")
+    if "Unit" not in df.columns:
+        df["Unit"] = None
+    df = df[COLUMNAS].dropna(subset=CLAVE)
+    df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
+    # Si la publicación repite una clave, vale la última fila
+    return df.drop_duplicates(subset=CLAVE, keep="last")
+
+
+def _crear_tablas(conn):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {MARCAS} (Country TEXT PRIMARY KEY, Ultimo_Mes TEXT, Actualizado TEXT)")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {EVENTOS} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, Fecha TEXT, Country TEXT, Year INTEGER
+        )
+    """)
+
+
+def ultimo_evento(conn):
+    try:
+        return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {EVENTOS}").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+def eventos_desde(conn, desde):
+    """(país, año) afectados por ingestas con id > `desde`, y el último id visto."""
+    filas = conn.execute(f"SELECT id, Country, Year FROM {EVENTOS} WHERE id > ?", (desde,)).fetchall()
+    if not filas:
+        return set(), desde
+    return {(pais, anio) for _, pais, anio in filas}, max(fila[0] for fila in filas)
+
+
+def marcas(conn):
+    _crear_tablas(conn)
+    return dict(conn.execute(f"SELECT Country, Ultimo_Mes FROM {MARCAS}"))
+
+
+def ingestar(conn, df):
+    """Upsert de `df` (columnas COLUMNAS) en la tabla mensual.
+
+    Devuelve un resumen con filas insertadas, actualizadas y meses afectados.
+    """
+    if not esquema.esta_migrada(conn):
+        esquema.migrar(conn)
+    if not rollups.existen(conn):
+        rollups.construir(conn)
+    _crear_tablas(conn)
+    ahora = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.ingesta_nueva")
+        conn.execute("CREATE TEMP TABLE ingesta_nueva (Country TEXT, Time TEXT, Balance TEXT, "
+                     "Product TEXT, Value REAL, Unit TEXT)")
+        conn.executemany("INSERT INTO temp.ingesta_nueva VALUES (?, ?, ?, ?, ?, ?)",
+                         df[COLUMNAS].astype(object).where(df[COLUMNAS].notna(), None).itertuples(index=False))
+        union = " AND ".join(f"m.{c} = n.{c}" for c in CLAVE)
+
+        # Filas que cambian: nuevas o con valor distinto
+        conn.execute("DROP TABLE IF EXISTS temp.ingesta_cambios")
+        conn.execute(f"""
+            CREATE TEMP TABLE ingesta_cambios AS
+            SELECT n.*, m.rowid AS fila_existente
+            FROM temp.ingesta_nueva n
+            LEFT JOIN "{TABLA_MENSUAL}" m ON {union}
+            WHERE m.rowid IS NULL OR m.Value IS NOT n.Value OR m.Unit IS NOT n.Unit
+        """)
+        actualizadas = conn.execute(f"""
+            UPDATE "{TABLA_MENSUAL}" AS m
+            SET Value = c.Value, Unit = c.Unit
+            FROM temp.ingesta_cambios c
+            WHERE m.rowid = c.fila_existente
+        """).rowcount
+        insertadas = conn.execute(f"""
+            INSERT INTO "{TABLA_MENSUAL}" (Country, Time, Balance, Product, Value, Unit)
+            SELECT Country, Time, Balance, Product, Value, Unit
+            FROM temp.ingesta_cambios WHERE fila_existente IS NULL
+        """).rowcount
+
+        meses = [fila[0] for fila in conn.execute("SELECT DISTINCT Time FROM temp.ingesta_cambios")]
+        if meses:
+            rollups.recalcular(conn, meses)
+        afectados = sorted({(pais, esquema.anio_mes(t)[0]) for pais, t in conn.execute(
+            "SELECT DISTINCT Country, Time FROM temp.ingesta_cambios")})
+
+        # Marca de agua: último mes con datos de cada país tocado
+        conn.execute(f"""
+            INSERT INTO {MARCAS} (Country, Ultimo_Mes, Actualizado)
+            SELECT m.Country, MAX(m.Date), ?
+            FROM "{TABLA_MENSUAL}" m
+            WHERE m.Country IN (SELECT DISTINCT Country FROM temp.ingesta_cambios)
+            GROUP BY m.Country
+            ON CONFLICT(Country) DO UPDATE SET Ultimo_Mes = excluded.Ultimo_Mes,
+                                               Actualizado = excluded.Actualizado
+        """, (ahora,))
+        conn.executemany(f"INSERT INTO {EVENTOS} (Fecha, Country, Year) VALUES (?, ?, ?)",
+                         [(ahora, pais, anio) for pais, anio in afectados])
+        conn.execute("DROP TABLE temp.ingesta_nueva")
+        conn.execute("DROP TABLE temp.ingesta_cambios")
+
+    return {"insertadas": insertadas, "actualizadas": actualizadas, "meses": sorted(meses, key=esquema.anio_mes)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga incremental de un CSV mensual del IEA.")
+    parser.add_argument("csv", help="CSV de Monthly Electricity Statistics")
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    df = leer_csv(args.csv)
+    conn = sqlite3.connect(args.db)
+    try:
+        resumen = ingestar(conn, df)
+    finally:
+        conn.close()
+    print(f"✅ {resumen['insertadas']} fila(s) nueva(s), {resumen['actualizadas']} actualizada(s)")
+    if resumen["meses"]:
+        print(f"   Meses afectados: {', '.join(resumen['meses'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Instrumentación de las etapas de cada rerun.
+
+`medir(etapa, nombre)` (context manager) y `@medido(etapa)` (decorador)
+registran para cada etapa el tiempo de reloj, las filas que entran y salen y
+la variación de memoria del proceso (RSS). Las etapas instrumentadas son:
+
+- ``datos``: consultas de `energia.datos` (con ``cache`` = acierto/fallo);
+- ``agregacion``: `mezcla` y `muestreo.reducir`;
+- ``figura`` / ``serializacion``: construcción de la figura Plotly y su JSON
+  (`energia.figuras`);
+- ``dibujar``: `st.plotly_chart` en `mostrar_graficos`;
+- ``vista``: funciones de datos de las páginas, en `energia.benchmark`;
+- ``importar`` / ``primer_dibujo`` / ``pagina``: importación de cada módulo de
+  página y dibujo de cada página del dashboard unificado (`energia.paginas`).
+
+Las mediciones del rerun en curso quedan en `ronda()` (el panel de desarrollo
+de `app.py` las muestra), y todas se acumulan por (etapa, nombre, acierto o
+fallo de caché) para `prometheus()`, que sirve `/metricas` junto a `/listo`. Con
+`ENERGIA_METRICAS_LOG` cada medición se escribe además como una línea JSON
+(`-` = salida de error).
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+ARCHIVO_LOG = os.environ.get("ENERGIA_METRICAS_LOG")
+# Límites (segundos) del histograma de Prometheus
+LIMITES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_ronda = contextvars.ContextVar("energia_ronda", default=None)
+_nivel = contextvars.ContextVar("energia_nivel", default=0)
+_acumulados = defaultdict(lambda: {"cuenta": 0, "segundos": 0.0, "filas": 0, "cubetas": [0] * len(LIMITES)})
+_lock = threading.Lock()
+
+_log = logging.getLogger("energia.metricas")
+if ARCHIVO_LOG:
+    _manejador = logging.StreamHandler(sys.stderr) if ARCHIVO_LOG == "-" else logging.FileHandler(ARCHIVO_LOG, encoding="utf-8")
+    _manejador.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(_manejador)
+    _log.setLevel(logging.INFO)
+    _log.propagate = False
+
+
+def _memoria_mb():
+    # RSS actual; /proc solo existe en Linux
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def filas(objeto):
+    """Filas de un DataFrame, Series o lista; None para otros objetos."""
+    if hasattr(objeto, "shape") and getattr(objeto, "ndim", 0) >= 1:
+        return int(objeto.shape[0])
+    if isinstance(objeto, (list, tuple)):
+        return len(objeto)
+    return None
+
+
+def iniciar_ronda():
+    """Empieza las mediciones de un rerun; devuelve la lista que se irá llenando."""
+    registros = []
+    _ronda.set(registros)
+    return registros
+
+
+def ronda():
+    return _ronda.get() or []
+
+
+@contextmanager
+def medir(etapa, nombre="", **etiquetas):
+    """Mide el bloque; el dict que entrega admite 'filas_entrada', 'filas_salida' y etiquetas extra."""
+    registro = {"etapa": etapa, "nombre": nombre, "nivel": _nivel.get(), **etiquetas}
+    memoria = _memoria_mb()
+    token = _nivel.set(registro["nivel"] + 1)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        segundos = time.perf_counter() - inicio
+        _nivel.reset(token)
+        memoria_fin = _memoria_mb()
+        registro["ms"] = round(segundos * 1000, 3)
+        registro["memoria_mb"] = round(memoria_fin - memoria, 3) if memoria is not None and memoria_fin is not None else None
+        _registrar(registro, segundos)
+
+
+def medido(etapa, nombre=None):
+    """Decorador: mide cada llamada; las filas de entrada son las del primer argumento."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(etapa, nombre or funcion.__name__) as registro:
+                if args:
+                    registro["filas_entrada"] = filas(args[0])
+                resultado = funcion(*args, **kwargs)
+                registro["filas_salida"] = filas(resultado)
+                return resultado
+        return envoltura
+    return decorador
+
+
+def _registrar(registro, segundos):
+    registros = _ronda.get()
+    if registros is not None:
+        registros.append(registro)
+    with _lock:
+        acumulado = _acumulados[(registro["etapa"], registro["nombre"], registro.get("cache", ""))]
+        acumulado["cuenta"] += 1
+        acumulado["segundos"] += segundos
+        acumulado["filas"] += registro.get("filas_salida") or 0
+        for i, limite in enumerate(LIMITES):
+            if segundos <= limite:
+                acumulado["cubetas"][i] += 1
+    if ARCHIVO_LOG:
+        _log.info(json.dumps({"ts": round(time.time(), 3), **registro}, ensure_ascii=False, default=str))
+
+
+# --------------------------
+# Exportación
+# --------------------------
+def _etiquetas(etapa, nombre, cache, **extra):
+    valores = {"etapa": etapa, "nombre": nombre, **({"cache": cache} if cache else {}), **extra}
+    texto = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                     for k, v in valores.items())
+    return "{" + texto + "}"
+
+
+def prometheus():
+    """Métricas acumuladas en formato de texto de Prometheus."""
+    with _lock:
+        acumulados = {clave: {**valor, "cubetas": list(valor["cubetas"])} for clave, valor in _acumulados.items()}
+    lineas = [
+        "# HELP energia_etapa_segundos Tiempo de reloj por etapa del rerun",
+        "# TYPE energia_etapa_segundos histogram",
+    ]
+    for (etapa, nombre, cache), valor in sorted(acumulados.items()):
+        for limite, cuenta in zip(LIMITES, valor["cubetas"]):
+            lineas.append(f"energia_etapa_segundos_bucket{_etiquetas(etapa, nombre, cache, le=limite)} {cuenta}")
+        lineas.append(f"energia_etapa_segundos_bucket{_etiquetas(etapa, nombre, cache, le='+Inf')} {valor['cuenta']}")
+        lineas.append(f"energia_etapa_segundos_sum{_etiquetas(etapa, nombre, cache)} {valor['segundos']:.6f}")
+        lineas.append(f"energia_etapa_segundos_count{_etiquetas(etapa, nombre, cache)} {valor['cuenta']}")
+    lineas += [
+        "# HELP energia_etapa_filas_total Filas producidas por etapa",
+        "# TYPE energia_etapa_filas_total counter",
+    ]
+    for (etapa, nombre, cache), valor in sorted(acumulados.items()):
+        lineas.append(f"energia_etapa_filas_total{_etiquetas(etapa, nombre, cache)} {valor['filas']}")
+    memoria = _memoria_mb()
+    if memoria is not None:
+        lineas += [
+            "# HELP energia_memoria_rss_bytes Memoria residente del proceso",
+            "# TYPE energia_memoria_rss_bytes gauge",
+            f"energia_memoria_rss_bytes {int(memoria * 1e6)}",
+        ]
+    return "\n".join(lineas) + "\n"
+
+
+def reiniciar():
+    with _lock:
+        _acumulados.clear()
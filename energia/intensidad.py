@@ -0,0 +1,142 @@
+"""Tabla de hechos sector × año que cruza emisiones de CO₂ y consumo eléctrico.
+
+Las tablas del IEA de consumo eléctrico por sector y de emisiones de CO₂ por
+sector (Colombia) se cargan por separado. Aquí se materializan juntas,
+dentro de la misma base e indexadas por (Sector, Year), con las columnas
+derivadas que usan los dashboards:
+
+- ``Consumo`` y ``Emisiones``: totales del sector en el año (NULL si el
+  sector no aparece en una de las dos tablas);
+- ``Intensidad``: emisiones por unidad de consumo eléctrico;
+- ``Participacion_Consumo`` y ``Participacion_Emisiones``: % del total del año.
+
+Cada año trae además una fila ``Sector = '*'`` con el total nacional (como
+los totales del cubo de KPIs). La tabla se reconstruye solo cuando cambia
+alguna de las dos tablas de origen (se guarda una firma de cada una): al
+preparar la base y, con el servidor corriendo, cada vez que `energia.datos`
+nota que cambió el archivo.
+
+Uso:
+    python -m energia.intensidad construir
+    python -m energia.intensidad refrescar   # solo si cambió alguna tabla de origen
+"""
+import argparse
+import hashlib
+import sqlite3
+
+from energia.config import DB_PATH, TABLA_CO2, TABLA_SECTORIAL
+from energia.rollups import TODOS
+
+INTENSIDAD = "hecho_intensidad_sector"
+FIRMAS = "hecho_intensidad_fuentes"
+
+# Tablas de origen: nombre de la columna de valor en la tabla de hechos → tabla del IEA
+FUENTES = {"Consumo": TABLA_SECTORIAL, "Emisiones": TABLA_CO2}
+
+
+def _tabla(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+def _select():
+    consumo, emisiones = (_tabla(tabla) for tabla in FUENTES.values())
+    return f"""
+        WITH consumo AS (
+            SELECT Year, Sector, SUM(Value) AS Consumo FROM {consumo}
+            WHERE Year IS NOT NULL AND Sector IS NOT NULL GROUP BY Year, Sector
+        ),
+        emisiones AS (
+            SELECT Year, Sector, SUM(Value) AS Emisiones FROM {emisiones}
+            WHERE Year IS NOT NULL AND Sector IS NOT NULL GROUP BY Year, Sector
+        ),
+        sectores AS (
+            SELECT s.Year, s.Sector, c.Consumo, e.Emisiones
+            FROM (SELECT Year, Sector FROM consumo UNION SELECT Year, Sector FROM emisiones) s
+            LEFT JOIN consumo c USING (Year, Sector)
+            LEFT JOIN emisiones e USING (Year, Sector)
+        ),
+        con_totales AS (
+            SELECT * FROM sectores
+            UNION ALL
+            SELECT Year, '{TODOS}', SUM(Consumo), SUM(Emisiones) FROM sectores GROUP BY Year
+        )
+        SELECT f.Sector, f.Year, f.Consumo, f.Emisiones,
+               f.Emisiones / NULLIF(f.Consumo, 0) AS Intensidad,
+               100.0 * f.Consumo / NULLIF(t.Consumo, 0) AS Participacion_Consumo,
+               100.0 * f.Emisiones / NULLIF(t.Emisiones, 0) AS Participacion_Emisiones
+        FROM con_totales f JOIN con_totales t ON t.Year = f.Year AND t.Sector = '{TODOS}'
+    """
+
+
+def disponible(conn):
+    """True si la base tiene las dos tablas de origen."""
+    existentes = {fila[0] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return set(FUENTES.values()) <= existentes
+
+
+def existe(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (FIRMAS,)).fetchone() is not None
+
+
+def _firmas(conn):
+    """{tabla de origen: sha1 de su contenido}; son tablas pequeñas (sector × año)."""
+    firmas = {}
+    for tabla in FUENTES.values():
+        firma = hashlib.sha1()
+        for fila in conn.execute(f"SELECT Sector, Year, Value FROM {_tabla(tabla)} ORDER BY Sector, Year, Value"):
+            firma.update(repr(fila).encode("utf-8"))
+        firmas[tabla] = firma.hexdigest()
+    return firmas
+
+
+def construir(conn):
+    """Reconstruye la tabla de hechos desde las dos tablas de origen."""
+    firmas = _firmas(conn)
+    with conn:
+        conn.execute(f"DROP TABLE IF EXISTS {INTENSIDAD}")
+        conn.execute(f"""
+            CREATE TABLE {INTENSIDAD} (
+                Sector TEXT, Year INTEGER, Consumo REAL, Emisiones REAL, Intensidad REAL,
+                Participacion_Consumo REAL, Participacion_Emisiones REAL,
+                PRIMARY KEY (Sector, Year)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"INSERT INTO {INTENSIDAD} {_select()}")
+        conn.execute(f"DROP TABLE IF EXISTS {FIRMAS}")
+        conn.execute(f"CREATE TABLE {FIRMAS} (Tabla TEXT PRIMARY KEY, Firma TEXT)")
+        conn.executemany(f"INSERT INTO {FIRMAS} VALUES (?, ?)", firmas.items())
+
+
+def refrescar(conn):
+    """Reconstruye la tabla solo si cambió alguna tabla de origen; True si la reconstruyó."""
+    if not disponible(conn):
+        return False
+    if existe(conn) and dict(conn.execute(f"SELECT Tabla, Firma FROM {FIRMAS}")) == _firmas(conn):
+        return False
+    construir(conn)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Materializa la intensidad de emisiones por sector y año.")
+    parser.add_argument("accion", choices=["construir", "refrescar"])
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if not disponible(conn):
+            print(f"❌ Faltan tablas de origen: {', '.join(FUENTES.values())}")
+            return
+        if args.accion == "construir":
+            construir(conn)
+            print("✅ Intensidad por sector reconstruida")
+        else:
+            print("✅ Intensidad por sector " + ("reconstruida" if refrescar(conn) else "al día"))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Consultas sobre el cubo de KPIs (`rollups.CUBO`).
+
+El cubo guarda país × año × balance × producto con los totales ya sumados
+(`'*'` en la dimensión totalizada) y el puesto de cada país dentro de su
+(año, balance, producto). Rankings, jerarquías y series por país son
+búsquedas por índice que leen solo las filas del resultado, sin agrupar en
+pandas.
+"""
+import pandas as pd
+
+from energia.rollups import CUBO, TODOS
+from energia.tipos import aplicar_esquema
+
+
+def _leer(conn, query, parametros):
+    # Los valores que llegan desde pandas/numpy (np.int64) no los acepta sqlite3
+    parametros = [v.item() if hasattr(v, "item") else v for v in parametros]
+    return aplicar_esquema(pd.read_sql_query(query, conn, params=parametros))
+
+
+def top_paises(conn, anio, n=10, balance=TODOS, producto=TODOS):
+    """Los `n` países con mayor valor en `anio` (todos los balances/productos por defecto)."""
+    return _leer(conn, f"""
+        SELECT Country, Value, Puesto FROM {CUBO}
+        WHERE Year = ? AND Balance = ? AND Product = ? AND Puesto <= ?
+        ORDER BY Puesto
+    """, [anio, balance, producto, n])
+
+
+def jerarquia(conn, anio, balance=TODOS):
+    """País × producto de `anio`, ya sumado sobre `balance` (para treemaps)."""
+    return _leer(conn, f"""
+        SELECT Country, Product, Value FROM {CUBO}
+        WHERE Year = ? AND Balance = ? AND Country <> ? AND Product <> ?
+    """, [anio, balance, TODOS, TODOS])
+
+
+def series(conn, pais, balance=TODOS, producto=TODOS):
+    """Serie anual de uno o varios países (`pais` puede ser lista o tupla)."""
+    paises = list(pais) if isinstance(pais, (list, tuple)) else [pais]
+    return _leer(conn, f"""
+        SELECT Country, Year, Value FROM {CUBO}
+        WHERE Country IN ({', '.join('?' * len(paises))}) AND Balance = ? AND Product = ?
+        ORDER BY Country, Year
+    """, [*paises, balance, producto])
@@ -0,0 +1,34 @@
+"""Mezcla energética: generación y participación por tipo de energía.
+
+Un solo groupby al grano pedido (país, año, mes, o global) seguido de un
+`unstack`; la participación se obtiene dividiendo cada fila por su total, sin
+volver a cruzar (merge) contra una tabla de totales. El resultado queda en
+formato ancho, listo para graficar: una fila por valor del grano y una
+columna por tipo ('Renewable', 'Non-Renewable').
+"""
+import pandas as pd
+
+from energia.instrumentacion import medido
+
+
+@medido("agregacion")
+def mezcla(df, por=(), columna="Energy_Type", valor="Value", porcentaje=True):
+    """`valor` sumado por `por` × `columna`, en formato ancho.
+
+    - `por`: columna o lista de columnas del grano; vacío = un solo total global.
+    - `porcentaje`: si es True cada fila se normaliza a 100 (participación).
+
+    Solo aparecen las columnas con datos, en el orden de las categorías si
+    `columna` es categórica. Los grupos sin valor quedan en 0.
+    """
+    por = [por] if isinstance(por, str) else list(por)
+    sumas = df.groupby(por + [columna], observed=True, sort=True)[valor].sum()
+    if por:
+        tabla = sumas.unstack(columna, fill_value=0)
+    else:
+        tabla = sumas.to_frame().T.rename_axis(columns=columna).reset_index(drop=True)
+    if isinstance(tabla.columns, pd.CategoricalIndex):
+        tabla.columns = pd.Index(tabla.columns.astype(object), name=columna)
+    if porcentaje:
+        tabla = tabla.div(tabla.sum(axis=1), axis=0).mul(100).fillna(0)
+    return tabla
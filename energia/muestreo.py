@@ -0,0 +1,122 @@
+"""Reducción de puntos de las series antes de construir las figuras.
+
+Un gráfico de líneas no puede mostrar más puntos que píxeles de ancho, así
+que las series largas se reducen hasta que entre todas sumen `MAX_PUNTOS`:
+
+- LTTB (Largest-Triangle-Three-Buckets) conserva la forma visual de la curva;
+- min/max por bloques conserva los picos y valles de cada bloque.
+
+Así el JSON que viaja al navegador queda acotado sin importar cuántos
+países o meses haya cargados.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from energia.instrumentacion import medido
+
+MAX_PUNTOS = int(os.environ.get("ENERGIA_MAX_PUNTOS", 1000))
+
+
+def lttb(x, y, n):
+    """Índices de los `n` puntos de (x, y) que elige LTTB (x ordenado ascendente)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    largo = len(x)
+    if n >= largo:
+        return np.arange(largo)
+    if n < 3:
+        return np.array([0, largo - 1], dtype=np.int64)
+
+    elegidos = np.empty(n, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, largo - 1
+    paso = (largo - 2) / (n - 2)
+    a = 0
+    for i in range(n - 2):
+        # Promedio del bloque siguiente (el último punto para el último bloque)
+        sig_inicio = int(np.floor((i + 1) * paso)) + 1
+        sig_fin = min(int(np.floor((i + 2) * paso)) + 1, largo)
+        if sig_inicio >= sig_fin:
+            sig_inicio, sig_fin = largo - 1, largo
+        x_prom = x[sig_inicio:sig_fin].mean()
+        y_prom = y[sig_inicio:sig_fin].mean()
+
+        inicio = int(np.floor(i * paso)) + 1
+        fin = int(np.floor((i + 1) * paso)) + 1
+        areas = np.abs((x[a] - x_prom) * (y[inicio:fin] - y[a])
+                       - (x[a] - x[inicio:fin]) * (y_prom - y[a]))
+        a = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def minmax(y, n):
+    """Índices de los extremos de `y` y del mínimo y el máximo de cada uno de `(n - 2) // 2` bloques."""
+    y = np.asarray(y, dtype=float)
+    largo = len(y)
+    if largo <= n:
+        return np.arange(largo)
+    bloques = (n - 2) // 2
+    if bloques < 1:
+        return np.array([0, largo - 1], dtype=np.int64)
+    limites = np.linspace(0, largo, bloques + 1).astype(int)
+    elegidos = [0, largo - 1]
+    for inicio, fin in zip(limites[:-1], limites[1:]):
+        if fin > inicio:
+            tramo = y[inicio:fin]
+            elegidos.extend({inicio + int(np.nanargmin(tramo)), inicio + int(np.nanargmax(tramo))})
+    return np.array(sorted(set(elegidos)), dtype=np.int64)
+
+
+def _cortes(vacios):
+    """Posiciones del primer vacío de cada hueco entre dos valores (las que cortan la línea)."""
+    vacios = np.asarray(vacios, dtype=bool)
+    llenos = np.flatnonzero(~vacios)
+    if len(llenos) == 0:
+        return llenos
+    interior = vacios.copy()
+    interior[:llenos[0]] = False
+    interior[llenos[-1] + 1:] = False
+    inicio_hueco = interior & ~np.concatenate(([False], interior[:-1]))
+    return np.flatnonzero(inicio_hueco)
+
+
+@medido("agregacion")
+def reducir(df, x, y, color=None, max_puntos=MAX_PUNTOS, metodo="lttb"):
+    """Filas de `df` reducidas a `max_puntos` entre todas las series (una por valor de `color`).
+
+    El presupuesto se reparte por igual entre las series, con al menos sus dos
+    extremos cada una. Los huecos (valores nulos entre dos valores) conservan
+    una fila nula para que la línea se corte allí en vez de unir los tramos.
+    Si `x` no es numérica ni fecha (p. ej. 'YYYY-MM'), se usa el orden de las filas.
+    """
+    if metodo not in ("lttb", "minmax"):
+        raise ValueError(f"Método de reducción desconocido: {metodo}")
+    df = df.sort_values(x, kind="stable")
+    grupos = list(df.groupby(color, observed=True, sort=False)) if color else [(None, df)]
+    presupuesto = max(2, max_puntos // max(len(grupos), 1))
+    partes = []
+    for _, serie in grupos:
+        vacios = serie[y].isna().to_numpy()
+        cortes = _cortes(vacios)
+        llenos = np.flatnonzero(~vacios)
+        if len(llenos) + len(cortes) <= presupuesto:
+            indices = np.concatenate((llenos, cortes))
+        else:
+            valores = serie.iloc[llenos]
+            n = max(2, presupuesto - len(cortes))
+            if metodo == "minmax":
+                elegidos = minmax(valores[y].to_numpy(), n)
+            else:
+                valores_x = valores[x]
+                if pd.api.types.is_datetime64_any_dtype(valores_x):
+                    eje = valores_x.astype("int64").to_numpy()
+                elif pd.api.types.is_numeric_dtype(valores_x):
+                    eje = valores_x.to_numpy()
+                else:
+                    eje = np.arange(len(valores))
+                elegidos = lttb(eje, valores[y].to_numpy(), n)
+            indices = np.concatenate((llenos[elegidos], cortes))
+        partes.append(serie.iloc[np.sort(indices)])
+    return pd.concat(partes) if partes else df
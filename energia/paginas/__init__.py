@@ -0,0 +1,128 @@
+"""Páginas del dashboard unificado (`dashboard_unificado.py`).
+
+Los cinco scripts (`app.py`, `analisis_energetico.py`, `dashboard.py`,
+`dashboard_con_filtros.py` y `dashboard_final.py`) dibujan con las funciones
+de los módulos de este paquete, y `dashboard_unificado.py` las reúne como
+páginas de una sola aplicación (`st.navigation`). Cada módulo de página se
+importa la primera vez que alguien navega a ella, no al arrancar, y las
+librerías pesadas (matplotlib, `plotly.subplots`, plotly en las vistas
+sectoriales) se importan dentro de la función que las usa. Este módulo solo
+depende de Streamlit y de `energia.instrumentacion`.
+
+`importar` mide cada importación (etapa ``importar``) y `mostrar`, el primer
+dibujo de cada página en el proceso (etapa ``primer_dibujo``; las visitas
+siguientes quedan como ``pagina``). Los tiempos se ven en el panel de
+desarrollo y en `/metricas`; `python -m energia.arranque` mide el arranque en
+frío de cada script y de cada página.
+"""
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from energia import instrumentacion
+
+
+class Pagina:
+    """Página del dashboard: `funcion` del módulo `energia.paginas.<modulo>`."""
+
+    def __init__(self, titulo, icono, modulo, funcion, ruta):
+        self.titulo = titulo
+        self.icono = icono
+        self.modulo = modulo
+        self.funcion = funcion
+        self.ruta = ruta
+
+
+GRUPOS = {
+    "🌍 Electricidad mensual (IEA)": [
+        Pagina("Diagnóstico Nacional", "📊", "mundo", "diagnostico", "diagnostico"),
+        Pagina("Comparativos Internacionales", "🌎", "mundo", "comparativos", "comparativos"),
+        Pagina("Comparación de Países", "🗺️", "mundo", "comparacion", "comparacion"),
+        Pagina("Tendencia Mensual", "📈", "mundo", "tendencia", "tendencia"),
+        Pagina("Generación Agregada", "⚡", "generacion", "pagina", "generacion"),
+    ],
+    "🇨🇴 Colombia por sector": [
+        Pagina("Consumo por Sector", "🏭", "sectorial", "diagnostico", "consumo"),
+        Pagina("Análisis Sectorial", "🧩", "sectorial", "pestanas", "sectorial"),
+        Pagina("Comparativos por Sector", "📶", "sectorial", "comparativos", "comparativos-sector"),
+        Pagina("Consumo por Año", "📅", "sectorial", "por_anio", "consumo-anio"),
+        Pagina("Análisis Climático", "🌱", "climatico", "mostrar", "climatico"),
+        Pagina("Emisiones por Año", "🏷️", "climatico", "por_anio", "emisiones-anio"),
+    ],
+}
+
+# Tiempos (ms) por proceso: importación de cada módulo y primer dibujo de cada página
+_importaciones = {}
+_primeros_dibujos = {}
+_lock = threading.Lock()
+
+
+def importar(nombre):
+    """Módulo `energia.paginas.<nombre>`, importado (y medido) la primera vez que se pide."""
+    modulo = f"{__name__}.{nombre}"
+    if modulo in sys.modules:
+        return sys.modules[modulo]
+    with instrumentacion.medir("importar", modulo):
+        inicio = time.perf_counter()
+        cargado = importlib.import_module(modulo)
+    with _lock:
+        _importaciones.setdefault(nombre, round((time.perf_counter() - inicio) * 1000, 1))
+    return cargado
+
+
+def mostrar(pagina):
+    """Dibuja `pagina`; la primera vez en el proceso se mide como primer dibujo."""
+    primera = pagina.ruta not in _primeros_dibujos
+    with instrumentacion.medir("primer_dibujo" if primera else "pagina", pagina.ruta):
+        inicio = time.perf_counter()
+        getattr(importar(pagina.modulo), pagina.funcion)()
+    if primera:
+        with _lock:
+            _primeros_dibujos.setdefault(pagina.ruta, round((time.perf_counter() - inicio) * 1000, 1))
+
+
+def navegacion():
+    """{grupo: [st.Page]} para `st.navigation`; ningún módulo de página se importa aquí."""
+    return {grupo: [st.Page(functools.partial(mostrar, pagina), title=pagina.titulo, icon=pagina.icono,
+                            url_path=pagina.ruta, default=(i == 0 and j == 0))
+                    for j, pagina in enumerate(paginas)]
+            for i, (grupo, paginas) in enumerate(GRUPOS.items())}
+
+
+def tiempos():
+    """{'importar': {módulo: ms}, 'primer_dibujo': {página: ms}} de este proceso."""
+    with _lock:
+        return {"importar": dict(_importaciones), "primer_dibujo": dict(_primeros_dibujos)}
+
+
+# --------------------------
+# 🛠️ Panel de desarrollo
+# --------------------------
+def panel_activo():
+    return os.environ.get("ENERGIA_PANEL_DESARROLLO") == "1" or st.query_params.get("dev") == "1"
+
+
+def panel_desarrollo(mediciones, inicio_rerun):
+    """Tiempos por etapa del rerun (y de importación y primer dibujo) en la barra lateral."""
+    import pandas as pd
+
+    with st.sidebar.expander("🛠️ Tiempos del rerun", expanded=True):
+        st.caption(f"Rerun: {(time.perf_counter() - inicio_rerun) * 1000:.0f} ms · {len(mediciones)} etapas medidas")
+        if mediciones:
+            df_mediciones = pd.DataFrame(mediciones)
+            df_mediciones["nombre"] = [("· " * nivel) + nombre for nivel, nombre in zip(df_mediciones["nivel"], df_mediciones["nombre"])]
+            columnas_panel = [c for c in ["etapa", "nombre", "cache", "ms", "filas_entrada", "filas_salida", "memoria_mb"] if c in df_mediciones]
+            st.dataframe(df_mediciones[columnas_panel], hide_index=True, use_container_width=True)
+            st.caption("Total por etapa (ms)")
+            st.dataframe(df_mediciones[df_mediciones["nivel"] == 0].groupby("etapa")["ms"].sum().sort_values(ascending=False))
+        registrados = tiempos()
+        if registrados["importar"] or registrados["primer_dibujo"]:
+            st.caption("Importación de módulos y primer dibujo de cada página en este proceso (ms)")
+            st.dataframe(pd.DataFrame([(etapa, nombre, ms) for etapa, valores in registrados.items()
+                                       for nombre, ms in valores.items()], columns=["etapa", "nombre", "ms"]),
+                         hide_index=True, use_container_width=True)
@@ -0,0 +1,44 @@
+"""Emisiones de CO₂ por sector en Colombia, desde la tabla de `energia.intensidad`."""
+import streamlit as st
+
+from energia.datos import ejecutar
+
+ANALISIS = [
+    "Evolución de las Emisiones de CO₂ por Sector en Colombia (2000-2021)",
+    "Participación Porcentual de las Emisiones de CO₂ por Sector en Colombia (2000-2022)",
+    "Intensidad de Emisiones por Sector en Colombia (CO₂ por unidad de consumo eléctrico)"
+]
+
+
+# Series ya calculadas en la tabla de intensidad (sector × año, sin joins en el rerun);
+# sin los sectores y años que no tienen esa medida (p. ej. años con consumo pero sin emisiones)
+def serie_intensidad(columna):
+    return (ejecutar("intensidad_sector").pivot(index='Year', columns='Sector', values=columna)
+            .dropna(axis=1, how='all').dropna(how='all'))
+
+
+# Análisis Climático
+def mostrar():
+    sub_menu = st.sidebar.radio("Seleccione un análisis", ANALISIS)
+
+    if sub_menu == "Evolución de las Emisiones de CO₂ por Sector en Colombia (2000-2021)":
+        # Como antes: un sector sin dato en un año se dibuja en 0
+        st.line_chart(serie_intensidad('Emisiones').fillna(0))
+
+    elif sub_menu == "Participación Porcentual de las Emisiones de CO₂ por Sector en Colombia (2000-2022)":
+        st.area_chart(serie_intensidad('Participacion_Emisiones').fillna(0))
+
+    elif sub_menu == "Intensidad de Emisiones por Sector en Colombia (CO₂ por unidad de consumo eléctrico)":
+        st.line_chart(serie_intensidad('Intensidad'))
+        st.caption("Intensidad nacional: emisiones totales / consumo eléctrico total")
+        st.line_chart(ejecutar("intensidad_total").set_index('Year')['Intensidad'])
+
+
+# Emisiones por sector de un año (solo Colombia)
+def por_anio():
+    pais_seleccionado = st.sidebar.selectbox("Selecciona un país", ["Colombia"])
+    anios = ejecutar("anios_emisiones")['Year'].tolist()
+    anio_seleccionado = st.sidebar.selectbox("Selecciona el año", anios, index=len(anios)-1)
+
+    st.subheader(f"Emisiones de CO2 por Sector en {pais_seleccionado} - {anio_seleccionado}")
+    st.bar_chart(ejecutar("emisiones_por_sector", anio=anio_seleccionado).set_index('Sector')['Value'])
@@ -0,0 +1,80 @@
+"""Generación neta por fuente de un país (`analisis_energetico_old.py`).
+
+Los datos y las figuras de cada pestaña no dependen de Streamlit, así que
+`energia.benchmark` mide estas mismas funciones.
+"""
+import pandas as pd
+
+from energia import datos
+from energia.config import BALANCE_NETO
+
+RENOVABLES = ('Solar', 'Wind', 'Hydro')
+
+
+# Los filtros de país, año y producto se resuelven en SQLite (o en la caché
+# columnar): cada pestaña lee solo sus filas, nunca la tabla completa
+def cargar_generacion(pais=None, anio=None, productos=None):
+    return datos.estadisticas_mensuales(columnas=("Product", "Year", "Month", "Value"), pais=pais, anio=anio,
+                                        balance=BALANCE_NETO, productos=productos, excluir_agregados=False)
+
+
+# -------------------
+# 📦 Datos de cada pestaña (se calculan solo cuando se necesitan)
+# -------------------
+def generacion_por_fuente(pais, anio):
+    df_filtrado = cargar_generacion(pais, anio)
+    return df_filtrado.groupby('Product', observed=True)['Value'].sum().reset_index(name='Total_GWh')
+
+
+def generacion_mensual(pais, anio):
+    df_filtrado = cargar_generacion(pais, anio)
+    df_mensual = df_filtrado.groupby('Month')['Value'].sum().reset_index()
+    df_mensual['Mes'] = df_mensual['Month'].apply(lambda x: pd.to_datetime(str(x), format='%m').strftime('%b'))
+    return df_mensual
+
+
+def historico_anual(pais):
+    return cargar_generacion(pais).groupby('Year')['Value'].sum().reset_index(name='Total_Generation_GWh')
+
+
+def renovables_del_anio(anio):
+    df_renovables = cargar_generacion(anio=anio, productos=RENOVABLES)
+    return df_renovables.groupby('Product', observed=True)['Value'].sum().reset_index(name='Generation_GWh')
+
+
+# -------------------
+# 📊 Figuras de cada pestaña (matplotlib solo se importa al dibujar)
+# -------------------
+def grafico_distribucion(df_grouped):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.pie(df_grouped['Total_GWh'], labels=df_grouped['Product'], autopct='%1.1f%%', startangle=140)
+    ax.axis('equal')
+    return fig
+
+
+def grafico_mensual(df_mensual):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot(df_mensual['Mes'], df_mensual['Value'], marker='o', color='green')
+    ax.grid(True)
+    return fig
+
+
+def grafico_historico(df_anual):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot(df_anual['Year'], df_anual['Total_Generation_GWh'], marker='o', color='blue')
+    ax.grid(True)
+    return fig
+
+
+def grafico_renovables(df_ren_grouped):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.bar(df_ren_grouped['Product'], df_ren_grouped['Generation_GWh'], color='teal')
+    return fig
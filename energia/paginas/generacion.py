@@ -0,0 +1,49 @@
+"""Totales de generación de la tabla mensual, por bloques (`analisis_energetico.py`)."""
+import streamlit as st
+
+from energia import bloques, datos
+from energia.config import TABLA_MENSUAL
+from energia.taxonomia import PRODUCTOS_EXCLUIR
+
+ANALISIS = [
+    "Tendencia Mensual de Energía en Colombia (2014-2025)",
+    "Comparativo de Fuentes de Energía por Año en Colombia (2014-2025)",
+    "Participación de Fuentes de Energía en Colombia (2024)",
+    "Evolución Histórica de la Diversificación Energética en Colombia (2014-2025)"
+]
+
+
+# Los totales se agregan por bloques: la tabla mensual nunca se carga completa
+def totales(*por):
+    return datos.consultar(TABLA_MENSUAL, bloques.agregar, por, excluir_productos=tuple(PRODUCTOS_EXCLUIR))
+
+
+def plot_energy_trend():
+    df_monthly = totales('Year').set_index('Year')['Value']
+    st.bar_chart(df_monthly)
+
+
+def plot_energy_comparison():
+    df_comparison = totales('Year', 'Product').pivot(index='Year', columns='Product', values='Value').fillna(0)
+    st.line_chart(df_comparison)
+
+
+def plot_renewable_percentage(year):
+    # matplotlib solo se importa si se abre este gráfico
+    import matplotlib.pyplot as plt
+
+    df_pivot = datos.consultar(TABLA_MENSUAL, bloques.mezcla, por='Country', anio=year)
+    fig, ax = plt.subplots()
+    df_pivot.plot(kind='bar', stacked=True, ax=ax)
+    st.pyplot(fig)
+
+
+def pagina():
+    sub_menu = st.sidebar.radio("Seleccione un análisis", ANALISIS)
+    st.header(sub_menu)
+    if sub_menu == "Tendencia Mensual de Energía en Colombia (2014-2025)":
+        plot_energy_trend()
+    elif sub_menu == "Comparativo de Fuentes de Energía por Año en Colombia (2014-2025)":
+        plot_energy_comparison()
+    elif sub_menu == "Participación de Fuentes de Energía en Colombia (2024)":
+        plot_renewable_percentage(2024)
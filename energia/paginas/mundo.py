@@ -0,0 +1,157 @@
+"""Secciones de la electricidad mensual del IEA (`app.py` y el dashboard unificado)."""
+import streamlit as st
+
+from energia import calentamiento, consultas, datos, graficos, instrumentacion
+from energia.config import TABLA_MENSUAL
+
+# Cada cuánto se revisa si ya terminó la preparación de la base (segundos)
+REVISION_PREPARACION = 1
+
+
+def cargar_filtros():
+    return datos.consultar(TABLA_MENSUAL, consultas.paises), datos.consultar(TABLA_MENSUAL, consultas.anios)
+
+
+def filtros():
+    """Selectores de país y año (dentro de `with st.sidebar:`); detiene el script si no hay años.
+
+    Mientras el calentamiento prepara la base no se consulta nada (la consulta
+    esperaría a que termine): el script termina y el aviso de `estado_cache`,
+    que se refresca solo, vuelve a correr la página cuando la base está lista.
+    """
+    if calentamiento.preparando():
+        st.stop()
+    lista_paises, lista_anios = cargar_filtros()
+
+    # País
+    paises = ['Todos'] + lista_paises
+    pais = st.selectbox("🌍 Selecciona un país", paises)
+
+    # Años con protección ante lista vacía
+    anios = lista_anios
+    if anios:
+        anio = st.selectbox("📅 Selecciona un año", anios, index=len(anios) - 1)
+    else:
+        st.warning("⚠️ No hay años disponibles en los datos.")
+        st.stop()
+    return pais, anio
+
+
+def estado_cache():
+    # Mientras se calientan las cachés se avisa, sin bloquear la página; va antes
+    # de cualquier consulta para que se vea también mientras se prepara la base
+    estado = calentamiento.estado()
+    if calentamiento.preparando():
+        aviso_preparacion()
+    elif estado["estado"] == "calentando":
+        st.caption(f"⏳ Calentando cachés ({estado['hechas']}/{estado['total']})…")
+
+
+@st.fragment(run_every=REVISION_PREPARACION)
+def aviso_preparacion():
+    # Solo este aviso se vuelve a dibujar cada segundo, sin ocupar el hilo del
+    # script entre revisiones; con la base lista se corre de nuevo toda la página
+    if calentamiento.preparando():
+        st.caption("⏳ Preparando la base de datos…")
+    else:
+        st.rerun()
+
+
+# -------------------
+# 🧩 Función utilitaria para mostrar gráficos en 2 columnas
+# -------------------
+def mostrar_graficos(figuras_seccion, columnas=2):
+    # figuras_seccion: lista de (id, figura) que sale de la caché de figuras;
+    # solo se construyen las que faltan para estos filtros
+    cols = st.columns(columnas)
+    for i, (id_grafico, fig) in enumerate(figuras_seccion):
+        with cols[i % columnas], instrumentacion.medir("dibujar", id_grafico):
+            st.plotly_chart(fig, use_container_width=True)
+
+
+def mostrar(seccion, pais, anio):
+    """Contenido de una sección de `graficos.SECCIONES` para los filtros elegidos."""
+    calentamiento.registrar_acceso(seccion, pais, anio)
+
+    # --------------------------
+    # Diagnóstico Nacional
+    # --------------------------
+    if seccion == "Diagnóstico Nacional":
+        st.subheader(f"Diagnóstico Energético - {pais} ({anio})")
+
+        # Mostrar todos los gráficos
+        mostrar_graficos(graficos.construir(seccion, pais, anio))
+
+    # -------------------------------
+    # SECCIÓN: COMPARATIVOS INTERNACIONALES
+    # -------------------------------
+    elif seccion == "Comparativos Internacionales":
+        st.subheader(f"Comparativos Internacionales - {anio}")
+
+        mostrar_graficos(graficos.construir(seccion, pais, anio))
+
+    elif seccion == graficos.COMPARACION:
+        st.subheader(f"Comparación de Países - {anio}")
+
+        # Varios países a la vez: una consulta con IN por gráfico, un panel por país
+        lista_paises = cargar_filtros()[0]
+        seleccion = st.multiselect("🌍 Países a comparar", lista_paises,
+                                   default=[pais] if pais != 'Todos' else lista_paises[:4],
+                                   max_selections=graficos.MAX_PAISES_COMPARACION)
+        if not seleccion:
+            st.info("Selecciona al menos un país para comparar.")
+        else:
+            mostrar_graficos(graficos.construir(seccion, tuple(sorted(seleccion)), anio), columnas=1)
+
+    elif seccion == "Tendencia Mensual":
+        # -------------------
+        # ✅ Sección: Tendencia Mensual
+        # -------------------
+        if st.sidebar.radio("Secciones", ["Tendencia Mensual", "Otro módulo"] if "Tendencia Mensual" not in st.session_state else ["Otro módulo", "Tendencia Mensual"]) == "Tendencia Mensual":
+            st.subheader("Tendencia y Generación Mensual por Tipo de Energía")
+
+            tipo_energia = st.selectbox("Tipo de Energía", list(graficos.TIPOS_ENERGIA.keys()))
+            modo = graficos.TIPOS_ENERGIA[tipo_energia]
+
+            figuras_mensuales = graficos.construir(seccion, pais, anio, tipo_energia=modo)
+            if not figuras_mensuales:
+                st.warning(f"No hay datos disponibles para {pais} y tipo {tipo_energia}")
+            else:
+                # Proyección ya ajustada por `python -m energia.pronosticos ajustar`: aquí solo se lee
+                if st.checkbox("📈 Superponer proyección"):
+                    with instrumentacion.medir("pronosticos", "lineas_mensual"):
+                        proyectada = graficos.con_proyeccion(dict(figuras_mensuales)["lineas_mensual"], pais, modo)
+                    if proyectada is None:
+                        st.caption(f"Sin proyección para {pais}: ejecuta `python -m energia.pronosticos ajustar`.")
+                    else:
+                        figuras_mensuales = [(id_grafico, proyectada if id_grafico == "lineas_mensual" else fig)
+                                             for id_grafico, fig in figuras_mensuales]
+                mostrar_graficos(figuras_mensuales, columnas=1)
+
+
+# --------------------------
+# Páginas del dashboard unificado (una por sección, con los mismos filtros)
+# --------------------------
+def _pagina(seccion):
+    # Calienta en segundo plano las combinaciones más pedidas (una vez por proceso)
+    calentamiento.iniciar()
+    with st.sidebar:
+        estado_cache()
+        pais, anio = filtros()
+    mostrar(seccion, pais, anio)
+
+
+def diagnostico():
+    _pagina("Diagnóstico Nacional")
+
+
+def comparativos():
+    _pagina("Comparativos Internacionales")
+
+
+def comparacion():
+    _pagina(graficos.COMPARACION)
+
+
+def tendencia():
+    _pagina("Tendencia Mensual")
@@ -0,0 +1,62 @@
+"""Vistas de `dashboard.py`: las de `sectorial` con sus propias etiquetas y filtros."""
+import streamlit as st
+
+from energia import secciones
+from energia.config import TABLA_SECTORIAL
+from energia.datos import ejecutar
+from energia.paginas.sectorial import consumo_anual_sector
+from energia.secciones import Dependencia
+
+
+# Las tablas sectorial y de CO2 son solo de Colombia
+def select_filters(consulta_anios):
+    years = ejecutar(consulta_anios)['Year'].tolist()
+    pais_seleccionado = st.sidebar.selectbox("País", ["Colombia"])
+    anio_seleccionado = st.sidebar.selectbox("Año", years, index=len(years)-1)
+    return pais_seleccionado, anio_seleccionado
+
+
+def resumen_sectorial(pais, anio):
+    return ejecutar("consumo_por_sector", anio=anio).set_index('Sector')['Value']
+
+
+def diagnostico():
+    df = ejecutar("consumo_anio_sector")
+    pais, year = select_filters("anios_consumo")
+    submenu = st.sidebar.radio("Análisis", ["Tendencia Mensual", "Comparativo por Año", "Participación Fuentes 2024", "Evolución Diversificación"])
+    if submenu == "Tendencia Mensual":
+        st.line_chart(df.groupby('Year')['Value'].sum())
+    elif submenu == "Comparativo por Año":
+        st.line_chart(df.groupby(['Year', 'Sector'], observed=True)['Value'].sum().unstack())
+    elif submenu == "Participación Fuentes 2024":
+        df_2024 = df[df['Year'] == 2024]
+        if not df_2024.empty:
+            # plotly solo se importa para este gráfico
+            import plotly.express as px
+
+            fig = px.pie(df_2024.groupby('Sector', observed=True)['Value'].sum().reset_index(), names='Sector', values='Value')
+            st.plotly_chart(fig)
+        else:
+            st.warning("No hay datos para 2024.")
+    elif submenu == "Evolución Diversificación":
+        st.area_chart(df.groupby(['Year', 'Sector'], observed=True)['Value'].sum().unstack())
+
+
+def pestanas():
+    pais, year = select_filters("anios_consumo")
+    secciones.pestanas({
+        "Resumen": ([Dependencia(TABLA_SECTORIAL, resumen_sectorial, pais, year)], st.bar_chart),
+        "Industrial": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Industry')], st.line_chart),
+        "Residencial": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Residential')], st.line_chart),
+        "Transporte": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Transport')], st.line_chart),
+    }, key="pestanas_sectorial")
+
+
+def comparativos():
+    pais, year = select_filters("anios_consumo")
+    st.bar_chart(ejecutar("consumo_por_sector", anio=year).set_index('Sector')['Value'])
+
+
+def climatico():
+    pais, year = select_filters("anios_emisiones")
+    st.bar_chart(ejecutar("emisiones_por_sector", anio=year).set_index('Sector')['Value'])
@@ -0,0 +1,128 @@
+"""Consumo eléctrico por sector en Colombia (`dashboard_final.py`, `dashboard.py`, `dashboard_con_filtros.py`)."""
+import streamlit as st
+
+from energia import secciones
+from energia.config import TABLA_SECTORIAL
+from energia.datos import ejecutar
+from energia.intensidad import INTENSIDAD
+from energia.paginas.climatico import serie_intensidad
+from energia.secciones import Dependencia
+
+ANALISIS = [
+    "Tendencia Mensual de Energía en Colombia (2014-2025)",
+    "Comparativo de Fuentes de Energía por Año en Colombia (2014-2025)",
+    "Participación de Fuentes de Energía en Colombia (2024)",
+    "Evolución Histórica de la Diversificación Energética en Colombia (2014-2025)"
+]
+COMPARATIVOS = [
+    "Comparativo de Participación Renovable en 2024 (Países)",
+    "Evolución Global de la Participación Renovable (2010-2025)",
+    "Comparativo Energético Global por Año (2010-2025)"
+]
+
+
+# Datos de las pestañas sectoriales (solo se calculan para la pestaña abierta)
+def consumo_por_sector(anio):
+    return ejecutar("consumo_por_sector", anio=anio).set_index('Sector')['Value']
+
+
+def consumo_anual_sector(sector):
+    return ejecutar("consumo_anual_sector", sector=sector).set_index('Year')['Value']
+
+
+def selector_anio(consulta_anios="anios_consumo", etiqueta="Selecciona el año"):
+    years = ejecutar(consulta_anios)['Year'].tolist()
+    return st.sidebar.selectbox(etiqueta, years, index=len(years)-1)
+
+
+# Datos de cada vista del diagnóstico (sin Streamlit; `energia.benchmark` los mide)
+def vista_diagnostico(sub_menu):
+    df = ejecutar("consumo_anio_sector")
+    if sub_menu == "Tendencia Mensual de Energía en Colombia (2014-2025)":
+        return df.groupby('Year')['Value'].sum()
+    if sub_menu == "Comparativo de Fuentes de Energía por Año en Colombia (2014-2025)":
+        return df.pivot_table(index='Year', columns='Sector', values='Value', aggfunc='sum', observed=True).fillna(0)
+    if sub_menu == "Participación de Fuentes de Energía en Colombia (2024)":
+        df_2024 = df[df['Year'] == 2024]
+        return df_2024.groupby('Sector', observed=True)['Value'].sum().reset_index()
+    if sub_menu == "Evolución Histórica de la Diversificación Energética en Colombia (2014-2025)":
+        return df.groupby(['Year', 'Sector'], observed=True)['Value'].sum().unstack().fillna(0)
+
+
+def grafico_participacion(df_grouped):
+    # plotly solo se importa para este gráfico
+    import plotly.express as px
+
+    return px.pie(df_grouped, names='Sector', values='Value', title='Participación de Fuentes de Energía en Colombia (2024)')
+
+
+# Diagnóstico Energético de Colombia
+def diagnostico():
+    selector_anio()
+
+    sub_menu = st.sidebar.radio("Seleccione un análisis", ANALISIS)
+    datos_vista = vista_diagnostico(sub_menu)
+
+    if sub_menu == "Tendencia Mensual de Energía en Colombia (2014-2025)":
+        st.line_chart(datos_vista)
+
+    elif sub_menu == "Comparativo de Fuentes de Energía por Año en Colombia (2014-2025)":
+        st.line_chart(datos_vista)
+
+    elif sub_menu == "Participación de Fuentes de Energía en Colombia (2024)":
+        st.plotly_chart(grafico_participacion(datos_vista))
+
+    elif sub_menu == "Evolución Histórica de la Diversificación Energética en Colombia (2014-2025)":
+        st.area_chart(datos_vista)
+
+
+# Análisis Sectorial (sin `anio`, el año del resumen se elige en la barra lateral)
+def pestanas(anio=None):
+    if anio is None:
+        st.sidebar.selectbox("Selecciona un país", ["Colombia"])
+        anio = selector_anio()
+    secciones.pestanas({
+        "Resumen General": ([Dependencia(TABLA_SECTORIAL, consumo_por_sector, anio)], st.bar_chart),
+        "Industrial": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Industry')], st.line_chart),
+        "Residencial": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Residential')], st.line_chart),
+        "Transporte": ([Dependencia(TABLA_SECTORIAL, consumo_anual_sector, 'Transport')], st.line_chart),
+        "Intensidad de Emisiones": ([Dependencia(INTENSIDAD, serie_intensidad, 'Intensidad')], st.line_chart),
+    }, key="pestanas_sectorial")
+
+
+# Datos de cada vista de los comparativos por sector
+def vista_comparativos(sub_menu):
+    df = ejecutar("consumo_anio_sector")
+    if sub_menu == "Comparativo de Participación Renovable en 2024 (Países)":
+        df_2024 = df[df['Year'] == 2024]
+        return df_2024.groupby('Sector', observed=True)['Value'].sum()
+    if sub_menu == "Evolución Global de la Participación Renovable (2010-2025)":
+        return df[df['Sector'] == 'Renewable'].groupby('Year')['Value'].sum()
+    if sub_menu == "Comparativo Energético Global por Año (2010-2025)":
+        return df.groupby(['Year', 'Sector'], observed=True)['Value'].sum().unstack().fillna(0)
+
+
+# Comparativos por sector
+def comparativos():
+    selector_anio()
+
+    sub_menu = st.sidebar.radio("Seleccione un análisis", COMPARATIVOS)
+    datos_vista = vista_comparativos(sub_menu)
+
+    if sub_menu == "Comparativo de Participación Renovable en 2024 (Países)":
+        st.bar_chart(datos_vista)
+
+    elif sub_menu == "Evolución Global de la Participación Renovable (2010-2025)":
+        st.line_chart(datos_vista)
+
+    elif sub_menu == "Comparativo Energético Global por Año (2010-2025)":
+        st.line_chart(datos_vista)
+
+
+# Consumo por sector de un año (las tablas sectorial y de CO2 son solo de Colombia)
+def por_anio(titulo="Consumo por Sector"):
+    pais_seleccionado = st.sidebar.selectbox("Selecciona un país", ["Colombia"])
+    anio_seleccionado = selector_anio()
+
+    st.subheader(f"{titulo} en {pais_seleccionado} - {anio_seleccionado}")
+    st.bar_chart(consumo_por_sector(anio_seleccionado))
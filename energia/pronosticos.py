@@ -0,0 +1,306 @@
+"""Pronósticos de la generación neta mensual por país y tipo de energía.
+
+`ajustar` arma una serie mensual por país × tipo de energía (más el total
+global, 'Todos') desde `rollups.PAIS_MES_TIPO` y, para cada una, elige entre:
+
+- ``naive_estacional``: repite los últimos 12 meses;
+- ``holt_winters``: suavizado exponencial aditivo con tendencia y
+  estacionalidad (ETS A,A,A); los parámetros se eligen por búsqueda en rejilla,
+  vectorizada sobre todas las combinaciones a la vez.
+
+El modelo con menor error absoluto medio en los últimos 12 meses (ajustando
+sin ellos) se reajusta con la serie completa y se proyecta `HORIZONTE` meses,
+con un intervalo de ±1.96 σ·√h a partir de los residuos de un paso.
+
+Los ajustes corren en un pool de procesos y se guardan en una base aparte
+(`ENERGIA_PRONOSTICOS`, para no invalidar la caché del dashboard): los
+parámetros y el error en `modelos`, la proyección en `pronosticos`. Cada serie
+guarda una firma de sus valores; al volver a ejecutar, solo se reajustan las
+series con meses nuevos o corregidos. El dashboard lee las proyecciones ya
+calculadas (`proyeccion`), nunca ajusta durante un request.
+
+Uso (después de cada `python -m energia.ingesta`):
+    python -m energia.pronosticos ajustar [--procesos 4] [--forzar]
+    python -m energia.pronosticos listar
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from energia import config, rollups, series
+from energia.config import BALANCE_NETO
+
+RUTA = os.environ.get("ENERGIA_PRONOSTICOS", "pronosticos.db")
+HORIZONTE = 12
+PERIODO = 12
+MODELOS = ("naive_estacional", "holt_winters")
+TAMANO_LOTE = 16
+
+# Rejilla de (alfa, beta, gamma) para Holt-Winters
+_REJILLA = np.array([(a, b, g) for a in (0.1, 0.2, 0.4, 0.6, 0.8)
+                     for b in (0.0, 0.05, 0.2) for g in (0.05, 0.2, 0.5)])
+
+
+# --------------------------
+# Modelos
+# --------------------------
+def naive_estacional(y, horizonte):
+    """Pronóstico y residuos de un paso del modelo que repite la última temporada."""
+    return np.resize(y[-PERIODO:], horizonte), y[PERIODO:] - y[:-PERIODO], {}
+
+
+def _holt_winters(y, parametros):
+    """Corre Holt-Winters aditivo para cada fila de `parametros` (alfa, beta, gamma) a la vez.
+
+    Devuelve (nivel, tendencia, última temporada, residuos de un paso), con
+    una fila por combinación de parámetros.
+    """
+    alfa, beta, gamma = (parametros[:, i:i + 1] for i in range(3))
+    combinaciones = len(parametros)
+    # Inicio clásico: nivel y estacionalidad de la primera temporada, tendencia entre las dos primeras
+    nivel = np.full((combinaciones, 1), y[:PERIODO].mean())
+    tendencia = np.full((combinaciones, 1), (y[PERIODO:2 * PERIODO].mean() - y[:PERIODO].mean()) / PERIODO)
+    estacional = np.tile(y[:PERIODO] - y[:PERIODO].mean(), (combinaciones, 1))
+    residuos = np.empty((combinaciones, len(y) - PERIODO))
+    for t in range(PERIODO, len(y)):
+        s = estacional[:, [t % PERIODO]]
+        residuos[:, [t - PERIODO]] = y[t] - (nivel + tendencia + s)
+        anterior = nivel
+        nivel = alfa * (y[t] - s) + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (nivel - anterior) + (1 - beta) * tendencia
+        estacional[:, [t % PERIODO]] = gamma * (y[t] - nivel) + (1 - gamma) * s
+    # Temporada ordenada para que la posición 0 sea el mes siguiente al último observado
+    temporada = np.roll(estacional, -(len(y) % PERIODO), axis=1)
+    return nivel[:, 0], tendencia[:, 0], temporada, residuos
+
+
+def holt_winters(y, horizonte):
+    """Pronóstico, residuos y parámetros de Holt-Winters con la mejor combinación de la rejilla."""
+    nivel, tendencia, temporada, residuos = _holt_winters(y, _REJILLA)
+    mejor = int(np.argmin((residuos ** 2).sum(axis=1)))
+    pasos = np.arange(1, horizonte + 1)
+    pronostico = nivel[mejor] + pasos * tendencia[mejor] + temporada[mejor][(pasos - 1) % PERIODO]
+    alfa, beta, gamma = _REJILLA[mejor]
+    return pronostico, residuos[mejor], {"alfa": alfa, "beta": beta, "gamma": gamma}
+
+
+_FUNCIONES = {"naive_estacional": naive_estacional, "holt_winters": holt_winters}
+
+
+def _candidatos(n):
+    # Holt-Winters necesita dos temporadas para iniciar; la validación, una más
+    return [m for m in MODELOS if n >= (2 if m == "naive_estacional" else 3) * PERIODO]
+
+
+def ajustar_serie(valores, horizonte=HORIZONTE):
+    """Elige el modelo por error en los últimos 12 meses y proyecta `horizonte` meses.
+
+    `valores`: serie mensual completa (sin huecos). Devuelve un dict con el
+    modelo, sus parámetros, el error de validación y la proyección con su
+    intervalo, o None si la serie es demasiado corta.
+    """
+    y = np.asarray(valores, dtype="float64")
+    if len(y) < PERIODO + 1:
+        return None
+    errores = {}
+    for modelo in _candidatos(len(y)):
+        pronostico, _, _ = _FUNCIONES[modelo](y[:-PERIODO], PERIODO)
+        errores[modelo] = float(np.abs(pronostico - y[-PERIODO:]).mean())
+    modelo = min(errores, key=errores.get) if errores else "naive_estacional"
+    pronostico, residuos, parametros = _FUNCIONES[modelo](y, horizonte)
+    sigma = float(np.std(residuos)) if len(residuos) else 0.0
+    margen = 1.96 * sigma * np.sqrt(np.arange(1, horizonte + 1))
+    # La generación no es negativa
+    return {
+        "modelo": modelo,
+        "parametros": {k: float(v) for k, v in parametros.items()},
+        "error": errores.get(modelo),
+        "valor": np.clip(pronostico, 0, None),
+        "inferior": np.clip(pronostico - margen, 0, None),
+        "superior": pronostico + margen,
+    }
+
+
+def _ajustar_lote(lote, horizonte):
+    """Ajusta un lote de series en un proceso del pool (sin acceso a la base)."""
+    resultados = []
+    for pais, tipo, inicio, valores, firma in lote:
+        resultado = ajustar_serie(valores, horizonte)
+        if resultado is not None:
+            resultado.update(pais=pais, tipo=tipo, firma=firma, observaciones=len(valores),
+                             desde=pd.Period(inicio, freq="M") + len(valores))
+        resultados.append((pais, tipo, resultado))
+    return resultados
+
+
+# --------------------------
+# Series de origen
+# --------------------------
+def _series(conn):
+    """[(país, tipo, primer período 'AAAA-MM', valores)] de cada serie con datos, incluido 'Todos'."""
+    df = rollups.leer(conn, rollups.PAIS_MES_TIPO, Balance=BALANCE_NETO)
+    salida = []
+    for pais, grupo in [("Todos", df), *df.groupby("Country", observed=True)]:
+        tabla = series.indexar(grupo, "Energy_Type")
+        for tipo in tabla.columns:
+            serie = tabla[tipo]
+            # Sin los meses vacíos de los extremos; los huecos internos se interpolan
+            serie = serie.loc[serie.first_valid_index():serie.last_valid_index()].interpolate(limit_area="inside")
+            if serie.notna().any():
+                salida.append((str(pais), str(tipo), str(serie.index[0]), serie.to_numpy(dtype="float64")))
+    return salida
+
+
+def _firma(inicio, valores, horizonte):
+    contenido = f"{inicio}|{horizonte}|".encode("utf-8") + np.round(valores, 6).tobytes()
+    return hashlib.sha1(contenido).hexdigest()
+
+
+# --------------------------
+# Persistencia
+# --------------------------
+def _abrir(ruta):
+    conn = sqlite3.connect(ruta)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS modelos (
+            Country TEXT, Energy_Type TEXT, Modelo TEXT, Parametros TEXT, Error REAL,
+            Observaciones INTEGER, Firma TEXT, Ajustado REAL,
+            PRIMARY KEY (Country, Energy_Type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pronosticos (
+            Country TEXT, Energy_Type TEXT, Year INTEGER, Month INTEGER,
+            Value REAL, Inferior REAL, Superior REAL,
+            PRIMARY KEY (Country, Energy_Type, Year, Month)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+
+def _guardar(conn, resultados, ahora):
+    with conn:
+        for pais, tipo, resultado in resultados:
+            conn.execute("DELETE FROM pronosticos WHERE Country = ? AND Energy_Type = ?", (pais, tipo))
+            conn.execute("DELETE FROM modelos WHERE Country = ? AND Energy_Type = ?", (pais, tipo))
+            if resultado is None:
+                continue
+            conn.execute("INSERT INTO modelos VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (pais, tipo, resultado["modelo"], json.dumps(resultado["parametros"]), resultado["error"],
+                          resultado["observaciones"], resultado["firma"], ahora))
+            periodos = pd.period_range(resultado["desde"], periods=len(resultado["valor"]), freq="M")
+            conn.executemany("INSERT INTO pronosticos VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (pais, tipo, periodo.year, periodo.month, float(v), float(i), float(s))
+                for periodo, v, i, s in zip(periodos, resultado["valor"], resultado["inferior"], resultado["superior"])
+            ])
+
+
+def ajustar(db_path=None, destino=None, procesos=None, horizonte=HORIZONTE, forzar=False):
+    """Reajusta las series nuevas o modificadas; devuelve (reajustadas, sin cambios, eliminadas)."""
+    origen = sqlite3.connect(f"file:{db_path or config.DB_PATH}?mode=ro", uri=True)
+    try:
+        todas = _series(origen)
+    finally:
+        origen.close()
+    conn = _abrir(destino or RUTA)
+    try:
+        guardadas = {(p, t): f for p, t, f in conn.execute("SELECT Country, Energy_Type, Firma FROM modelos")}
+        pendientes = []
+        for pais, tipo, inicio, valores in todas:
+            firma = _firma(inicio, valores, horizonte)
+            if forzar or guardadas.get((pais, tipo)) != firma:
+                pendientes.append((pais, tipo, inicio, valores, firma))
+        vigentes = {(p, t) for p, t, _, _ in todas}
+        eliminadas = [(p, t, None) for p, t in guardadas if (p, t) not in vigentes]
+
+        lotes = [pendientes[i:i + TAMANO_LOTE] for i in range(0, len(pendientes), TAMANO_LOTE)]
+        procesos = procesos or max(1, min(len(lotes), (os.cpu_count() or 2) - 1))
+        resultados = []
+        if procesos == 1 or len(lotes) <= 1:
+            for lote in lotes:
+                resultados.extend(_ajustar_lote(lote, horizonte))
+        else:
+            # spawn, como en energia.reportes: los procesos solo reciben arreglos
+            contexto = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+                for parcial in pool.map(_ajustar_lote, lotes, [horizonte] * len(lotes)):
+                    resultados.extend(parcial)
+        _guardar(conn, resultados + eliminadas, time.time())
+    finally:
+        conn.close()
+    return len(pendientes), len(todas) - len(pendientes), len(eliminadas)
+
+
+# --------------------------
+# Lectura (dashboard)
+# --------------------------
+@lru_cache(maxsize=2)
+def _leer(ruta, mtime):
+    # `mtime` en la clave: se relee solo cuando un ajuste reescribe la base
+    conn = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+    try:
+        df = pd.read_sql_query("""
+            SELECT p.Country, p.Energy_Type, p.Year, p.Month, p.Value, p.Inferior, p.Superior, m.Modelo
+            FROM pronosticos p JOIN modelos m USING (Country, Energy_Type)
+        """, conn)
+    finally:
+        conn.close()
+    df["Periodo"] = pd.PeriodIndex.from_fields(year=df["Year"].to_numpy(), month=df["Month"].to_numpy(), freq="M")
+    return df[["Country", "Periodo", "Energy_Type", "Value", "Inferior", "Superior", "Modelo"]]
+
+
+def proyeccion(pais, tipos=None, ruta=None):
+    """Proyección guardada de `pais` ('Todos' = global): Periodo, Energy_Type, Value, Inferior, Superior, Modelo.
+
+    DataFrame vacío si todavía no se ajustó ningún modelo.
+    """
+    ruta = ruta or RUTA
+    try:
+        df = _leer(os.path.abspath(ruta), os.stat(ruta).st_mtime_ns)
+    except (FileNotFoundError, sqlite3.OperationalError, pd.errors.DatabaseError):
+        return pd.DataFrame(columns=["Periodo", "Energy_Type", "Value", "Inferior", "Superior", "Modelo"])
+    df = df[df["Country"] == pais]
+    if tipos is not None:
+        df = df[df["Energy_Type"].isin(tipos)]
+    return df.drop(columns="Country").sort_values(["Energy_Type", "Periodo"], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pronósticos de generación mensual por país y tipo de energía.")
+    parser.add_argument("accion", choices=["ajustar", "listar"])
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--destino", default=RUTA, help="Base donde se guardan modelos y pronósticos")
+    parser.add_argument("--procesos", type=int, help="Procesos del pool (por defecto núcleos - 1)")
+    parser.add_argument("--horizonte", type=int, default=HORIZONTE, help="Meses a proyectar")
+    parser.add_argument("--forzar", action="store_true", help="Reajustar todas las series")
+    args = parser.parse_args(argv)
+
+    if args.accion == "ajustar":
+        inicio = time.perf_counter()
+        reajustadas, sin_cambios, eliminadas = ajustar(args.db, args.destino, args.procesos,
+                                                       args.horizonte, args.forzar)
+        print(f"✅ {reajustadas} serie(s) reajustada(s), {sin_cambios} sin cambios, "
+              f"{eliminadas} eliminada(s) en {time.perf_counter() - inicio:.1f} s → {args.destino}")
+        return
+
+    conn = sqlite3.connect(f"file:{args.destino}?mode=ro", uri=True)
+    try:
+        modelos = pd.read_sql_query("SELECT Country, Energy_Type, Modelo, Error, Observaciones FROM modelos "
+                                    "ORDER BY Country, Energy_Type", conn)
+    finally:
+        conn.close()
+    print(modelos.to_string(index=False))
+    print(modelos["Modelo"].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
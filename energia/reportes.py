@@ -0,0 +1,265 @@
+"""Reportes estáticos por país y año, fuera del servidor interactivo.
+
+Genera para cada (país, año) una carpeta con las secciones de `app.py`
+(Diagnóstico Nacional, Comparativos Internacionales, Tendencia Mensual) y las
+vistas sectorial y climática de `dashboard_final.py`:
+
+- ``index.html``: todas las figuras interactivas; plotly.js se escribe una
+  sola vez en la carpeta de destino y cada reporte lo referencia;
+- ``csv/``: los datos de cada figura (una fila por punto);
+- ``png/``: imágenes estáticas (requiere el paquete opcional ``kaleido``).
+
+Los reportes se reparten en un pool de procesos con prioridad baja (`nice`),
+así que no compiten con la latencia del servidor. Cada proceso registra una
+vez la plantilla de figuras del reporte y reutiliza sus cachés de datos y
+figuras entre reportes (con ``ENERGIA_CACHE_BACKEND=disco`` además comparten
+la caché con el servidor).
+
+Uso:
+    python -m energia.reportes --paises Colombia Chile --anios 2023 2024
+    python -m energia.reportes --todos-los-paises --anios 2024 --formatos html csv --procesos 8
+"""
+import argparse
+import html
+import importlib.util
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from energia import config, consultas, datos, figuras, graficos
+from energia.config import TABLA_MENSUAL
+
+FORMATOS = ("html", "csv", "png")
+PLANTILLA = "energia_reporte"
+ANCHO, ALTO = 1000, 520
+NICE = int(os.environ.get("ENERGIA_REPORTES_NICE", 10))
+
+
+# --------------------------
+# Vistas de dashboard_final.py (las tablas sectorial y de CO2 son solo de Colombia)
+# --------------------------
+def sectorial(pais, anio, tipo_energia=None):
+    def grafico_resumen():
+        df_anio = datos.ejecutar("consumo_por_sector", anio=anio)
+        return px.bar(df_anio, x='Sector', y='Value', title=f"Consumo por Sector ({anio})")
+
+    def grafico_evolucion():
+        df_sector = datos.ejecutar("consumo_anio_sector")
+        return px.line(df_sector, x='Year', y='Value', color='Sector', title="Evolución del Consumo por Sector")
+
+    return [("consumo_sector", grafico_resumen), ("evolucion_sectores", grafico_evolucion)]
+
+
+def climatico(pais, anio, tipo_energia=None):
+    # Todo sale de la tabla de hechos de energia.intensidad (sin joins al generar)
+    def grafico_emisiones():
+        df_sector = datos.ejecutar("intensidad_sector").dropna(subset=['Emisiones'])
+        return px.line(df_sector, x='Year', y='Emisiones', color='Sector', title="Emisiones de CO₂ por Sector")
+
+    def grafico_participacion():
+        df_sector = datos.ejecutar("intensidad_sector").dropna(subset=['Participacion_Emisiones'])
+        return px.area(df_sector, x='Year', y='Participacion_Emisiones', color='Sector',
+                       labels={"Participacion_Emisiones": "Percentage"},
+                       title="Participación Porcentual de las Emisiones de CO₂ por Sector")
+
+    def grafico_intensidad():
+        df_sector = datos.ejecutar("intensidad_sector").dropna(subset=['Intensidad'])
+        return px.line(df_sector, x='Year', y='Intensidad', color='Sector', markers=True,
+                       title="Intensidad de Emisiones por Sector (CO₂ por unidad de consumo eléctrico)")
+
+    return [("emisiones_sector", grafico_emisiones), ("participacion_emisiones", grafico_participacion),
+            ("intensidad_sector", grafico_intensidad)]
+
+
+SECCIONES = {
+    **{seccion: funcion for seccion, funcion in graficos.SECCIONES.items() if seccion not in graficos.MULTIPAIS},
+    "Análisis Sectorial": sectorial,
+    "Análisis Climático": climatico,
+}
+
+
+# --------------------------
+# Trabajo de cada proceso
+# --------------------------
+def _iniciar_proceso():
+    """Prepara cada proceso del pool: prioridad baja y plantilla de figuras registrada una vez."""
+    if NICE and hasattr(os, "nice"):
+        os.nice(NICE)
+    plantilla = go.layout.Template(pio.templates["plotly_white"])
+    plantilla.layout.update(width=ANCHO, height=ALTO, margin=dict(t=60, l=40, r=20, b=40))
+    pio.templates[PLANTILLA] = plantilla
+    pio.templates.default = PLANTILLA
+
+
+def _nombre_archivo(texto):
+    return re.sub(r"[^\w-]+", "_", str(texto)).strip("_") or "sin_nombre"
+
+
+def datos_figura(fig):
+    """Puntos de cada traza de una figura como DataFrame (serie, x, y y padre si lo hay)."""
+    partes = []
+    for traza in fig.data:
+        etiquetas = getattr(traza, "labels", None)
+        if etiquetas is not None:
+            x, y = etiquetas, getattr(traza, "values", None)
+        else:
+            x, y = getattr(traza, "x", None), getattr(traza, "y", None)
+        if x is None and y is None:
+            continue
+        largo = len(x) if x is not None else len(y)
+        parte = pd.DataFrame({
+            "serie": traza.name or "",
+            "x": list(x) if x is not None else list(range(largo)),
+            "y": list(y) if y is not None else [None] * largo,
+        })
+        padres = getattr(traza, "parents", None)
+        if padres is not None:
+            parte["padre"] = list(padres)
+        partes.append(parte)
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=["serie", "x", "y"])
+
+
+def _html(pais, anio, figuras_por_seccion):
+    cuerpo = []
+    for seccion, figuras_seccion in figuras_por_seccion.items():
+        cuerpo.append(f"<h2>{html.escape(seccion)}</h2>")
+        if not figuras_seccion:
+            cuerpo.append("<p>No hay datos disponibles.</p>")
+        for _, fig in figuras_seccion:
+            cuerpo.append(fig.to_html(full_html=False, include_plotlyjs=False))
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Reporte Energético - {html.escape(str(pais))} ({anio})</title>
+<script src="../plotly.min.js"></script>
+<style>body {{ font-family: sans-serif; max-width: {ANCHO + 40}px; margin: auto; }}</style>
+</head>
+<body>
+<h1>Reporte Energético - {html.escape(str(pais))} ({anio})</h1>
+{chr(10).join(cuerpo)}
+</body>
+</html>
+"""
+
+
+def generar_reporte(pais, anio, destino, formatos=("html", "csv")):
+    """Escribe el reporte de (pais, anio) en `destino/<pais>_<anio>/`; devuelve (carpeta, figuras, segundos)."""
+    inicio = time.perf_counter()
+    carpeta = os.path.join(destino, f"{_nombre_archivo(pais)}_{anio}")
+    os.makedirs(carpeta, exist_ok=True)
+
+    figuras_por_seccion = {}
+    for seccion, funcion in SECCIONES.items():
+        tipo_energia = 'ambas' if seccion == "Tendencia Mensual" else None
+        if seccion in graficos.SECCIONES:
+            figuras_por_seccion[seccion] = graficos.construir(seccion, pais, anio, tipo_energia)
+        else:
+            # No dependen del país: cada proceso las construye una vez por año (y no
+            # leen la tabla mensual, así que una ingesta no las desaloja)
+            figuras_por_seccion[seccion] = [(id_grafico, figuras.figura(seccion, id_grafico, construir, anio=anio,
+                                                                        alcance=(frozenset(), anio)))
+                                            for id_grafico, construir in funcion(pais, anio)]
+
+    if "html" in formatos:
+        with open(os.path.join(carpeta, "index.html"), "w", encoding="utf-8") as f:
+            f.write(_html(pais, anio, figuras_por_seccion))
+    for seccion, figuras_seccion in figuras_por_seccion.items():
+        for id_grafico, fig in figuras_seccion:
+            nombre = f"{_nombre_archivo(seccion)}__{id_grafico}"
+            if "csv" in formatos:
+                os.makedirs(os.path.join(carpeta, "csv"), exist_ok=True)
+                datos_figura(fig).to_csv(os.path.join(carpeta, "csv", nombre + ".csv"), index=False)
+            if "png" in formatos:
+                os.makedirs(os.path.join(carpeta, "png"), exist_ok=True)
+                fig.write_image(os.path.join(carpeta, "png", nombre + ".png"), width=ANCHO, height=ALTO)
+    total = sum(len(f) for f in figuras_por_seccion.values())
+    return carpeta, total, time.perf_counter() - inicio
+
+
+# --------------------------
+# Orquestación
+# --------------------------
+def _indice(destino, generados):
+    filas = "\n".join(
+        f'<li><a href="{html.escape(os.path.basename(carpeta))}/index.html">{html.escape(str(pais))} ({anio})</a></li>'
+        for (pais, anio), carpeta in sorted(generados.items(), key=lambda e: (str(e[0][0]), e[0][1])))
+    with open(os.path.join(destino, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f'<!DOCTYPE html>\n<html lang="es">\n<head><meta charset="utf-8"><title>Reportes Energéticos</title></head>\n'
+                f"<body>\n<h1>Reportes Energéticos</h1>\n<ul>\n{filas}\n</ul>\n</body>\n</html>\n")
+
+
+def generar(paises, anios, destino="reportes", formatos=("html", "csv"), procesos=None):
+    """Genera los reportes de paises × anios en paralelo; devuelve {(pais, anio): carpeta}."""
+    desconocidos = set(formatos) - set(FORMATOS)
+    if desconocidos:
+        raise ValueError(f"Formatos desconocidos: {sorted(desconocidos)} (usar {', '.join(FORMATOS)})")
+    if "png" in formatos and importlib.util.find_spec("kaleido") is None:
+        raise RuntimeError("Los PNG requieren el paquete opcional kaleido: pip install kaleido")
+
+    os.makedirs(destino, exist_ok=True)
+    if "html" in formatos:
+        with open(os.path.join(destino, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    # Por año primero: los reportes de un mismo año comparten datos en la caché de cada proceso
+    tareas = [(pais, anio) for anio in anios for pais in paises]
+    procesos = procesos or max(1, min(len(tareas), (os.cpu_count() or 2) - 1))
+    generados = {}
+    # spawn: cada proceso abre sus propias conexiones SQLite (no se heredan por fork)
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto, initializer=_iniciar_proceso) as pool:
+        pendientes = {pool.submit(generar_reporte, pais, anio, destino, tuple(formatos)): (pais, anio)
+                      for pais, anio in tareas}
+        for futuro in as_completed(pendientes):
+            pais, anio = pendientes[futuro]
+            carpeta, total, segundos = futuro.result()
+            generados[(pais, anio)] = carpeta
+            print(f"✅ {pais} {anio}: {total} figuras en {segundos:.1f} s → {carpeta}")
+    if "html" in formatos:
+        _indice(destino, generados)
+    return generados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera reportes estáticos (HTML/CSV/PNG) por país y año.")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--paises", nargs="+", help="Países ('Todos' = agregado global)")
+    grupo.add_argument("--todos-los-paises", action="store_true", help="Todos los países de la base")
+    parser.add_argument("--anios", nargs="+", type=int, help="Años (por defecto el último con datos)")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["html", "csv"])
+    parser.add_argument("--destino", default="reportes", help="Carpeta de salida")
+    parser.add_argument("--procesos", type=int, help="Procesos del pool (por defecto núcleos - 1)")
+    parser.add_argument("--db", default=config.DB_PATH, help="Ruta de la base SQLite")
+    args = parser.parse_args(argv)
+
+    # Los procesos del pool leen la base desde la configuración heredada por entorno
+    os.environ["ENERGIA_DB"] = config.DB_PATH = args.db
+    datos_paises = datos.consultar(TABLA_MENSUAL, consultas.paises)
+    datos_anios = datos.consultar(TABLA_MENSUAL, consultas.anios)
+    paises = datos_paises if args.todos_los_paises else args.paises
+    anios = args.anios or datos_anios[-1:]
+    faltantes = [p for p in paises if p != "Todos" and p not in datos_paises]
+    if faltantes:
+        parser.error(f"Países sin datos: {', '.join(faltantes)}")
+    if not anios or any(a not in datos_anios for a in anios):
+        parser.error(f"Años sin datos: {', '.join(str(a) for a in anios if a not in datos_anios) or 'ninguno disponible'}")
+
+    inicio = time.perf_counter()
+    try:
+        generados = generar(paises, anios, args.destino, args.formatos, args.procesos)
+    except (RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    print(f"📦 {len(generados)} reporte(s) en {time.perf_counter() - inicio:.1f} s → {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Tablas de agregados (rollups) de Monthly_Electricity_Statistics.
+
+Se materializan dentro de la misma base SQLite para que el dashboard lea
+resúmenes pequeños e indexados en lugar de agrupar la tabla completa en
+cada rerun de Streamlit.
+
+Uso:
+    python -m energia.rollups construir   # reconstruye todo
+    python -m energia.rollups refrescar   # solo los meses nuevos o modificados
+
+Los disparadores de la tabla mensual anotan en `rollup_meses_pendientes` los
+meses que cambian, así el refresco al arrancar no recorre la tabla origen;
+`refrescar` desde la línea de comandos compara además la firma de cada mes.
+"""
+import argparse
+import math
+import sqlite3
+
+import pandas as pd
+
+from energia import esquema
+from energia.config import DB_PATH, FILTRO_PAISES, TABLA_MENSUAL
+from energia.taxonomia import PRODUCTOS_EXCLUIR, lista_sql, sql_tipo_energia
+from energia.tipos import aplicar_esquema
+
+PAIS_ANIO_PRODUCTO = "rollup_pais_anio_producto"
+PAIS_MES_TIPO = "rollup_pais_mes_tipo"
+ANIO_PRODUCTO = "rollup_anio_producto"
+CUBO = "rollup_cubo_kpi"
+MESES_CARGADOS = "rollup_meses"
+# Meses tocados desde el último refresco, anotados por disparadores de la tabla mensual
+PENDIENTES = "rollup_meses_pendientes"
+
+# Marca de total en el cubo: Country/Balance/Product = '*' suma todos los valores
+TODOS = "*"
+
+_DIMENSIONES_CUBO = ("Country", "Balance", "Product")
+
+
+def _select_cubo():
+    """Cubo país × año × balance × producto con totales ('*') y puesto de cada país.
+
+    Se arma desde PAIS_ANIO_PRODUCTO (ya agregado por año), así que se refresca
+    por año como los demás. SQLite no tiene GROUPING SETS: cada combinación de
+    dimensiones totalizadas es una rama del UNION ALL.
+    """
+    ramas = []
+    for mascara in range(2 ** len(_DIMENSIONES_CUBO)):
+        totalizadas = {d for i, d in enumerate(_DIMENSIONES_CUBO) if mascara >> i & 1}
+        columnas = [f"'{TODOS}'" if d in totalizadas else d for d in _DIMENSIONES_CUBO]
+        agrupar = ", ".join(["Year"] + [d for d in _DIMENSIONES_CUBO if d not in totalizadas])
+        ramas.append(f"SELECT {columnas[0]}, Year, {columnas[1]}, {columnas[2]}, SUM(Value) "
+                     f"FROM base GROUP BY {agrupar}")
+    union = "\n                UNION ALL ".join(ramas)
+    return f"""
+            WITH base AS (
+                SELECT Country, Year, Balance, Product, Value
+                FROM {PAIS_ANIO_PRODUCTO} WHERE 1 = 1 {{filtro}}
+            ), cubo (Country, Year, Balance, Product, Value) AS (
+                {union}
+            )
+            SELECT Country, Year, Balance, Product, Value,
+                   CASE WHEN Country = '{TODOS}' THEN NULL ELSE ROW_NUMBER() OVER (
+                       PARTITION BY Year, Balance, Product, Country = '{TODOS}'
+                       ORDER BY Value DESC, Country) END
+            FROM cubo
+        """
+
+ROLLUPS = {
+    PAIS_ANIO_PRODUCTO: {
+        "columnas": "Country TEXT, Year INTEGER, Balance TEXT, Product TEXT, Value REAL",
+        "clave": "Country, Year, Balance, Product",
+        "indices": ["Year, Balance"],
+        "select": f"""
+            SELECT Country, Year, Balance, Product, SUM(Value)
+            FROM '{TABLA_MENSUAL}'
+            WHERE {FILTRO_PAISES} {{filtro}}
+            GROUP BY Country, Year, Balance, Product
+        """,
+        "grano": "anio",
+    },
+    PAIS_MES_TIPO: {
+        "columnas": ("Country TEXT, Balance TEXT, Year INTEGER, Month INTEGER, "
+                     "Energy_Type TEXT, Value REAL"),
+        "clave": "Country, Balance, Year, Month, Energy_Type",
+        "indices": ["Balance, Year, Month"],
+        "select": f"""
+            SELECT Country, Balance, Year, Month, {sql_tipo_energia()} AS Energy_Type, SUM(Value)
+            FROM '{TABLA_MENSUAL}'
+            WHERE {FILTRO_PAISES} AND Product NOT IN {lista_sql(PRODUCTOS_EXCLUIR)} {{filtro}}
+            GROUP BY Country, Balance, Year, Month, Energy_Type
+        """,
+        "grano": "mes",
+    },
+    ANIO_PRODUCTO: {
+        "columnas": "Year INTEGER, Balance TEXT, Product TEXT, Value REAL",
+        "clave": "Year, Balance, Product",
+        "indices": [],
+        "select": f"""
+            SELECT Year, Balance, Product, SUM(Value)
+            FROM '{TABLA_MENSUAL}'
+            WHERE {FILTRO_PAISES} {{filtro}}
+            GROUP BY Year, Balance, Product
+        """,
+        "grano": "anio",
+    },
+    # Después de PAIS_ANIO_PRODUCTO: se calcula a partir de él
+    CUBO: {
+        "columnas": "Country TEXT, Year INTEGER, Balance TEXT, Product TEXT, Value REAL, Puesto INTEGER",
+        "clave": "Country, Balance, Product, Year",
+        "indices": ["Year, Balance, Product, Puesto"],
+        "select": _select_cubo(),
+        "grano": "anio",
+    },
+}
+
+
+# Firma de cada mes de la tabla origen: filas, suma de Value y una suma ponderada
+# por rowid (cambia también si se corrige un valor sin cambiar el total del mes)
+COLUMNAS_MESES = "Time TEXT PRIMARY KEY, Filas INTEGER, Suma REAL, Ponderada REAL"
+_FIRMA_MES = "COUNT(*), TOTAL(Value), TOTAL(Value * (rowid % 997 + 1))"
+
+
+def _crear_tablas(conn):
+    for nombre, spec in ROLLUPS.items():
+        conn.execute(f"DROP TABLE IF EXISTS {nombre}")
+        conn.execute(f"CREATE TABLE {nombre} ({spec['columnas']}, "
+                     f"PRIMARY KEY ({spec['clave']})) WITHOUT ROWID")
+        for i, columnas in enumerate(spec["indices"]):
+            conn.execute(f"CREATE INDEX idx_{nombre}_{i} ON {nombre} ({columnas})")
+    conn.execute(f"DROP TABLE IF EXISTS {MESES_CARGADOS}")
+    conn.execute(f"CREATE TABLE {MESES_CARGADOS} ({COLUMNAS_MESES})")
+    conn.execute(f"DROP TABLE IF EXISTS {PENDIENTES}")
+    _vigilar(conn)
+
+
+# Cualquier escritura en la tabla mensual (ingesta, corrección a mano, otra
+# herramienta) anota su mes; la normalización de Year/Month/Date no cuenta
+DISPARADORES = {
+    "trg_rollup_insertar": f"""
+        AFTER INSERT ON '{TABLA_MENSUAL}' WHEN NEW.Time IS NOT NULL
+        BEGIN INSERT OR IGNORE INTO {PENDIENTES} VALUES (NEW.Time); END
+    """,
+    "trg_rollup_borrar": f"""
+        AFTER DELETE ON '{TABLA_MENSUAL}' WHEN OLD.Time IS NOT NULL
+        BEGIN INSERT OR IGNORE INTO {PENDIENTES} VALUES (OLD.Time); END
+    """,
+    "trg_rollup_actualizar": f"""
+        AFTER UPDATE OF Country, Time, Balance, Product, Value ON '{TABLA_MENSUAL}'
+        BEGIN
+            INSERT OR IGNORE INTO {PENDIENTES} SELECT OLD.Time WHERE OLD.Time IS NOT NULL;
+            INSERT OR IGNORE INTO {PENDIENTES} SELECT NEW.Time WHERE NEW.Time IS NOT NULL;
+        END
+    """,
+}
+
+
+def _vigilar(conn):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {PENDIENTES} (Time TEXT PRIMARY KEY)")
+    for nombre, cuerpo in DISPARADORES.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}")
+
+
+def vigilada(conn):
+    """True si los disparadores anotan los meses que cambian (si no, hace falta comparar firmas).
+
+    No lo están en bases anteriores a ellos ni si la tabla mensual se reemplazó.
+    """
+    encontrados = {fila[0] for fila in conn.execute(
+        "SELECT name FROM sqlite_master WHERE (type = 'trigger' AND tbl_name = ?) OR (type = 'table' AND name = ?)",
+        (TABLA_MENSUAL, PENDIENTES))}
+    return PENDIENTES in encontrados and set(DISPARADORES) <= encontrados
+
+
+def pendientes(conn):
+    """Meses anotados por los disparadores desde el último refresco."""
+    return [fila[0] for fila in conn.execute(f"SELECT Time FROM {PENDIENTES}")]
+
+
+def _meses_origen(conn, meses=None):
+    """{Time: (filas, suma, ponderada)} de la tabla origen (solo `meses` si se indican)."""
+    if meses is None:
+        filas = conn.execute(f"SELECT Time, {_FIRMA_MES} FROM '{TABLA_MENSUAL}' GROUP BY Time")
+    else:
+        meses = list(meses)
+        filas = conn.execute(f"SELECT Time, {_FIRMA_MES} FROM '{TABLA_MENSUAL}' "
+                             f"WHERE Time IN ({', '.join('?' * len(meses))}) GROUP BY Time", meses)
+    return {t: tuple(firma) for t, *firma in filas}
+
+
+def _meses_cargados(conn):
+    # Bases con la tabla de meses anterior (solo Filas): se agregan las columnas y
+    # todos los meses quedan pendientes una vez
+    existentes = {fila[1] for fila in conn.execute(f"PRAGMA table_info({MESES_CARGADOS})")}
+    for columna in ("Suma", "Ponderada"):
+        if columna not in existentes:
+            with conn:
+                conn.execute(f"ALTER TABLE {MESES_CARGADOS} ADD COLUMN {columna} REAL")
+    return {t: tuple(firma) for t, *firma in conn.execute(f"SELECT Time, Filas, Suma, Ponderada FROM {MESES_CARGADOS}")}
+
+
+def _cambio(firma, cargada):
+    if firma is None or cargada is None or None in cargada:
+        return True
+    return firma[0] != cargada[0] or not all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+                                             for a, b in zip(firma[1:], cargada[1:]))
+
+
+def existen(conn):
+    encontrados = {fila[0] for fila in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(nombre in encontrados for nombre in [*ROLLUPS, MESES_CARGADOS])
+
+
+def construir(conn):
+    """Reconstruye todas las tablas de agregados desde cero."""
+    esquema.migrar(conn)
+    with conn:
+        _crear_tablas(conn)
+        for nombre, spec in ROLLUPS.items():
+            conn.execute(f"INSERT INTO {nombre} {spec['select'].format(filtro='')}")
+        conn.executemany(f"INSERT INTO {MESES_CARGADOS} VALUES (?, ?, ?, ?)",
+                         [(t, *firma) for t, firma in _meses_origen(conn).items()])
+
+
+def refrescar(conn, meses=None, completo=False):
+    """Reconstruye solo los agregados afectados por meses nuevos o modificados.
+
+    Si no se indican `meses` ('March 2024', ...), se refrescan los que anotaron
+    los disparadores de la tabla mensual: no se lee la tabla origen, así que es
+    barato al arrancar cada proceso. Con `completo` (la línea de comandos), o
+    si la tabla no está vigilada, se compara además la firma de cada mes (filas,
+    suma de Value y suma ponderada por rowid) con la guardada al materializarlo,
+    recorriendo la tabla completa.
+    Devuelve la lista de meses refrescados.
+    """
+    if not existen(conn):
+        construir(conn)
+        return [fila[0] for fila in conn.execute(f"SELECT Time FROM {MESES_CARGADOS} ORDER BY Time")]
+    if not esquema.esta_migrada(conn):
+        esquema.migrar(conn)
+
+    origen = None
+    if meses is None:
+        if completo or not vigilada(conn):
+            with conn:
+                _vigilar(conn)
+            origen = _meses_origen(conn)
+            cargados = _meses_cargados(conn)
+            meses = [t for t in set(origen) | set(cargados) if _cambio(origen.get(t), cargados.get(t))]
+            meses += pendientes(conn)
+        else:
+            meses = pendientes(conn)
+    meses = sorted(set(meses))
+    if not meses:
+        return []
+    with conn:
+        recalcular(conn, meses, origen)
+    return meses
+
+
+def recalcular(conn, meses, origen=None):
+    """Recalcula los agregados de `meses` dentro de la transacción en curso (sin confirmarla).
+
+    Para quien escribe la tabla origen y quiere publicar datos y agregados en
+    un solo commit (`energia.ingesta`); las tablas de agregados deben existir.
+    """
+    # Firma de los meses recalculados, leída por el índice (Country, Time, ...)
+    origen = _meses_origen(conn, meses) if origen is None else origen
+    periodos = [esquema.anio_mes(t) for t in meses]
+    anios = sorted({anio for anio, _ in periodos})
+    for nombre, spec in ROLLUPS.items():
+        if spec["grano"] == "mes":
+            for anio, mes in periodos:
+                conn.execute(f"DELETE FROM {nombre} WHERE Year = ? AND Month = ?", (anio, mes))
+                conn.execute(f"INSERT INTO {nombre} {spec['select'].format(filtro='AND Year = ? AND Month = ?')}",
+                             (anio, mes))
+        else:
+            for anio in anios:
+                conn.execute(f"DELETE FROM {nombre} WHERE Year = ?", (anio,))
+                conn.execute(f"INSERT INTO {nombre} {spec['select'].format(filtro='AND Year = ?')}", (anio,))
+    for t in meses:
+        if t in origen:
+            conn.execute(f"INSERT OR REPLACE INTO {MESES_CARGADOS} VALUES (?, ?, ?, ?)", (t, *origen[t]))
+        else:
+            conn.execute(f"DELETE FROM {MESES_CARGADOS} WHERE Time = ?", (t,))
+        conn.execute(f"DELETE FROM {PENDIENTES} WHERE Time = ?", (t,))
+
+
+def leer(conn, tabla, **filtros):
+    """Lee una tabla de agregados filtrando por igualdad (`Country=...`, `Year=...`).
+
+    Un filtro con lista o tupla se resuelve con `IN`.
+    """
+    if tabla not in ROLLUPS:
+        raise ValueError(f"Rollup desconocido: {tabla}")
+    condiciones, parametros = [], []
+    for columna, valor in filtros.items():
+        if valor is None:
+            continue
+        if isinstance(valor, (list, tuple)):
+            valores = list(valor)
+            condiciones.append(f"{columna} IN ({', '.join('?' * len(valores))})")
+        else:
+            valores = [valor]
+            condiciones.append(f"{columna} = ?")
+        # Los valores que llegan desde pandas/numpy (np.int64) no los acepta sqlite3
+        parametros.extend(v.item() if hasattr(v, "item") else v for v in valores)
+    query = f"SELECT * FROM {tabla}"
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+    return aplicar_esquema(pd.read_sql_query(query, conn, params=parametros))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Materializa los agregados del dashboard energético.")
+    parser.add_argument("accion", choices=["construir", "refrescar"])
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la base SQLite")
+    parser.add_argument("--mes", action="append", dest="meses",
+                        help="Mes a refrescar ('March 2024'); se puede repetir")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.accion == "construir":
+            construir(conn)
+            print("✅ Agregados reconstruidos")
+        else:
+            meses = refrescar(conn, args.meses, completo=True)
+            print(f"✅ {len(meses)} mes(es) refrescado(s)" + (f": {', '.join(meses)}" if meses else ""))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Secciones y pestañas perezosas para los dashboards.
+
+Cada gráfico declara sus dependencias de datos (`Dependencia`) y una función
+que lo dibuja con esos datos. `pestanas` solo resuelve y dibuja la pestaña
+abierta; las dependencias de las pestañas ocultas se calculan en un hilo en
+segundo plano y quedan en la caché de `energia.datos`, así que al cambiar de
+pestaña el gráfico sale de la caché. El tiempo hasta el primer gráfico
+depende de la pestaña que se está viendo, no de la suma de todas.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from energia import datos
+
+_fondo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="energia-secciones")
+_pendientes = set()
+
+
+class Dependencia:
+    """Datos que necesita un gráfico: `funcion(*args, **kwargs)` memorizada bajo `tabla`.
+
+    `funcion` debe ser de módulo (no lambda) y sus argumentos hashables, porque
+    forman la clave de la caché compartida.
+    """
+
+    def __init__(self, tabla, funcion, *args, **kwargs):
+        self.tabla = tabla
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def clave(self):
+        return datos.clave_consulta(self.tabla, self.funcion, self.args, self.kwargs)
+
+    def resolver(self):
+        return datos.memorizar(self.tabla, self.funcion, *self.args, **self.kwargs)
+
+
+def dibujar(dependencias, funcion):
+    """Resuelve `dependencias` y llama a `funcion` con los resultados, en orden."""
+    return funcion(*[dependencia.resolver() for dependencia in dependencias])
+
+
+def precalcular(dependencias):
+    """Llena la caché con `dependencias` en segundo plano (sin duplicar trabajos en curso)."""
+    for dependencia in dependencias:
+        clave = dependencia.clave
+        if clave in _pendientes:
+            continue
+        _pendientes.add(clave)
+        futuro = _fondo.submit(dependencia.resolver)
+        futuro.add_done_callback(lambda _, clave=clave: _pendientes.discard(clave))
+
+
+def pestanas(secciones, key):
+    """Pestañas perezosas: `secciones` es {etiqueta: (dependencias, dibujar)}.
+
+    Solo se ejecuta la pestaña seleccionada; el resto se precalcula en segundo plano.
+    """
+    etiquetas = list(secciones)
+    try:
+        tabs = st.tabs(etiquetas, key=key, on_change="rerun")
+    except TypeError:
+        # Streamlit sin pestañas con estado: todas quedan abiertas
+        tabs = st.tabs(etiquetas)
+    ocultas = []
+    for etiqueta, tab in zip(etiquetas, tabs):
+        dependencias, funcion = secciones[etiqueta]
+        if getattr(tab, "open", None) is False:
+            ocultas.extend(dependencias)
+            continue
+        with tab:
+            dibujar(dependencias, funcion)
+    precalcular(ocultas)
@@ -0,0 +1,143 @@
+"""Series mensuales indexadas por período.
+
+Las series salen de los agregados (`rollups.PAIS_MES_TIPO` por tipo de
+energía) o de la tabla mensual (por producto) con Year/Month enteros, y se
+indexan con un `PeriodIndex` mensual completo: sin fechas en texto, sin
+`to_datetime` por rerun y ordenadas cronológicamente. Sobre ese índice:
+
+- `remuestrear`: mensual → trimestral → anual;
+- `acumulado_12m`: suma móvil de 12 meses;
+- `variacion_anual`: cambio contra el mismo período del año anterior;
+- `estacionalidad`: descomposición aditiva en tendencia, estacionalidad y residuo.
+
+`serie()` combina lo anterior y memoriza el resultado por serie en
+`energia.datos` (se invalida con la tabla de origen, por país).
+"""
+import numpy as np
+import pandas as pd
+
+from energia import datos, rollups
+from energia.config import BALANCE_NETO, TABLA_MENSUAL
+
+FRECUENCIAS = {"mensual": "M", "trimestral": "Q", "anual": "Y"}
+ESTADISTICAS = ("valor", "acumulado_12m", "variacion_anual")
+# Períodos por año según la frecuencia base del índice ('Q-DEC' -> 'Q')
+_PERIODOS_POR_ANIO = {"M": 12, "Q": 4, "Y": 1}
+
+
+def _periodos_por_anio(indice):
+    return _PERIODOS_POR_ANIO[indice.freqstr.split("-")[0]]
+
+
+def indexar(df, columna):
+    """Formato ancho (una columna por valor de `columna`) con índice mensual completo."""
+    if df.empty:
+        return pd.DataFrame(index=pd.PeriodIndex([], freq="M", name="Periodo"))
+    sumas = df.groupby(["Year", "Month", columna], observed=True, sort=True)["Value"].sum()
+    tabla = sumas.unstack(columna, fill_value=0)
+    tabla.index = pd.PeriodIndex.from_fields(year=tabla.index.get_level_values("Year").to_numpy(),
+                                             month=tabla.index.get_level_values("Month").to_numpy(), freq="M")
+    if isinstance(tabla.columns, pd.CategoricalIndex):
+        tabla.columns = pd.Index(tabla.columns.astype(object), name=columna)
+    # Los meses sin ningún dato quedan en NaN para no inventar ceros en las medias móviles
+    completo = pd.period_range(tabla.index.min(), tabla.index.max(), freq="M", name="Periodo")
+    return tabla.reindex(completo).astype("float64")
+
+
+def _mensual(pais=None, balance=BALANCE_NETO, por="Energy_Type", productos=None):
+    if por == "Energy_Type":
+        df = datos.consultar(rollups.PAIS_MES_TIPO, rollups.leer, rollups.PAIS_MES_TIPO,
+                             Balance=balance, Country=pais)
+    elif por == "Product":
+        df = datos.estadisticas_mensuales(columnas=("Country", "Year", "Month", "Product", "Value"),
+                                          pais=pais, balance=balance, productos=productos)
+    else:
+        raise ValueError(f"Serie desconocida: por={por!r} (usar 'Energy_Type' o 'Product')")
+    tabla = indexar(df, por)
+    if productos is not None and por == "Product":
+        tabla = tabla[[p for p in productos if p in tabla.columns]]
+    return tabla
+
+
+def mensual(pais=None, balance=BALANCE_NETO, por="Energy_Type", productos=None):
+    """Serie mensual (PeriodIndex 'M') de `pais` (None = suma de todos), una columna por `por`."""
+    productos = tuple(productos) if productos else None
+    tabla = rollups.PAIS_MES_TIPO if por == "Energy_Type" else TABLA_MENSUAL
+    return datos.memorizar(tabla, _mensual, pais=pais, balance=balance, por=por, productos=productos)
+
+
+# --------------------------
+# Transformaciones
+# --------------------------
+def remuestrear(serie, frecuencia="anual"):
+    """Suma por trimestre o año; un período sin ningún mes con datos queda en NaN."""
+    codigo = FRECUENCIAS[frecuencia]
+    if serie.index.freqstr.split("-")[0] == codigo:
+        return serie
+    return serie.groupby(serie.index.asfreq(codigo)).sum(min_count=1)
+
+
+def acumulado_12m(serie):
+    """Suma móvil de los últimos 12 meses (NaN hasta completar el primer año)."""
+    return serie.rolling(_periodos_por_anio(serie.index), min_periods=_periodos_por_anio(serie.index)).sum()
+
+
+def variacion_anual(serie, porcentaje=True):
+    """Diferencia contra el mismo período del año anterior (en % o en unidades)."""
+    anterior = serie.shift(_periodos_por_anio(serie.index))
+    if not porcentaje:
+        return serie - anterior
+    return (serie / anterior.where(anterior != 0) - 1) * 100
+
+
+def estacionalidad(serie):
+    """Descomposición aditiva clásica de una serie mensual (Series).
+
+    Tendencia: media móvil centrada 2×12. Estacionalidad: promedio por mes del
+    año de (serie − tendencia), centrado en 0. Residuo: lo que queda.
+    """
+    n = _periodos_por_anio(serie.index)
+    tendencia = serie.rolling(n, center=True).mean()
+    if n % 2 == 0:
+        tendencia = tendencia.rolling(2).mean().shift(-1)
+    # Con el índice completo, la posición módulo n identifica el mes (o trimestre) del año
+    posicion = np.arange(len(serie)) % n
+    promedio = (serie - tendencia).groupby(posicion).mean()
+    promedio -= promedio.mean()
+    estacional = pd.Series(promedio.reindex(posicion).to_numpy(), index=serie.index)
+    return pd.DataFrame({
+        "serie": serie,
+        "tendencia": tendencia,
+        "estacional": estacional,
+        "residuo": serie - tendencia - estacional,
+    })
+
+
+# --------------------------
+# Consulta memorizada
+# --------------------------
+def _serie(pais=None, balance=BALANCE_NETO, por="Energy_Type", productos=None,
+           frecuencia="mensual", estadistica="valor"):
+    tabla = remuestrear(mensual(pais=pais, balance=balance, por=por, productos=productos), frecuencia)
+    if estadistica == "acumulado_12m":
+        return acumulado_12m(tabla)
+    if estadistica == "variacion_anual":
+        return variacion_anual(tabla)
+    return tabla
+
+
+def serie(pais=None, balance=BALANCE_NETO, por="Energy_Type", productos=None,
+          frecuencia="mensual", estadistica="valor"):
+    """Serie de `pais` a `frecuencia` ('mensual', 'trimestral', 'anual') con `estadistica` aplicada.
+
+    `estadistica`: 'valor', 'acumulado_12m' o 'variacion_anual' (%). El
+    resultado queda memorizado por serie.
+    """
+    if frecuencia not in FRECUENCIAS:
+        raise ValueError(f"Frecuencia desconocida: {frecuencia!r} (usar {', '.join(FRECUENCIAS)})")
+    if estadistica not in ESTADISTICAS:
+        raise ValueError(f"Estadística desconocida: {estadistica!r} (usar {', '.join(ESTADISTICAS)})")
+    productos = tuple(productos) if productos else None
+    tabla = rollups.PAIS_MES_TIPO if por == "Energy_Type" else TABLA_MENSUAL
+    return datos.memorizar(tabla, _serie, pais=pais, balance=balance, por=por, productos=productos,
+                           frecuencia=frecuencia, estadistica=estadistica)
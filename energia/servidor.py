@@ -0,0 +1,33 @@
+"""Arranque del dashboard con calentamiento de cachés.
+
+Lanza el calentamiento (`energia.calentamiento`) y el endpoint de
+disponibilidad antes de que Streamlit reciba la primera sesión; Streamlit
+corre en el mismo proceso, así que comparte las cachés ya calentadas.
+
+Uso (p. ej. como Start Command en Railway):
+    python -m energia.servidor app.py --server.port $PORT --server.address 0.0.0.0
+"""
+import os
+import sys
+
+from streamlit.web import cli as stcli
+
+from energia import calentamiento
+
+# 0 desactiva el endpoint /listo
+PUERTO_ESTADO = int(os.environ.get("ENERGIA_PUERTO_ESTADO", 8502))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        sys.exit("Uso: python -m energia.servidor app.py [opciones de streamlit run]")
+    if PUERTO_ESTADO:
+        calentamiento.servir_estado(PUERTO_ESTADO)
+    calentamiento.iniciar()
+    sys.argv = ["streamlit", "run", *argv]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
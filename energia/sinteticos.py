@@ -0,0 +1,109 @@
+"""Bases sintéticas con la forma de las tablas del IEA.
+
+Genera una base SQLite con Monthly_Electricity_Statistics (países × productos
+× balances × meses) y las tablas sectorial y de CO2 de Colombia, con el mismo
+esquema crudo que el original (Time como texto 'March 2024'). Sirve para medir
+rendimiento (`energia.benchmark`) y dimensionar despliegues sin los datos reales.
+
+Uso:
+    python -m energia.sinteticos bench.db --paises 60 --productos 16 --balances 8 --meses 180
+"""
+import argparse
+import itertools
+import os
+import sqlite3
+
+import numpy as np
+
+from energia.config import TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+from energia.esquema import MESES
+from energia.taxonomia import TAXONOMIA
+
+PAISES = ['Colombia', 'Brazil', 'Chile', 'Mexico', 'Peru', 'Argentina', 'Canada', 'United States',
+          'Spain', 'France', 'Germany', 'Italy', 'Norway', 'Japan', 'Korea', 'Australia']
+# Agregados que el IEA publica junto a los países (los dashboards los excluyen)
+AGREGADOS = ['OECD Americas', 'OECD Europe', 'OECD Total']
+BALANCES = ['Net Electricity Production', 'Total Imports', 'Total Exports', 'Electricity supplied',
+            'Used for pumped storage', 'Distribution Losses', 'Final Consumption (Calculated)',
+            'Gross Electricity Production']
+SECTORES = ['Industry', 'Residential', 'Transport', 'Commercial and public services',
+            'Agriculture / forestry', 'Renewable']
+SECTORES_CO2 = ['Electricity and heat producers', 'Other energy industries', 'Industry', 'Transport',
+                'Residential', 'Commercial and public services', 'Agriculture',
+                'Final consumption not elsewhere specified']
+
+ULTIMO_ANIO = 2025
+
+
+def _nombres(base, n, prefijo):
+    """Los primeros `n` de `base`, completados con nombres numerados."""
+    return list(base[:n]) + [f"{prefijo} {i:03d}" for i in range(len(base), n)]
+
+
+def meses(n, ultimo_anio=ULTIMO_ANIO):
+    """Los `n` meses ('%B %Y') que terminan en diciembre de `ultimo_anio`."""
+    total = ultimo_anio * 12 + 11
+    return [f"{MESES[m % 12]} {m // 12}" for m in range(total - n + 1, total + 1)]
+
+
+def generar(db_path, paises=20, productos=len(TAXONOMIA), balances=len(BALANCES), n_meses=132,
+            anios=25, semilla=0, tamano_lote=200_000):
+    """Crea (o reemplaza) las tablas del IEA en `db_path` y devuelve el número de filas mensuales."""
+    rng = np.random.default_rng(semilla)
+    lista_paises = _nombres(PAISES, paises, "País") + AGREGADOS
+    lista_productos = _nombres(list(TAXONOMIA), productos, "Producto")
+    lista_balances = _nombres(BALANCES, balances, "Balance")
+    lista_meses = meses(n_meses)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute(f'DROP TABLE IF EXISTS "{TABLA_MENSUAL}"')
+            conn.execute(f'CREATE TABLE "{TABLA_MENSUAL}" (Country TEXT, Time TEXT, Balance TEXT, '
+                         'Product TEXT, Value REAL, Unit TEXT)')
+            combinaciones = itertools.product(lista_paises, lista_meses, lista_balances, lista_productos)
+            filas = 0
+            while True:
+                lote = list(itertools.islice(combinaciones, tamano_lote))
+                if not lote:
+                    break
+                valores = rng.lognormal(mean=5, sigma=1.5, size=len(lote)).round(3)
+                conn.executemany(f'INSERT INTO "{TABLA_MENSUAL}" VALUES (?, ?, ?, ?, ?, \'GWh\')',
+                                 ((*clave, float(v)) for clave, v in zip(lote, valores)))
+                filas += len(lote)
+
+            anios_sector = range(ULTIMO_ANIO - anios + 1, ULTIMO_ANIO + 1)
+            for tabla, sectores, unidad in [(TABLA_SECTORIAL, SECTORES, 'TJ'), (TABLA_CO2, SECTORES_CO2, 'Mt CO2')]:
+                conn.execute(f'DROP TABLE IF EXISTS "{tabla}"')
+                conn.execute(f'CREATE TABLE "{tabla}" (Sector TEXT, Year INTEGER, Value REAL, Units TEXT)')
+                conn.executemany(f'INSERT INTO "{tabla}" VALUES (?, ?, ?, ?)',
+                                 [(s, a, float(v), unidad) for (s, a), v in zip(
+                                     itertools.product(sectores, anios_sector),
+                                     rng.uniform(100, 5000, size=len(sectores) * len(anios_sector)).round(2))])
+    finally:
+        conn.close()
+    return filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una base sintética con las tablas del IEA.")
+    parser.add_argument("db", help="Ruta de la base SQLite a crear")
+    parser.add_argument("--paises", type=int, default=20, help="Países (sin contar los agregados OECD)")
+    parser.add_argument("--productos", type=int, default=len(TAXONOMIA))
+    parser.add_argument("--balances", type=int, default=len(BALANCES))
+    parser.add_argument("--meses", type=int, default=132)
+    parser.add_argument("--anios", type=int, default=25, help="Años de las tablas sectorial y de CO2")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--reemplazar", action="store_true", help="Borra la base si ya existe")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        if not args.reemplazar:
+            parser.error(f"{args.db} ya existe (usa --reemplazar para sobrescribirla)")
+        os.remove(args.db)
+    filas = generar(args.db, args.paises, args.productos, args.balances, args.meses, args.anios, args.semilla)
+    print(f"✅ {filas:,} filas mensuales en {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# -------------------
+# Clasificación de productos del IEA
+# -------------------
+# Tabla única producto -> tipo de energía. `None` marca totales y filas que no
+# son una fuente (se excluyen de los análisis por fuente).
+TAXONOMIA = {
+    'Electricity': None,
+    'Total Combustible Fuels': None,
+    'Total Renewables (Hydro, Geo, Solar, Wind, Other)': None,
+    'Not Specified': None,
+    'Data is estimated for this month': None,
+    'Hydro': 'Renewable',
+    'Wind': 'Renewable',
+    'Geothermal': 'Renewable',
+    'Combustible Renewables': 'Renewable',
+    'Solar': 'Renewable',
+    'Other Renewables': 'Renewable',
+    'Coal, Peat and Manufactured Gases': 'Non-Renewable',
+    'Oil and Petroleum Products': 'Non-Renewable',
+    'Natural Gas': 'Non-Renewable',
+    'Other Combustible Non-Renewables': 'Non-Renewable',
+    'Nuclear': 'Non-Renewable',
+}
+
+PRODUCTOS_EXCLUIR = [p for p, tipo in TAXONOMIA.items() if tipo is None]
+PRODUCTOS_RENOVABLES = [p for p, tipo in TAXONOMIA.items() if tipo == 'Renewable']
+PRODUCTOS_NO_RENOVABLES = [p for p, tipo in TAXONOMIA.items() if tipo == 'Non-Renewable']
+
+TIPOS_ENERGIA = pd.CategoricalDtype(['Renewable', 'Non-Renewable'])
+
+
+def tipo_energia(producto):
+    return 'Renewable' if producto in PRODUCTOS_RENOVABLES else 'Non-Renewable'
+
+
+def clasificar(productos):
+    """Tipo de energía de una serie de productos, vectorizado.
+
+    Sobre una serie categórica solo se clasifican sus categorías, no cada fila.
+    Cualquier producto que no sea renovable (incluidos los desconocidos) queda
+    como 'Non-Renewable', igual que `tipo_energia`.
+    """
+    if isinstance(productos.dtype, pd.CategoricalDtype):
+        tipos = productos.cat.categories.map(tipo_energia)
+        # Los productos nulos (código -1) toman el último código, -1: se quedan sin
+        # tipo, también cuando la serie no tiene ninguna categoría
+        codigos = np.append(pd.Categorical(tipos, dtype=TIPOS_ENERGIA).codes, -1)
+        return pd.Series(pd.Categorical.from_codes(
+            codigos[productos.cat.codes], dtype=TIPOS_ENERGIA), index=productos.index)
+    renovable = productos.isin(PRODUCTOS_RENOVABLES)
+    tipos = renovable.map({True: 'Renewable', False: 'Non-Renewable'})
+    return tipos.where(productos.notna()).astype(TIPOS_ENERGIA)
+
+
+def lista_sql(valores):
+    """Literal SQL `('a', 'b')` para usar en cláusulas IN de sentencias fijas."""
+    return "(" + ", ".join("'" + v.replace("'", "''") + "'" for v in valores) + ")"
+
+
+def sql_tipo_energia(columna="Product"):
+    """Expresión SQL equivalente a `tipo_energia`."""
+    return (f"CASE WHEN {columna} IN {lista_sql(PRODUCTOS_RENOVABLES)} "
+            f"THEN 'Renewable' ELSE 'Non-Renewable' END")
@@ -0,0 +1,35 @@
+"""Esquema tipado de los DataFrames de energía en memoria.
+
+Se aplica una sola vez, al cargar los datos (los resultados quedan en la
+caché de `energia.datos`):
+
+- columnas de dimensión (país, producto, balance, sector, ...) como categóricas;
+- `Value` como float32;
+- `Year` como int16 y `Month` como int8;
+- `Energy_Type` precalculada desde la taxonomía de productos cuando hay `Product`.
+"""
+import pandas as pd
+
+from energia.taxonomia import TIPOS_ENERGIA, clasificar
+
+DIMENSIONES = ["Country", "Product", "Balance", "Time", "Date", "Unit", "Units", "Sector"]
+ENTEROS = {"Year": "int16", "Month": "int8"}
+
+
+def aplicar_esquema(df):
+    """Convierte `df` (en sitio) al esquema compacto y lo devuelve."""
+    for columna in DIMENSIONES:
+        if columna in df.columns and not isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype("category")
+    for columna, tipo in ENTEROS.items():
+        if columna in df.columns:
+            valores = pd.to_numeric(df[columna], errors="coerce")
+            # Con nulos se usa el entero nullable (Int16/Int8)
+            df[columna] = valores.astype(tipo if valores.notna().all() else tipo.capitalize())
+    if "Value" in df.columns:
+        df["Value"] = pd.to_numeric(df["Value"], errors="coerce").astype("float32")
+    if "Energy_Type" in df.columns:
+        df["Energy_Type"] = df["Energy_Type"].astype(TIPOS_ENERGIA)
+    elif "Product" in df.columns:
+        df["Energy_Type"] = clasificar(df["Product"])
+    return df
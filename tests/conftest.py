@@ -0,0 +1,60 @@
+"""Base SQLite mínima con las tres tablas del IEA que usan los dashboards."""
+import sqlite3
+
+import pytest
+
+from energia import config, esquema, intensidad, rollups
+from energia.config import BALANCE_NETO, TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+
+MESES = ["January", "February", "March"]
+# Generación neta por país y producto (GWh); 'Electricity' es un total y 'OECD Total' un agregado
+PRODUCCION = {
+    "Colombia": {"Hydro": 60.0, "Solar": 10.0, "Natural Gas": 30.0, "Electricity": 100.0},
+    "Chile": {"Hydro": 20.0, "Solar": 20.0, "Natural Gas": 50.0, "Coal, Peat and Manufactured Gases": 10.0,
+              "Electricity": 100.0},
+    "OECD Total": {"Hydro": 1000.0, "Natural Gas": 1000.0},
+}
+SECTORES = ["Industry", "Residential", "Transport"]
+
+
+def _filas_mensuales():
+    filas = []
+    for anio in (2022, 2023):
+        for i, mes in enumerate(MESES):
+            for pais, productos in PRODUCCION.items():
+                for producto, valor in productos.items():
+                    # Un poco de variación por año y mes para que las series no sean planas
+                    ajuste = (anio - 2022) * 5 + i if producto != "Electricity" else 0
+                    filas.append((pais, f"{mes} {anio}", BALANCE_NETO, producto, valor + ajuste, "GWh"))
+                    filas.append((pais, f"{mes} {anio}", "Total Imports", producto, valor / 10, "GWh"))
+    return filas
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Ruta de la base de prueba, ya migrada, con agregados e intensidad construidos."""
+    ruta = str(tmp_path / "energia.db")
+    monkeypatch.setattr(config, "DB_PATH", ruta)
+    monkeypatch.setattr(config, "COLUMNAR_DIR", str(tmp_path / "columnar"))
+    conn = sqlite3.connect(ruta)
+    with conn:
+        conn.execute(f"CREATE TABLE '{TABLA_MENSUAL}' (Country TEXT, Time TEXT, Balance TEXT, Product TEXT, "
+                     "Value REAL, Unit TEXT)")
+        conn.executemany(f"INSERT INTO '{TABLA_MENSUAL}' VALUES (?, ?, ?, ?, ?, ?)", _filas_mensuales())
+        for tabla, base in ((TABLA_SECTORIAL, 100.0), (TABLA_CO2, 20.0)):
+            conn.execute(f"CREATE TABLE '{tabla}' (Sector TEXT, Year INTEGER, Value REAL, Units TEXT)")
+            conn.executemany(f"INSERT INTO '{tabla}' VALUES (?, ?, ?, ?)",
+                             [(sector, anio, base * (i + 1) + (anio - 2020), "u")
+                              for i, sector in enumerate(SECTORES) for anio in range(2020, 2023)])
+    esquema.migrar(conn)
+    rollups.construir(conn)
+    intensidad.construir(conn)
+    conn.close()
+    return ruta
+
+
+@pytest.fixture
+def conn(db_path):
+    conexion = sqlite3.connect(db_path)
+    yield conexion
+    conexion.close()
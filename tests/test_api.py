@@ -0,0 +1,19 @@
+"""Serialización JSON de la API."""
+import json
+
+import numpy as np
+import pandas as pd
+
+from energia import api
+
+
+def test_json_flotantes_sin_ruido():
+    df = pd.DataFrame({
+        "float32": np.array([2051.255, 119443.445], dtype="float32"),
+        # float32 ya ampliado a float64 (p. ej. tras un pivot o una suma)
+        "ampliado": np.array([2051.255, np.nan], dtype="float32").astype("float64"),
+        "float64": [0.1, 1 / 3],
+    })
+    registros = json.loads(api._json(df))
+    assert registros == [{"float32": 2051.255, "ampliado": 2051.255, "float64": 0.1},
+                         {"float32": 119443.445, "ampliado": None, "float64": 1 / 3}]
@@ -0,0 +1,23 @@
+"""El benchmark corre las secciones reales de los dashboards sobre la base de prueba."""
+from energia import benchmark, datos
+
+
+def test_tiempos_por_etapa_sin_contar_dos_veces():
+    # Una consulta (nivel 1) dentro de la construcción de una figura (nivel 0)
+    registros = [{"etapa": "datos", "nivel": 1, "ms": 3.0},
+                 {"etapa": "figura", "nivel": 0, "ms": 10.0},
+                 {"etapa": "dibujar", "nivel": 0, "ms": 2.0}]
+    tiempos = benchmark.tiempos_por_etapa(registros, 15.0)
+    assert (tiempos["datos"], tiempos["figura"], tiempos["dibujar"], tiempos["otros"]) == (3.0, 7.0, 2.0, 3.0)
+
+
+def test_escenarios(db_path):
+    reporte = benchmark.ejecutar("Colombia", 2023, repeticiones=1)
+    assert len(reporte["escenarios"]) == len(benchmark.ESCENARIOS)
+    por_seccion = {(r["script"], r["seccion"]): r for r in reporte["escenarios"]}
+    # Las secciones de app.py pasan por la caché de figuras: en tibio se deserializan
+    diagnostico = por_seccion[("app.py", "Diagnóstico Nacional")]
+    assert diagnostico["frio_ms"]["figura"] > 0 and diagnostico["tibio_ms"]["figura"] == 0
+    assert diagnostico["tibio_ms"]["deserializacion"] > 0
+    assert por_seccion[("analisis_energetico_old.py", "Pestañas")]["frio_ms"]["vista"] > 0
+    datos.invalidar()
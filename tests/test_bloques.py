@@ -0,0 +1,77 @@
+"""Las agregaciones por bloques coinciden con las de memoria y SQL aunque combinen muchos bloques."""
+import pandas as pd
+import pytest
+
+from energia import bloques, columnar, consultas, kpis
+from energia.config import BALANCE_NETO, TABLA_CO2, TABLA_MENSUAL, TABLA_SECTORIAL
+from energia.taxonomia import PRODUCTOS_EXCLUIR, clasificar
+
+# Bloques pequeños: la tabla mensual de prueba se lee en decenas de bloques
+TAMANO = 7
+
+
+@pytest.fixture(params=["sqlite", "columnar"])
+def origen(request, db_path):
+    if request.param == "columnar":
+        columnar.exportar(db_path)
+    return request.param
+
+
+def _comparar(obtenido, esperado, por):
+    obtenido = obtenido.astype({c: str for c in por}).sort_values(por, ignore_index=True)
+    esperado = esperado.astype({c: str for c in por}).sort_values(por, ignore_index=True)
+    pd.testing.assert_frame_equal(obtenido, esperado, check_dtype=False, rtol=1e-6)
+
+
+def test_se_combinan_varios_bloques(conn, origen):
+    lotes = list(bloques.lotes(conn, ["Country", "Value"], tamano=TAMANO, excluir_agregados=False))
+    assert len(lotes) > 1
+    assert sum(len(lote) for lote in lotes) == len(consultas.estadisticas_mensuales(conn, excluir_agregados=False))
+
+
+@pytest.mark.parametrize("por, filtros", [
+    (["Country"], {}),
+    (["Country", "Year"], {"balance": BALANCE_NETO}),
+    (["Year", "Month", "Product"], {"pais": "Chile"}),
+    (["Country", "Energy_Type"], {"anio": 2023, "balance": BALANCE_NETO}),
+])
+def test_agregar_igual_que_en_memoria(conn, origen, por, filtros):
+    df = consultas.estadisticas_mensuales(conn, **filtros)
+    df = df[~df["Product"].isin(PRODUCTOS_EXCLUIR)]
+    if "Energy_Type" in por:
+        df = df.assign(Energy_Type=clasificar(df["Product"]))
+    esperado = df.groupby(por, observed=True)["Value"].sum().reset_index()
+    obtenido = bloques.agregar(conn, por, excluir_productos=PRODUCTOS_EXCLUIR, tamano=TAMANO, **filtros)
+    _comparar(obtenido, esperado, por)
+
+
+@pytest.mark.parametrize("argumentos", [
+    {},
+    {"n": 1},
+    {"balance": BALANCE_NETO},
+    {"balance": BALANCE_NETO, "producto": "Hydro"},
+])
+def test_top_paises_igual_que_el_cubo(conn, origen, argumentos):
+    for anio in (2022, 2023):
+        esperado = kpis.top_paises(conn, anio, **argumentos)
+        obtenido = bloques.top_paises(conn, anio, tamano=TAMANO, **argumentos)
+        assert len(obtenido) == len(esperado) > 0
+        assert list(obtenido["Country"].astype(str)) == list(esperado["Country"].astype(str))
+        assert list(obtenido["Puesto"]) == list(esperado["Puesto"])
+        pd.testing.assert_series_equal(obtenido["Value"], esperado["Value"], check_dtype=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize("tabla", [TABLA_SECTORIAL, TABLA_CO2])
+@pytest.mark.parametrize("filtros", [{}, {"Year": 2021}])
+def test_totales_sector_igual_que_sql(conn, origen, tabla, filtros):
+    where = " WHERE Year = ?" if filtros else ""
+    esperado = pd.read_sql_query(f'SELECT Year, Sector, SUM(Value) AS Value FROM "{tabla}"{where} '
+                                 "GROUP BY Year, Sector", conn, params=list(filtros.values()))
+    obtenido = bloques.totales_sector(conn, tabla, tamano=2, **filtros)
+    assert len(obtenido) == len(esperado) > 0
+    _comparar(obtenido, esperado, ["Year", "Sector"])
+
+
+def test_agregar_sin_filas(conn, origen):
+    vacio = bloques.agregar(conn, "Country", tabla=TABLA_MENSUAL, tamano=TAMANO, pais="Atlantis")
+    assert vacio.empty and list(vacio.columns) == ["Country", "Value"]
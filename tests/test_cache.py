@@ -0,0 +1,187 @@
+"""Backends de caché: compartida entre procesos, invalidación por porciones y desalojo."""
+import os
+import subprocess
+import sys
+import textwrap
+import types
+
+import pandas as pd
+import pytest
+
+from energia import cache, ingesta
+from energia.config import BALANCE_NETO, TABLA_MENSUAL, TABLA_SECTORIAL
+
+TABLAS = (TABLA_MENSUAL,)
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj manual para los TTL y el orden de uso."""
+    actual = {"t": 1000.0}
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(time=lambda: actual["t"],
+                                                             monotonic=lambda: actual["t"]))
+    return actual
+
+
+@pytest.fixture(params=["memoria", "compartida"])
+def crear(request, tmp_path):
+    def crear_cache(ttl=3600):
+        if request.param == "memoria":
+            return cache.CacheConsultas(ttl, max_entradas=100)
+        return cache.CacheCompartida(str(tmp_path / "cache"), ttl, max_bytes=100 * 1024 * 1024)
+    return crear_cache
+
+
+def _tabla(n=3, valor=1.0):
+    return pd.DataFrame({"Country": ["Colombia"] * n, "Value": [valor] * n})
+
+
+def _no_calcular():
+    raise AssertionError("se volvió a calcular un valor en caché")
+
+
+def _cambio(conn, pais, tiempo, valor):
+    ingesta.ingestar(conn, pd.DataFrame([(pais, tiempo, BALANCE_NETO, "Hydro", valor, "GWh")],
+                                        columns=ingesta.COLUMNAS))
+
+
+# --------------------------
+# Compartida entre procesos
+# --------------------------
+def test_dos_instancias_comparten_resultados(tmp_path):
+    carpeta = str(tmp_path / "cache")
+    a = cache.CacheCompartida(carpeta, 3600, 10 * 1024 * 1024)
+    b = cache.CacheCompartida(carpeta, 3600, 10 * 1024 * 1024)
+    esperado = _tabla()
+    pd.testing.assert_frame_equal(a.obtener(("t", "df"), lambda: esperado), esperado)
+    assert a.obtener(("t", "lista"), lambda: [1, 2, 3]) == [1, 2, 3]
+    pd.testing.assert_frame_equal(b.obtener(("t", "df"), _no_calcular), esperado)
+    assert b.obtener(("t", "lista"), _no_calcular) == [1, 2, 3]
+    assert len(a) == len(b) == 2
+
+
+def test_otro_proceso_lee_sin_calcular(tmp_path):
+    carpeta = str(tmp_path / "cache")
+    cache.CacheCompartida(carpeta, 3600, 10 * 1024 * 1024).obtener(("t", "df"), lambda: _tabla(valor=7.0))
+    codigo = textwrap.dedent(f"""
+        from energia.cache import CacheCompartida
+        def falla():
+            raise SystemExit("calculado de nuevo")
+        df = CacheCompartida({carpeta!r}, 3600, 10 * 1024 * 1024).obtener(("t", "df"), falla)
+        print(df["Value"].sum())
+    """)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONPATH": raiz})
+    assert float(salida.stdout) == 21.0
+
+
+# --------------------------
+# Sincronización con la base
+# --------------------------
+ALCANCES = {
+    "colombia_2023": ("Colombia", 2023),
+    "chile_2022": ("Chile", 2022),
+    "ambos_2022": (frozenset({"Colombia", "Chile"}), 2022),
+    "ambos_2023": (frozenset({"Colombia", "Chile"}), 2023),
+    "todo": (None, None),
+}
+
+
+def _llenar(c):
+    for nombre, alcance in ALCANCES.items():
+        c.obtener((TABLA_MENSUAL, nombre), lambda: _tabla(), alcance)
+    # Otra tabla con el mismo alcance: una ingesta mensual no la toca
+    c.obtener((TABLA_SECTORIAL, "colombia_2023"), lambda: _tabla(), ("Colombia", 2023))
+
+
+def _presentes(c):
+    presentes = set()
+    for clave in [*((TABLA_MENSUAL, nombre) for nombre in ALCANCES), (TABLA_SECTORIAL, "colombia_2023")]:
+        calculado = []
+        c.obtener(clave, lambda: calculado.append(1) or _tabla())
+        if not calculado:
+            presentes.add(clave)
+    return presentes
+
+
+def test_sincronizar_invalida_solo_las_porciones_afectadas(crear, conn):
+    c = crear()
+    assert c.sincronizar(1, conn, TABLAS) is None
+    _llenar(c)
+
+    _cambio(conn, "Colombia", "February 2023", 99.0)
+    assert c.sincronizar(2, conn, TABLAS) == {("Colombia", 2023)}
+    assert _presentes(c) == {(TABLA_MENSUAL, "chile_2022"), (TABLA_MENSUAL, "ambos_2022"),
+                             (TABLA_SECTORIAL, "colombia_2023")}
+
+
+def test_sincronizar_sin_eventos_invalida_todo(crear, conn):
+    c = crear()
+    c.sincronizar(1, conn, TABLAS)
+    _llenar(c)
+    # El archivo cambió sin pasar por la ingesta (p. ej. se reemplazó la base)
+    assert c.sincronizar(2, conn, TABLAS) == set()
+    assert len(c) == 0
+
+
+def test_compartida_invalida_una_sola_vez(tmp_path, conn):
+    carpeta = str(tmp_path / "cache")
+    a = cache.CacheCompartida(carpeta, 3600, 10 * 1024 * 1024)
+    b = cache.CacheCompartida(carpeta, 3600, 10 * 1024 * 1024)
+    a.sincronizar(1, conn, TABLAS)
+    _llenar(a)
+    _cambio(conn, "Chile", "March 2022", 5.0)
+    assert a.sincronizar(2, conn, TABLAS) == {("Chile", 2022)}
+    # Lo que se calculó después del cambio sobrevive cuando la otra réplica lo nota
+    a.obtener((TABLA_MENSUAL, "chile_2022"), lambda: _tabla(valor=2.0), ALCANCES["chile_2022"])
+    assert b.sincronizar(2, conn, TABLAS) == {("Chile", 2022)}
+    assert b.obtener((TABLA_MENSUAL, "chile_2022"), _no_calcular)["Value"].iloc[0] == 2.0
+    assert b.obtener((TABLA_MENSUAL, "colombia_2023"), _no_calcular) is not None
+
+
+# --------------------------
+# Desalojo
+# --------------------------
+def test_lru_por_numero_de_entradas():
+    c = cache.CacheConsultas(3600, max_entradas=2)
+    c.obtener(("t", "a"), lambda: 1)
+    c.obtener(("t", "b"), lambda: 2)
+    assert c.obtener(("t", "a"), _no_calcular) == 1
+    c.obtener(("t", "c"), lambda: 3)
+    assert len(c) == 2
+    assert c.obtener(("t", "a"), _no_calcular) == 1
+    assert c.obtener(("t", "b"), lambda: "recalculado") == "recalculado"
+
+
+def test_ttl_vence_las_entradas(crear, reloj):
+    c = crear(ttl=60)
+    c.obtener(("t", "a"), lambda: 1)
+    reloj["t"] += 59
+    assert c.obtener(("t", "a"), _no_calcular) == 1
+    reloj["t"] += 2
+    assert c.obtener(("t", "a"), lambda: 2) == 2
+
+
+def test_compartida_respeta_el_limite_de_bytes(tmp_path, reloj):
+    carpeta = str(tmp_path / "cache")
+    c = cache.CacheCompartida(carpeta, 3600, 100 * 1024 * 1024)
+    c.obtener(("t", "a"), lambda: _tabla(100))
+    tamano = c._indice().execute("SELECT bytes FROM entradas").fetchone()[0]
+    c.max_bytes = int(tamano * 2.5)
+
+    reloj["t"] += 1
+    c.obtener(("t", "b"), lambda: _tabla(100, 2.0))
+    reloj["t"] += 1
+    c.obtener(("t", "a"), _no_calcular)
+    reloj["t"] += 1
+    c.obtener(("t", "c"), lambda: _tabla(100, 3.0))
+
+    # Se desaloja la menos usada (b) y el total queda dentro del límite
+    total = c._indice().execute("SELECT SUM(bytes) FROM entradas").fetchone()[0]
+    assert total <= c.max_bytes
+    assert len(c) == 2
+    assert len([f for f in os.listdir(carpeta) if f.endswith(".arrow")]) == 2
+    c.obtener(("t", "a"), _no_calcular)
+    c.obtener(("t", "c"), _no_calcular)
+    assert c.obtener(("t", "b"), lambda: "recalculado") == "recalculado"
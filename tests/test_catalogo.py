@@ -0,0 +1,49 @@
+"""Planes de consulta del catálogo: ninguna recorre completa una tabla indexada o grande."""
+import pytest
+
+from energia import catalogo, consultas
+from energia.catalogo import CONSULTAS, Consulta
+from energia.config import FILTRO_PAISES, TABLA_MENSUAL
+
+
+def test_catalogo_sin_recorridos_completos(conn):
+    # Todas las tablas existen en la base de prueba: ninguna consulta se omite
+    for nombre in CONSULTAS:
+        assert catalogo.plan(conn, nombre)
+    assert catalogo.verificar(conn) == {}
+
+
+def test_anios_y_paises(conn):
+    assert consultas.anios(conn) == [2022, 2023]
+    assert consultas.paises(conn) == ["Chile", "Colombia"]
+
+
+@pytest.mark.parametrize("sql", [
+    # Índice de cobertura recorrido completo sobre la tabla mensual (el `anios` anterior)
+    f'SELECT DISTINCT Year FROM "{TABLA_MENSUAL}" WHERE Year IS NOT NULL ORDER BY Year',
+    # Tabla con índices recorrida sin usarlos
+    f'SELECT Country, SUM(Value) FROM "{TABLA_MENSUAL}" WHERE Unit = :unidad GROUP BY Country',
+    # Rango abierto (Country>?) sobre la tabla mensual: lee todo el índice (el `paises` anterior)
+    f'SELECT DISTINCT Country FROM "{TABLA_MENSUAL}" WHERE {FILTRO_PAISES} AND Country IS NOT NULL ORDER BY Country',
+])
+def test_detecta_recorridos_completos(conn, monkeypatch, sql):
+    monkeypatch.setitem(CONSULTAS, "prueba", Consulta(TABLA_MENSUAL, sql))
+    assert list(catalogo.verificar(conn)) == ["prueba"]
+
+
+def test_tabla_pequena_por_indice_de_cobertura(conn):
+    # Las tablas sectoriales son pequeñas: recorrer su índice de cobertura está permitido
+    detalles = catalogo.plan(conn, "anios_consumo")
+    assert any(d.startswith("SCAN ") and "COVERING INDEX" in d for d in detalles)
+    assert catalogo._recorridos_completos(conn, detalles) == []
+
+
+@pytest.mark.parametrize("detalle, abierto", [
+    ("SEARCH t USING COVERING INDEX i (Country>?)", True),
+    ("SEARCH t USING INDEX i (Year<?)", True),
+    ("SEARCH t USING INDEX i (Year>? AND Year<?)", False),
+    ("SEARCH t USING INDEX i (Balance=? AND Year>?)", False),
+    ("SEARCH t USING PRIMARY KEY (Country=?)", False),
+])
+def test_rango_abierto(detalle, abierto):
+    assert catalogo._rango_abierto(detalle) is abierto
@@ -0,0 +1,59 @@
+"""La caché columnar devuelve lo mismo que SQLite y caduca cuando cambia la base."""
+import os
+
+import pandas as pd
+import pytest
+
+from energia import columnar, config, consultas
+from energia.config import BALANCE_NETO
+
+CLAVE = ["Country", "Time", "Balance", "Product"]
+FILTROS = [
+    {},
+    {"excluir_agregados": False},
+    {"pais": "Colombia"},
+    {"pais": ["Colombia", "Chile"], "anio": 2023},
+    {"anio": 2022, "balance": BALANCE_NETO, "productos": ("Hydro", "Solar")},
+    {"columnas": ["Country", "Year", "Month", "Product", "Value"], "balance": BALANCE_NETO},
+]
+
+
+def _ordenado(df):
+    clave = [c for c in CLAVE if c in df.columns] or list(df.columns)
+    df = df.sort_values(clave, kind="stable").reset_index(drop=True)
+    # Las categorías dependen de lo que trae cada lectura, no de los datos
+    return df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+
+@pytest.mark.parametrize("formato", sorted(columnar.FORMATOS))
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_paridad_con_sqlite(conn, db_path, formato, filtros):
+    columnar.exportar(db_path, formato=formato)
+    esperado = consultas.estadisticas_mensuales(conn, **filtros)
+    obtenido = columnar.estadisticas_mensuales(**filtros)
+    assert len(esperado) > 0
+    pd.testing.assert_frame_equal(_ordenado(obtenido)[list(esperado.columns)], _ordenado(esperado))
+
+
+def test_paridad_por_lotes(conn, db_path):
+    columnar.exportar(db_path)
+    esperado = pd.concat(consultas.lotes_mensuales(conn, 7, pais="Chile"))
+    lotes = list(columnar.lotes_mensuales(7, pais="Chile"))
+    assert all(len(lote) <= 7 for lote in lotes)
+    # Los lotes no llevan el esquema compacto: Year llega como int16 de Arrow
+    pd.testing.assert_frame_equal(_ordenado(pd.concat(lotes))[list(esperado.columns)], _ordenado(esperado),
+                                  check_dtype=False)
+
+
+def test_deja_de_estar_disponible_si_cambia_la_base(db_path):
+    assert not columnar.disponible(config.TABLA_MENSUAL)
+    columnar.exportar(db_path)
+    assert columnar.disponible(config.TABLA_MENSUAL)
+    assert not columnar.disponible("tabla_inexistente")
+
+    mtime = os.stat(db_path).st_mtime_ns
+    os.utime(db_path, ns=(mtime + 10**9, mtime + 10**9))
+    assert not columnar.disponible(config.TABLA_MENSUAL)
+
+    columnar.exportar(db_path)
+    assert columnar.disponible(config.TABLA_MENSUAL)
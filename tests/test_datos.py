@@ -0,0 +1,59 @@
+"""Preparación de la base al arrancar: solo lectura, base ocupada y otros errores."""
+import sqlite3
+
+import pytest
+
+from energia import datos, rollups
+from energia.config import TABLA_MENSUAL
+
+_conectar = sqlite3.connect
+
+
+def _sin_agregados(db_path):
+    conn = _conectar(db_path)
+    with conn:
+        conn.execute(f"DROP TABLE {rollups.MESES_CARGADOS}")
+    conn.close()
+
+
+def _existen_agregados(db_path):
+    conn = _conectar(db_path)
+    try:
+        return rollups.existen(conn)
+    finally:
+        conn.close()
+
+
+def test_ocupada_se_reintenta(db_path, monkeypatch):
+    _sin_agregados(db_path)
+    monkeypatch.setattr(sqlite3, "connect", lambda ruta, **kw: _conectar(ruta, timeout=0.05))
+    ingesta = _conectar(db_path)
+    ingesta.execute("BEGIN IMMEDIATE")
+    try:
+        datos.asegurar_preparada()
+        assert not datos.preparada()
+    finally:
+        ingesta.rollback()
+        ingesta.close()
+    datos.asegurar_preparada()
+    assert datos.preparada()
+    assert _existen_agregados(db_path)
+
+
+def test_solo_lectura_se_da_por_preparada(db_path, monkeypatch):
+    _sin_agregados(db_path)
+    monkeypatch.setattr(sqlite3, "connect", lambda ruta, **kw: _conectar(f"file:{ruta}?mode=ro", uri=True))
+    datos.asegurar_preparada()
+    assert datos.preparada()
+    assert not _existen_agregados(db_path)
+
+
+def test_otros_errores_se_propagan(db_path):
+    _sin_agregados(db_path)
+    conn = _conectar(db_path)
+    with conn:
+        conn.execute(f"DROP TABLE '{TABLA_MENSUAL}'")
+    conn.close()
+    with pytest.raises(sqlite3.OperationalError):
+        datos.asegurar_preparada()
+    assert not datos.preparada()
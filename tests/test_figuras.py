@@ -0,0 +1,50 @@
+"""Invalidación parcial de la caché de figuras y claves sin año."""
+import plotly.graph_objects as go
+
+from energia import graficos
+from energia.figuras import CacheFiguras
+
+
+def _llenar(cache, alcances):
+    for clave, alcance in alcances.items():
+        cache.obtener(clave, go.Figure, alcance=alcance)
+
+
+def test_invalidar_solo_lo_afectado():
+    cache = CacheFiguras()
+    _llenar(cache, {
+        "colombia_2023": (frozenset(["Colombia"]), 2023),
+        "colombia_2022": (frozenset(["Colombia"]), 2022),
+        "colombia_serie": (frozenset(["Colombia"]), None),
+        "chile_2023": (frozenset(["Chile"]), 2023),
+        "todos_2023": (None, 2023),
+        "todos_2022": (None, 2022),
+        "comparacion": (frozenset(["Chile", "Perú"]), None),
+        "sectorial": (frozenset(), 2023),
+    })
+    cache.invalidar({("Colombia", 2023)})
+    assert set(cache._entradas) == {"colombia_2022", "chile_2023", "todos_2022", "comparacion", "sectorial"}
+    assert cache.bytes == sum(len(spec) for spec in cache._entradas.values())
+
+    cache.invalidar({("Perú", 2020)})
+    assert "comparacion" not in cache._entradas
+
+    cache.invalidar(None)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_alcance_de_los_graficos():
+    assert graficos.alcance("Diagnóstico Nacional", "balance", "Colombia", 2023) == (frozenset(["Colombia"]), 2023)
+    assert graficos.alcance("Diagnóstico Nacional", "participacion", "Colombia", 2023) == (frozenset(["Colombia"]), None)
+    assert graficos.alcance("Diagnóstico Nacional", "balance", "Todos", 2023) == (None, 2023)
+    assert graficos.alcance("Comparativos Internacionales", "top_treemap", "Colombia", 2023) == (None, 2023)
+    assert graficos.alcance("Comparativos Internacionales", "evolucion_pais", "Colombia", 2023) == (None, None)
+    assert graficos.alcance(graficos.COMPARACION, "comparacion_fuentes", ("Chile", "Perú"), 2023) == \
+        (frozenset(["Chile", "Perú"]), 2023)
+
+
+def test_tendencia_mensual_sin_anio_en_la_clave(db_path, monkeypatch):
+    llamadas = []
+    monkeypatch.setattr(graficos.figuras, "figura", lambda *args, **kwargs: llamadas.append(kwargs) or None)
+    graficos.construir("Tendencia Mensual", "Colombia", 2023, "ambas")
+    assert llamadas and all(kwargs["anio"] is None for kwargs in llamadas)
@@ -0,0 +1,81 @@
+"""Ingesta incremental: upsert, agregados de los meses tocados, marcas y eventos."""
+import pandas as pd
+import pytest
+
+from energia import ingesta, rollups
+from energia.config import BALANCE_NETO, TABLA_MENSUAL
+
+# Encabezado del IEA antes de la fila de columnas
+PREAMBULO = ["Monthly Electricity Statistics", "Data up to April 2023", ""]
+FILAS = [
+    # Corrección de un valor (antes 66)
+    ("Colombia", "February 2023", BALANCE_NETO, "Hydro", "99", "GWh"),
+    # Sin cambios
+    ("Chile", "January 2022", BALANCE_NETO, "Solar", "20", "GWh"),
+    # Mes nuevo
+    ("Colombia", "April 2023", BALANCE_NETO, "Hydro", "70", "GWh"),
+    ("Chile", "April 2023", BALANCE_NETO, "Solar", "30", "GWh"),
+    # País nuevo
+    ("Peru", "January 2023", BALANCE_NETO, "Hydro", "40", "GWh"),
+]
+
+
+@pytest.fixture
+def csv_iea(tmp_path):
+    ruta = tmp_path / "mensual.csv"
+    lineas = PREAMBULO + [",".join(ingesta.COLUMNAS)] + [",".join(fila) for fila in FILAS]
+    ruta.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+    return str(ruta)
+
+
+def _agregados(conn):
+    return {nombre: pd.read_sql_query(f"SELECT * FROM {nombre} ORDER BY {spec['clave']}", conn)
+            for nombre, spec in rollups.ROLLUPS.items()}
+
+
+def test_leer_csv_salta_el_preambulo(csv_iea):
+    df = ingesta.leer_csv(csv_iea)
+    assert list(df.columns) == ingesta.COLUMNAS
+    assert len(df) == len(FILAS)
+    assert pd.api.types.is_numeric_dtype(df["Value"])
+
+
+def test_ingestar_upsert(conn, csv_iea):
+    resumen = ingesta.ingestar(conn, ingesta.leer_csv(csv_iea))
+    assert resumen == {"insertadas": 3, "actualizadas": 1,
+                       "meses": ["January 2023", "February 2023", "April 2023"]}
+    valor = conn.execute(f"SELECT Value FROM '{TABLA_MENSUAL}' WHERE Country = 'Colombia' "
+                         "AND Time = 'February 2023' AND Balance = ? AND Product = 'Hydro'",
+                         (BALANCE_NETO,)).fetchone()[0]
+    assert valor == 99
+
+
+def test_agregados_incrementales_iguales_a_construir(conn, csv_iea):
+    ingesta.ingestar(conn, ingesta.leer_csv(csv_iea))
+    incrementales = _agregados(conn)
+    rollups.construir(conn)
+    for nombre, esperado in _agregados(conn).items():
+        pd.testing.assert_frame_equal(incrementales[nombre], esperado, check_exact=False, obj=nombre)
+    assert not rollups.pendientes(conn)
+
+
+def test_eventos_y_marcas(conn, csv_iea):
+    assert ingesta.ultimo_evento(conn) == 0
+    ingesta.ingestar(conn, ingesta.leer_csv(csv_iea))
+    afectados, ultimo = ingesta.eventos_desde(conn, 0)
+    # La fila sin cambios de Chile 2022 no genera evento
+    assert afectados == {("Colombia", 2023), ("Chile", 2023), ("Peru", 2023)}
+    assert ultimo == ingesta.ultimo_evento(conn)
+    assert ingesta.eventos_desde(conn, ultimo) == (set(), ultimo)
+    assert ingesta.marcas(conn) == {"Colombia": "2023-04-01", "Chile": "2023-04-01", "Peru": "2023-01-01"}
+
+
+def test_reingestar_el_mismo_archivo_no_cambia_nada(conn, csv_iea):
+    df = ingesta.leer_csv(csv_iea)
+    ingesta.ingestar(conn, df)
+    ultimo = ingesta.ultimo_evento(conn)
+    antes = _agregados(conn)
+    assert ingesta.ingestar(conn, df) == {"insertadas": 0, "actualizadas": 0, "meses": []}
+    assert ingesta.ultimo_evento(conn) == ultimo
+    for nombre, tabla in _agregados(conn).items():
+        pd.testing.assert_frame_equal(tabla, antes[nombre], obj=nombre)
@@ -0,0 +1,25 @@
+"""Tabla de intensidad: valores y refresco cuando cambian sus tablas de origen."""
+import sqlite3
+
+import pytest
+
+from energia import datos
+from energia.config import TABLA_CO2
+from energia.paginas.climatico import serie_intensidad
+
+
+def test_valores(db_path):
+    df = datos.ejecutar("intensidad_sector").set_index(['Sector', 'Year'])
+    # Industry 2022: consumo 100 + 2, emisiones 20 + 2
+    assert df.loc[('Industry', 2022), 'Intensidad'] == pytest.approx(22 / 102)
+    total = datos.ejecutar("intensidad_total").set_index('Year')
+    assert total.loc[2022, 'Emisiones'] == pytest.approx(22 + 42 + 62)
+
+
+def test_refresca_al_cambiar_el_archivo(db_path):
+    assert serie_intensidad('Emisiones').loc[2022, 'Industry'] == pytest.approx(22)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(f"UPDATE '{TABLA_CO2}' SET Value = 50 WHERE Sector = 'Industry' AND Year = 2022")
+    conn.close()
+    assert serie_intensidad('Emisiones').loc[2022, 'Industry'] == pytest.approx(50)
@@ -0,0 +1,99 @@
+"""`mezcla` reproduce los groupby/merge/pivot que reemplazó en las vistas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from energia import bloques, consultas
+from energia.config import BALANCE_NETO
+from energia.mezcla import mezcla
+from energia.taxonomia import PRODUCTOS_EXCLUIR
+
+
+# --------------------------
+# Código anterior de cada vista (referencia)
+# --------------------------
+def participacion_anual_anterior(df):
+    # app.py, Diagnóstico Nacional
+    df_total_by_year = df.groupby('Year')['Value'].sum().reset_index(name='Total_Year_Value')
+    df_agg = df.groupby(['Year', 'Energy_Type'], observed=True)['Value'].sum().reset_index()
+    df_agg = df_agg.merge(df_total_by_year, on='Year')
+    df_agg['Percentage'] = df_agg['Value'] / df_agg['Total_Year_Value'] * 100
+    df_percent_pivot = df_agg.pivot(index='Year', columns='Energy_Type', values='Percentage').fillna(0)
+    if 'Renewable' in df_percent_pivot.columns and 'Non-Renewable' in df_percent_pivot.columns:
+        df_percent_pivot = df_percent_pivot[['Renewable', 'Non-Renewable']]
+    return df_percent_pivot
+
+
+def participacion_paises_anterior(df, year):
+    # analisis_energetico.py, plot_renewable_percentage
+    df_year = df[df['Year'] == year]
+    df_grouped = df_year.groupby(['Country', 'Energy_Type'], observed=True)['Value'].sum().reset_index()
+    df_total = df_grouped.groupby('Country', observed=True)['Value'].sum().reset_index(name='Total_Value')
+    df_grouped = df_grouped.merge(df_total, on='Country')
+    df_grouped['Percentage'] = df_grouped['Value'] / df_grouped['Total_Value'] * 100
+    return df_grouped.pivot(index='Country', columns='Energy_Type', values='Percentage').fillna(0)
+
+
+def mensual_anterior(df):
+    # app.py, Tendencia Mensual
+    df_monthly = df.groupby(['YearMonth', 'Energy_Type'], observed=True)['Value'].sum().reset_index()
+    df_pivot = df_monthly.pivot(index='YearMonth', columns='Energy_Type', values='Value').fillna(0)
+    if 'Renewable' in df_pivot.columns and 'Non-Renewable' in df_pivot.columns:
+        df_pivot = df_pivot[['Renewable', 'Non-Renewable']]
+    return df_pivot
+
+
+def _comparar(nuevo, anterior):
+    assert list(nuevo.columns) == list(anterior.columns)
+    assert [str(v) for v in nuevo.index] == [str(v) for v in anterior.index]
+    np.testing.assert_allclose(nuevo.to_numpy(dtype="float64"), anterior.to_numpy(dtype="float64"), rtol=1e-6)
+
+
+@pytest.fixture
+def produccion(conn):
+    df = consultas.estadisticas_mensuales(conn, balance=BALANCE_NETO)
+    df = df[~df['Product'].isin(PRODUCTOS_EXCLUIR)]
+    return df.assign(YearMonth=df['Date'].astype(str).str[:7])
+
+
+@pytest.mark.parametrize("pais", [None, "Colombia", "Chile"])
+def test_participacion_anual(produccion, pais):
+    df = produccion if pais is None else produccion[produccion['Country'] == pais]
+    _comparar(mezcla(df, por='Year'), participacion_anual_anterior(df))
+
+
+@pytest.mark.parametrize("anio", [2022, 2023])
+def test_participacion_paises(produccion, anio):
+    nuevo = mezcla(produccion[produccion['Year'] == anio], por='Country')
+    _comparar(nuevo, participacion_paises_anterior(produccion, anio))
+
+
+def test_mensual_absoluto(produccion):
+    df = produccion[produccion['Country'] == 'Colombia']
+    _comparar(mezcla(df, por='YearMonth', porcentaje=False), mensual_anterior(df))
+
+
+def test_valores_conocidos(produccion):
+    # Colombia, enero 2022: 60 + 10 renovable sobre 100
+    enero = produccion[(produccion['Country'] == 'Colombia') & (produccion['YearMonth'] == '2022-01')]
+    assert mezcla(enero).loc[0].to_dict() == pytest.approx({'Renewable': 70.0, 'Non-Renewable': 30.0})
+    # Los agregados regionales (OECD Total) no entran
+    assert set(produccion['Country']) == {'Chile', 'Colombia'}
+
+
+def test_global_suma_cien(produccion):
+    global_ = mezcla(produccion)
+    assert len(global_) == 1
+    assert global_.sum(axis=1).iloc[0] == pytest.approx(100.0)
+
+
+def test_sin_filas():
+    vacio = pd.DataFrame({'Year': pd.Series(dtype='int16'), 'Energy_Type': pd.Series(dtype='category'),
+                          'Value': pd.Series(dtype='float32')})
+    assert mezcla(vacio, por='Year').empty
+
+
+@pytest.mark.parametrize("tamano", [7, 1000])
+def test_por_bloques_igual_que_en_memoria(conn, produccion, tamano):
+    nuevo = bloques.mezcla(conn, por='Country', tamano=tamano, anio=2023, balance=BALANCE_NETO)
+    _comparar(nuevo, participacion_paises_anterior(produccion, 2023))
@@ -0,0 +1,62 @@
+"""`reducir` acota los puntos de todas las series juntas sin deformar los ejes."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from energia import muestreo
+
+
+def series(n_series, largo):
+    meses = pd.date_range("2000-01-01", periods=largo, freq="MS")
+    rng = np.random.default_rng(0)
+    return pd.concat(
+        pd.DataFrame({"Mes": meses, "Value": rng.normal(100, 10, largo), "Serie": f"S{i}"})
+        for i in range(n_series)
+    ).reset_index(drop=True).sample(frac=1, random_state=0)
+
+
+@pytest.mark.parametrize("metodo", ["lttb", "minmax"])
+def test_extremos_y_orden(metodo):
+    df = series(1, 500)
+    reducido = muestreo.reducir(df, x="Mes", y="Value", max_puntos=50, metodo=metodo)
+    assert len(reducido) <= 50
+    assert reducido["Mes"].is_monotonic_increasing
+    assert reducido["Mes"].iloc[0] == df["Mes"].min()
+    assert reducido["Mes"].iloc[-1] == df["Mes"].max()
+
+
+@pytest.mark.parametrize("metodo", ["lttb", "minmax"])
+def test_presupuesto_total_con_muchas_series(metodo):
+    df = series(40, 300)
+    reducido = muestreo.reducir(df, x="Mes", y="Value", color="Serie", max_puntos=400, metodo=metodo)
+    assert len(reducido) <= 400
+    for _, serie in reducido.groupby("Serie"):
+        assert serie["Mes"].is_monotonic_increasing
+        assert serie["Mes"].iloc[0] == df["Mes"].min()
+        assert serie["Mes"].iloc[-1] == df["Mes"].max()
+
+
+def test_minimo_dos_puntos_por_serie():
+    df = series(30, 100)
+    reducido = muestreo.reducir(df, x="Mes", y="Value", color="Serie", max_puntos=10)
+    assert (reducido.groupby("Serie").size() == 2).all()
+
+
+def test_series_cortas_intactas():
+    df = series(3, 20)
+    reducido = muestreo.reducir(df, x="Mes", y="Value", color="Serie", max_puntos=100)
+    pd.testing.assert_frame_equal(reducido.sort_index(), df.sort_index())
+
+
+def test_huecos_cortan_la_linea():
+    df = series(1, 300).sort_values("Mes").reset_index(drop=True)
+    df.loc[100:119, "Value"] = np.nan
+    df.loc[:4, "Value"] = np.nan
+    reducido = muestreo.reducir(df, x="Mes", y="Value", max_puntos=60)
+    assert len(reducido) <= 60
+    nulos = reducido[reducido["Value"].isna()]
+    # Un solo nulo por hueco interior, en su lugar; los de los bordes no cortan nada
+    assert list(nulos.index) == [100]
+    posicion = reducido.index.get_loc(100)
+    assert 0 < posicion < len(reducido) - 1
+    assert reducido["Mes"].is_monotonic_increasing
@@ -0,0 +1,78 @@
+"""Ajuste incremental de los pronósticos y forma de las proyecciones guardadas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from energia import ingesta, pronosticos
+from energia.config import BALANCE_NETO
+
+
+@pytest.fixture
+def destino(tmp_path):
+    return str(tmp_path / "pronosticos.db")
+
+
+@pytest.fixture
+def ajustes(monkeypatch):
+    """Series que llegan a `ajustar_serie` (con un solo proceso todo corre aquí)."""
+    llamadas = []
+    original = pronosticos.ajustar_serie
+
+    def contar(valores, horizonte=pronosticos.HORIZONTE):
+        llamadas.append(len(valores))
+        return original(valores, horizonte)
+
+    monkeypatch.setattr(pronosticos, "ajustar_serie", contar)
+    return llamadas
+
+
+def test_sin_cambios_no_reajusta(db_path, destino, ajustes):
+    reajustadas, sin_cambios, eliminadas = pronosticos.ajustar(db_path, destino, procesos=1)
+    assert reajustadas > 0 and (sin_cambios, eliminadas) == (0, 0)
+    assert len(ajustes) == reajustadas
+
+    ajustes.clear()
+    assert pronosticos.ajustar(db_path, destino, procesos=1) == (0, reajustadas, 0)
+    assert ajustes == []
+
+    assert pronosticos.ajustar(db_path, destino, procesos=1, forzar=True) == (reajustadas, 0, 0)
+    assert len(ajustes) == reajustadas
+
+
+def test_reajusta_solo_las_series_modificadas(conn, db_path, destino, ajustes):
+    total, _, _ = pronosticos.ajustar(db_path, destino, procesos=1)
+    ingesta.ingestar(conn, pd.DataFrame([("Colombia", "February 2023", BALANCE_NETO, "Hydro", 99.0, "GWh")],
+                                        columns=ingesta.COLUMNAS))
+    ajustes.clear()
+    # La serie renovable de Colombia y la del total global
+    assert pronosticos.ajustar(db_path, destino, procesos=1) == (2, total - 2, 0)
+    assert len(ajustes) == 2
+
+
+@pytest.mark.parametrize("horizonte", [6, 18])
+def test_proyeccion_con_el_horizonte_pedido(db_path, destino, horizonte):
+    pronosticos.ajustar(db_path, destino, procesos=1, horizonte=horizonte)
+    proyeccion = pronosticos.proyeccion("Colombia", ruta=destino)
+    assert not proyeccion.empty
+    for _, serie in proyeccion.groupby("Energy_Type"):
+        periodos = pd.PeriodIndex(serie["Periodo"])
+        assert periodos.freqstr == "M"
+        assert len(periodos) == horizonte
+        # Mensual, consecutiva y desde el mes siguiente al último observado (marzo de 2023)
+        assert periodos[0] == pd.Period("2023-04", freq="M")
+        assert (np.diff(periodos.asi8) == 1).all()
+        assert (serie["Inferior"] <= serie["Value"]).all() and (serie["Value"] <= serie["Superior"]).all()
+
+
+def test_ajustar_serie_horizonte_y_modelo():
+    meses = np.arange(48)
+    y = 100 + meses + 10 * np.sin(2 * np.pi * meses / 12)
+    resultado = pronosticos.ajustar_serie(y, horizonte=18)
+    assert resultado["modelo"] in pronosticos.MODELOS
+    assert all(len(resultado[k]) == 18 for k in ("valor", "inferior", "superior"))
+    # Muy corta para validar: sin pronóstico
+    assert pronosticos.ajustar_serie(y[:12]) is None
+
+
+def test_proyeccion_sin_ajustes(tmp_path):
+    assert pronosticos.proyeccion("Colombia", ruta=str(tmp_path / "no_existe.db")).empty
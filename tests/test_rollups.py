@@ -0,0 +1,94 @@
+"""Refresco incremental de los agregados cuando cambia la tabla mensual."""
+import pytest
+
+from energia import rollups
+from energia.config import BALANCE_NETO, TABLA_MENSUAL
+
+
+def _hidro(conn, pais, anio):
+    return conn.execute(f"SELECT Value FROM {rollups.PAIS_ANIO_PRODUCTO} WHERE Country = ? AND Year = ? "
+                        "AND Balance = ? AND Product = 'Hydro'", (pais, anio, BALANCE_NETO)).fetchone()[0]
+
+
+def test_sin_cambios(conn):
+    assert rollups.refrescar(conn) == []
+
+
+def test_detecta_correccion_de_valor(conn):
+    with conn:
+        conn.execute(f"UPDATE '{TABLA_MENSUAL}' SET Value = 75 WHERE Country = 'Colombia' AND Time = 'February 2023' "
+                     f"AND Balance = ? AND Product = 'Hydro'", (BALANCE_NETO,))
+    assert rollups.refrescar(conn) == ["February 2023"]
+    # Enero 65 + febrero (antes 66) + marzo 67
+    assert _hidro(conn, "Colombia", 2023) == pytest.approx(65 + 75 + 67)
+    assert rollups.refrescar(conn) == []
+
+
+def test_detecta_intercambio_con_el_mismo_total(conn):
+    # Mismas filas y misma suma del mes: solo cambia a qué fila corresponde cada valor
+    with conn:
+        conn.execute(f"UPDATE '{TABLA_MENSUAL}' SET Value = CASE Country WHEN 'Colombia' THEN 20 ELSE 60 END "
+                     f"WHERE Country IN ('Colombia', 'Chile') AND Time = 'January 2022' "
+                     f"AND Balance = ? AND Product = 'Hydro'", (BALANCE_NETO,))
+    assert rollups.refrescar(conn) == ["January 2022"]
+    assert _hidro(conn, "Colombia", 2022) == pytest.approx(20 + 61 + 62)
+    assert _hidro(conn, "Chile", 2022) == pytest.approx(60 + 21 + 22)
+
+
+def _sin_vigilancia(conn):
+    # Como una base anterior a los disparadores, o con la tabla mensual reemplazada
+    with conn:
+        for nombre in rollups.DISPARADORES:
+            conn.execute(f"DROP TRIGGER {nombre}")
+        conn.execute(f"DROP TABLE {rollups.PENDIENTES}")
+
+
+def _sentencias(conn):
+    ejecutadas = []
+    conn.set_trace_callback(ejecutadas.append)
+    return ejecutadas
+
+
+def test_arranque_no_recorre_la_tabla_mensual(conn):
+    ejecutadas = _sentencias(conn)
+    assert rollups.refrescar(conn) == []
+    # Solo catálogo (PRAGMA, sqlite_master), ninguna lectura de filas
+    assert not [sql for sql in ejecutadas if f"FROM '{TABLA_MENSUAL}'" in sql]
+
+
+def test_meses_indicados_solo_leen_esos_meses(conn):
+    ejecutadas = _sentencias(conn)
+    assert rollups.refrescar(conn, ["March 2023"]) == ["March 2023"]
+    firmas = [sql for sql in ejecutadas if "COUNT(*)" in sql]
+    assert firmas and all("WHERE Time IN" in sql for sql in firmas)
+
+
+def test_sin_vigilancia_compara_firmas(conn):
+    _sin_vigilancia(conn)
+    with conn:
+        conn.execute(f"UPDATE '{TABLA_MENSUAL}' SET Value = 75 WHERE Country = 'Colombia' AND Time = 'February 2023' "
+                     f"AND Balance = ? AND Product = 'Hydro'", (BALANCE_NETO,))
+    assert rollups.refrescar(conn) == ["February 2023"]
+    assert _hidro(conn, "Colombia", 2023) == pytest.approx(65 + 75 + 67)
+    # Los disparadores quedan instalados para el próximo arranque
+    assert rollups.vigilada(conn)
+    assert rollups.refrescar(conn) == []
+
+
+def test_completo_detecta_cambios_sin_anotar(conn):
+    # Una escritura que los disparadores no vieron (p. ej. con ellos desactivados)
+    with conn:
+        conn.execute(f"UPDATE '{TABLA_MENSUAL}' SET Value = 75 WHERE Country = 'Colombia' AND Time = 'February 2023' "
+                     f"AND Balance = ? AND Product = 'Hydro'", (BALANCE_NETO,))
+        conn.execute(f"DELETE FROM {rollups.PENDIENTES}")
+    assert rollups.refrescar(conn) == []
+    assert rollups.refrescar(conn, completo=True) == ["February 2023"]
+
+
+def test_migra_la_tabla_de_meses_anterior(conn):
+    _sin_vigilancia(conn)
+    with conn:
+        conn.execute(f"DROP TABLE {rollups.MESES_CARGADOS}")
+        conn.execute(f"CREATE TABLE {rollups.MESES_CARGADOS} (Time TEXT PRIMARY KEY, Filas INTEGER)")
+    assert len(rollups.refrescar(conn)) == 6
+    assert rollups.refrescar(conn) == []
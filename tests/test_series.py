@@ -0,0 +1,103 @@
+"""Transformaciones de las series mensuales, con números que se pueden verificar a mano."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from energia import series
+
+
+def _mensual(valores, inicio="2021-01"):
+    return pd.Series(valores, index=pd.period_range(inicio, periods=len(valores), freq="M"), dtype="float64")
+
+
+def test_remuestrear_trimestral_y_anual():
+    serie = _mensual(np.arange(1, 25))
+    trimestral = series.remuestrear(serie, "trimestral")
+    assert list(trimestral) == [6, 15, 24, 33, 42, 51, 60, 69]
+    assert trimestral.index[0] == pd.Period("2021Q1")
+    anual = series.remuestrear(serie, "anual")
+    assert list(anual) == [78, 222]
+    assert list(anual.index.year) == [2021, 2022]
+    # Ya anual: no se vuelve a agrupar
+    assert series.remuestrear(anual, "anual") is anual
+
+
+def test_remuestrear_periodos_sin_datos():
+    serie = _mensual([1, np.nan, 3, np.nan, np.nan, np.nan])
+    trimestral = series.remuestrear(serie, "trimestral")
+    assert trimestral.iloc[0] == 4
+    assert np.isnan(trimestral.iloc[1])
+
+
+def test_acumulado_12m():
+    acumulado = series.acumulado_12m(_mensual(np.arange(1, 25)))
+    assert acumulado.iloc[:11].isna().all()
+    assert acumulado.iloc[11] == 78
+    # Sale enero, entra el mes 13
+    assert acumulado.iloc[12] == 78 - 1 + 13
+    assert acumulado.iloc[-1] == 222
+    # Un mes faltante en la ventana deja el acumulado sin calcular
+    con_hueco = _mensual([1.0] * 5 + [np.nan] + [1.0] * 18)
+    assert series.acumulado_12m(con_hueco).iloc[:17].isna().all()
+    assert series.acumulado_12m(con_hueco).iloc[17] == 12
+
+
+def test_variacion_anual():
+    serie = _mensual(np.arange(1, 25))
+    assert series.variacion_anual(serie).iloc[:12].isna().all()
+    assert series.variacion_anual(serie).iloc[12] == pytest.approx(1200)
+    assert (series.variacion_anual(serie, porcentaje=False).iloc[12:] == 12).all()
+    # Contra un año anterior en cero no hay porcentaje
+    assert np.isnan(series.variacion_anual(_mensual([0.0] * 12 + [5.0])).iloc[12])
+    anual = series.remuestrear(serie, "anual")
+    assert series.variacion_anual(anual).iloc[1] == pytest.approx((222 / 78 - 1) * 100)
+
+
+def test_estacionalidad_recupera_el_patron():
+    patron = np.array([3, 1, -2, -4, -1, 0, 2, 4, 1, -1, -2, -1], dtype=float)
+    meses = np.arange(48)
+    descomposicion = series.estacionalidad(_mensual(100 + 0.5 * meses + np.tile(patron, 4)))
+    assert list(descomposicion.columns) == ["serie", "tendencia", "estacional", "residuo"]
+    np.testing.assert_allclose(descomposicion["estacional"].iloc[:12], patron - patron.mean(), atol=1e-9)
+    # Media móvil 2×12: seis meses sin tendencia en cada extremo
+    assert descomposicion["tendencia"].iloc[:6].isna().all() and descomposicion["tendencia"].iloc[-6:].isna().all()
+    np.testing.assert_allclose(descomposicion["tendencia"].iloc[6:-6], 100 + 0.5 * meses[6:-6], atol=1e-9)
+    np.testing.assert_allclose(descomposicion["residuo"].dropna(), 0, atol=1e-9)
+
+
+# --------------------------
+# Sobre la base de prueba (enero a marzo de 2022 y 2023)
+# --------------------------
+def test_serie_mensual_de_la_base(db_path):
+    hidro = series.serie("Colombia", por="Product", productos=["Hydro"])["Hydro"]
+    assert hidro.index.freqstr == "M"
+    assert len(hidro) == 15
+    assert list(hidro.loc["2022-01":"2022-03"]) == [60, 61, 62]
+    assert list(hidro.loc["2023-01":"2023-03"]) == [65, 66, 67]
+    # Abril a diciembre de 2022 no están en la base: NaN, no cero
+    assert hidro.loc["2022-04":"2022-12"].isna().all()
+
+
+def test_serie_remuestreada_y_variacion_de_la_base(db_path):
+    trimestral = series.serie("Colombia", por="Product", productos=["Hydro"], frecuencia="trimestral")["Hydro"]
+    assert trimestral.loc["2022Q1"] == 183 and trimestral.loc["2023Q1"] == 198
+    assert trimestral.loc["2022Q2":"2022Q4"].isna().all()
+    anual = series.serie("Colombia", por="Product", productos=["Hydro"], frecuencia="anual")["Hydro"]
+    assert list(anual) == [183, 198]
+
+    variacion = series.serie("Colombia", por="Product", productos=["Hydro"], estadistica="variacion_anual")["Hydro"]
+    assert variacion.loc["2023-01"] == pytest.approx((65 / 60 - 1) * 100)
+    assert variacion.loc["2023-03"] == pytest.approx((67 / 62 - 1) * 100)
+    variacion_anual = series.serie("Colombia", por="Product", productos=["Hydro"], frecuencia="anual",
+                                   estadistica="variacion_anual")["Hydro"]
+    assert variacion_anual.loc["2023"] == pytest.approx((198 / 183 - 1) * 100)
+    # Ninguna ventana de 12 meses está completa en la base de prueba
+    acumulado = series.serie("Colombia", por="Product", productos=["Hydro"], estadistica="acumulado_12m")["Hydro"]
+    assert acumulado.isna().all()
+
+
+def test_serie_rechaza_parametros_desconocidos():
+    with pytest.raises(ValueError, match="Frecuencia"):
+        series.serie("Colombia", frecuencia="semanal")
+    with pytest.raises(ValueError, match="Estadística"):
+        series.serie("Colombia", estadistica="media")
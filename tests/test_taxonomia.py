@@ -0,0 +1,22 @@
+"""Clasificación vectorizada de productos por tipo de energía."""
+import pandas as pd
+import pytest
+
+from energia.taxonomia import TIPOS_ENERGIA, clasificar, tipo_energia
+
+PRODUCTOS = ['Hydro', None, 'Natural Gas', 'Desconocido', 'Solar', None]
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_igual_que_tipo_energia(dtype):
+    resultado = clasificar(pd.Series(PRODUCTOS, dtype=dtype))
+    assert resultado.dtype == TIPOS_ENERGIA
+    esperado = [None if p is None else tipo_energia(p) for p in PRODUCTOS]
+    assert [None if pd.isna(t) else t for t in resultado] == esperado
+
+
+def test_categorica_sin_categorias():
+    # Todas las filas nulas: la serie categórica no tiene ninguna categoría
+    resultado = clasificar(pd.Series([None, None], dtype="category"))
+    assert resultado.dtype == TIPOS_ENERGIA
+    assert resultado.isna().all()